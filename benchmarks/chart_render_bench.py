@@ -0,0 +1,49 @@
+"""
+Chart rendering benchmark for utils.charts.
+
+    python -m benchmarks.chart_render_bench [renders]
+
+Renders unit comparisons for random pairs from the unit data, once drawing every figure from
+scratch (as compare_stats used to) and once through the warm figure template, and reports
+the per-render latency and the peak memory allocated while rendering, traced by tracemalloc.
+Both paths produce identical PNGs; that is checked before timing.
+"""
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from utils.charts import draw_unit_comparison, render_unit_comparison
+from utils.data_loader import get_unit_catalog
+
+
+def measure(render, pairs):
+    """Median render time in ms over `pairs`, and the median tracemalloc peak in KiB over the first few."""
+    times, peaks = [], []
+    for unit1, unit2 in pairs:
+        start = time.perf_counter()
+        render(unit1, unit2)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    for unit1, unit2 in pairs[:5]:
+        tracemalloc.reset_peak()
+        render(unit1, unit2)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return statistics.median(times) * 1000, statistics.median(peaks) / 1024
+
+
+def main(renders: int = 50) -> None:
+    units = get_unit_catalog().units
+    rng = random.Random(0)
+    pairs = [tuple(rng.sample(units, 2)) for _ in range(renders)]
+    # Warm both paths (font cache, template build) and check they agree
+    assert draw_unit_comparison(*pairs[0]) == render_unit_comparison(*pairs[0])
+
+    for label, render in (("from scratch", draw_unit_comparison), ("warm template", render_unit_comparison)):
+        latency, peak = measure(render, pairs)
+        print(f"{renders} comparisons, {label}: {latency:.1f}ms per render, {peak:,.0f} KiB peak allocated")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
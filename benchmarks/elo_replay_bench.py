@@ -0,0 +1,37 @@
+"""
+Replay benchmark for utils.elo_replay.
+
+    python -m benchmarks.elo_replay_bench [matches] [teams]
+
+Generates a synthetic chronological match log and times a full replay, once with the
+ladder's K-factor and once with four what-if K-factors side by side.
+"""
+import sys
+import time
+import numpy as np
+from utils.elo_replay import replay_ratings
+
+
+def synthetic_match_log(match_count: int, team_count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    winners = rng.integers(0, team_count, match_count)
+    losers = (winners + rng.integers(1, team_count, match_count)) % team_count
+    playoffs = rng.random(match_count) < 0.1
+    return [
+        {"Winner": f"Team {winner}", "Loser": f"Team {loser}", "Date": "2025-01-01",
+         "Multiplier": 1.5 if playoff else 1.0}
+        for winner, loser, playoff in zip(winners.tolist(), losers.tolist(), playoffs.tolist())
+    ]
+
+
+def main(match_count: int = 1_000_000, team_count: int = 1000) -> None:
+    match_log = synthetic_match_log(match_count, team_count)
+    for k_factors in ([32], [16, 24, 32, 40]):
+        start = time.perf_counter()
+        replay_ratings(match_log, k_factors)
+        elapsed = time.perf_counter() - start
+        print(f"{match_count:,} matches, {team_count} teams, K={k_factors}: {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,34 @@
+"""
+Scoring benchmark for utils.faction_scoring.FactionScoringEngine.
+
+    python -m benchmarks.faction_scoring_bench [units] [factions]
+
+Generates synthetic unit columns spread over many factions and times building the engine
+and scoring every faction, against the per-unit reference loop on the real unit data.
+"""
+import sys
+import time
+import numpy as np
+from utils.data_loader import get_unit_catalog
+from utils.faction_scoring import FactionScoringEngine, SCORE_COLUMNS
+
+
+def main(unit_count: int = 200_000, faction_count: int = 500) -> None:
+    rng = np.random.default_rng(0)
+    columns = {column: rng.integers(0, 160, unit_count).astype(float) for column in SCORE_COLUMNS}
+    codes = rng.integers(0, faction_count, unit_count)
+    names = [f"Faction {i}" for i in range(faction_count)]
+
+    start = time.perf_counter()
+    engine = FactionScoringEngine.from_columns(names, codes, columns, rng.random(unit_count) < 0.2)
+    engine.score_matrix({})
+    print(f"{unit_count:,} units in {faction_count} factions: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    catalog = get_unit_catalog()
+    start = time.perf_counter()
+    FactionScoringEngine(catalog.units).score_all(catalog.modifiers)
+    print(f"{len(catalog.units):,} real units, all factions: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,45 @@
+"""
+Rating benchmark for utils.player_stats.rate_players.
+
+    python -m benchmarks.player_rating_bench [players]
+
+Generates a synthetic roster of typed stat columns and times the vectorized rating,
+unrounded (as used for tuning) and rounded, against the per-player formula.
+"""
+import sys
+import time
+import numpy as np
+from utils.player_stats import DEFAULT_RATING_WEIGHTS, calculate_player_rating, rate_players
+
+
+def synthetic_columns(player_count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    columns = {
+        'Games Played': rng.integers(0, 120, player_count).astype(np.float64),
+        'Win %': np.round(rng.random(player_count) * 100, 1),
+        'K/D ratio': np.round(rng.random(player_count) * 2.5, 2),
+        'Chevrons/game': np.round(rng.random(player_count) * 10, 2),
+        'Playoff Rate': np.round(rng.random(player_count) * 100, 1),
+    }
+    for key in DEFAULT_RATING_WEIGHTS.achievements:
+        columns[key] = rng.integers(0, 3, player_count).astype(np.float64)
+    return columns
+
+
+def main(player_count: int = 100_000) -> None:
+    columns = synthetic_columns(player_count)
+    for rounded in (False, True):
+        start = time.perf_counter()
+        rate_players(columns, rounded=rounded)
+        elapsed = time.perf_counter() - start
+        print(f"{player_count:,} players, vectorized{' (rounded)' if rounded else ''}: {elapsed * 1000:.1f}ms")
+
+    records = [dict(zip(columns, values)) for values in zip(*(column.tolist() for column in columns.values()))]
+    start = time.perf_counter()
+    for record in records:
+        calculate_player_rating(record)
+    print(f"{player_count:,} players, per-player formula: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
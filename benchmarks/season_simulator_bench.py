@@ -0,0 +1,30 @@
+"""
+Monte Carlo benchmark for utils.season_simulator.
+
+    python -m benchmarks.season_simulator_bench [simulations] [teams]
+
+Times a full double round-robin season of evenly spread ratings, and a knockout bracket
+of the same teams.
+"""
+import sys
+import time
+import numpy as np
+from utils.season_simulator import simulate_bracket, simulate_season
+
+
+def main(simulations: int = 100_000, team_count: int = 16) -> None:
+    ratings = np.linspace(900, 1200, team_count)
+    fixtures = [(home, away) for home in range(team_count) for away in range(team_count) if home != away]
+
+    start = time.perf_counter()
+    simulate_season(ratings, fixtures, simulations=simulations, seed=1)
+    print(f"{simulations:,} seasons of {len(fixtures)} fixtures: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    bracket_size = 1 << (team_count.bit_length() - 1)
+    start = time.perf_counter()
+    simulate_bracket(ratings[:bracket_size], simulations=simulations, seed=1)
+    print(f"{simulations:,} brackets of {bracket_size} teams: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -1,31 +1,271 @@
+import asyncio
 import logging
 import discord
+from collections import OrderedDict
 from discord.ext import commands
-from utils.data_loader import load_elo_data
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+from utils.chart_renderer import ChartRenderer, ChartRenderError, get_chart_renderer
+from utils.charts import render_rating_history
+from utils.elo_store import EloStore, get_elo_store
+from utils.leaderboard_pages import PAGE_SIZE, LeaderboardPages, page_count, send_leaderboard
+from utils.match_import import parse_teams
+from utils.name_index import normalize_name
+from utils.rating_engines import RATING_ENGINES, RatingTable
+from utils.season_simulator import DEFAULT_SIMULATIONS, bracket_round_names, simulate_bracket, simulate_season
+
+# Rendered history charts kept in memory, most recently used last
+HISTORY_CHART_CACHE_SIZE = 32
+# Position columns shown in simulation tables
+MAX_SIMULATION_COLUMNS = 8
+# Characters per table message, leaving room under Discord's 2000 for the heading
+TABLE_MESSAGE_LIMIT = 1900
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class TeamDisplaySystem(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, store: Optional[EloStore] = None, renderer: Optional[ChartRenderer] = None):
         self.bot = bot
-        self.unit_data = load_elo_data()
+        # Shares the store with the recording cog, so new results show up immediately
+        self.store = store or get_elo_store()
+        self.history_charts: "OrderedDict[str, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+        # Alternative rating systems, recomputed from the match log only after it changed
+        self.engine_ratings: Dict[str, Tuple[Tuple[int, int], RatingTable]] = {}
+        self.ranking_pages = LeaderboardPages()
+        self.renderer = renderer or get_chart_renderer()
+
+    @property
+    def unit_data(self) -> Dict:
+        return self.store.data
+
+    async def engine_table(self, system: str) -> RatingTable:
+        """Ratings of every team under another rating system, computed off the event loop."""
+        version = (self.store.history.generation, len(self.store.match_log))
+        cached = self.engine_ratings.get(system)
+        if cached and cached[0] == version:
+            return cached[1]
+        table = await asyncio.to_thread(RATING_ENGINES[system].rate, list(self.store.match_log))
+        self.engine_ratings[system] = (version, table)
+        return table
+
+    def ranking_version(self, system: str):
+        """Version of the data behind a rating system's ranking, for the page cache."""
+        if system == "elo":
+            return self.store.registry.version
+        return (self.store.history.generation, len(self.store.match_log))
 
-    @commands.command(name='display_team_elo', help = 'Display the top 10 teams by Elo rating in an embed')
-    async def show_top_teams(self, ctx):
+    def ranking_page(self, system: str, table: Optional[RatingTable], page: int) -> discord.Embed:
+        """One page of a rating system's ranking; `table` holds the ratings of non-Elo systems."""
+        start = page * PAGE_SIZE
+        if system == "elo":
+            # The live ratings, exactly as recorded
+            label = "Elo Rating"
+            teams = [(team["Team Name"], team["Elo Rating"], None) for team in self.store.top_teams(PAGE_SIZE, start)]
+        else:
+            label = f"{RATING_ENGINES[system].label} Rating"
+            teams = table.top(start + PAGE_SIZE)[start:]
+        title = f"Top 10 Teams by {label}" if page == 0 else f"Teams {start + 1}-{start + len(teams)} by {label}"
+
+        if not teams:
+            return discord.Embed(title=title, description="No teams available.", color=discord.Color.red())
+        embed = discord.Embed(title=title, color=discord.Color.blue())
+        for name, rating, deviation in teams:
+            value = f"{label}: {rating:.2f}" + (f" (±{deviation * 2:.0f})" if deviation is not None else "")
+            embed.add_field(name=name, value=value, inline=False)
+        total = len(self.store.registry) if table is None else len(table)
+        embed.set_footer(text=f"Page {page + 1}/{page_count(total)}")
+        return embed
+
+    @commands.command(name='display_team_elo',
+                      help='Display the top teams in pages of 10, by Elo or by another system (e.g. glicko2)')
+    async def show_top_teams(self, ctx, system: str = "elo"):
+        system = system.lower()
+        if system not in RATING_ENGINES:
+            await ctx.send(f"Unknown rating system '{system}'. Choose one of: {', '.join(RATING_ENGINES)}")
+            return
         try:
-            teams = self.unit_data["teams"]
-            
-            if not teams:
-                embed = discord.Embed(title="Top 10 Teams by Elo Rating", description="No teams available.", color=discord.Color.red())
-                await ctx.send(embed=embed)
-                return
-
-            sorted_teams = sorted(teams, key=lambda x: x["Elo Rating"], reverse=True)[:10]
-            embed = discord.Embed(title="Top 10 Teams by Elo Rating", color=discord.Color.blue())
-            for team in sorted_teams:
-                embed.add_field(name=team["Team Name"], value=f"Elo Rating: {team['Elo Rating']:.2f}", inline=False)
-
-            await ctx.send(embed=embed)
+            # Other systems' pages stay tagged with the log version their table was rated from
+            version = self.ranking_version(system)
+            table = None if system == "elo" else await self.engine_table(system)
+
+            def count_pages() -> int:
+                return page_count(len(self.store.registry) if table is None else len(table))
+
+            def render(page: int) -> discord.Embed:
+                current = self.ranking_version(system) if table is None else version
+                return self.ranking_pages.page(("teams", system), current, page,
+                                               lambda page: self.ranking_page(system, table, page))
+
+            await send_leaderboard(ctx, count_pages, render)
         except Exception as e:
             logging.error("Error in show_top_teams command", exc_info=True)
-            await ctx.send(f"Error displaying top teams: {str(e)}")
\ No newline at end of file
+            await ctx.send(f"Error displaying top teams: {str(e)}")
+
+    async def history_chart(self, team_name: str) -> Optional[bytes]:
+        """PNG of a team's rating history, re-rendered only after the team has played again."""
+        history = self.store.history
+        version = history.version(team_name)
+        if version is None:
+            return None
+        key = normalize_name(team_name)
+        cached = self.history_charts.get(key)
+        if cached and cached[0] == version:
+            self.history_charts.move_to_end(key)
+            return cached[1]
+
+        dates, ratings = history.series(team_name)
+        png = await self.renderer.render(render_rating_history, team_name, dates, ratings, key=f"history:{key}:{version}")
+        self.history_charts[key] = (version, png)
+        self.history_charts.move_to_end(key)
+        while len(self.history_charts) > HISTORY_CHART_CACHE_SIZE:
+            self.history_charts.popitem(last=False)
+        return png
+
+    @commands.command(name='team_elo_history', help='Show how a team\'s Elo rating developed over its matches')
+    async def show_team_history(self, ctx, *, team_name: str):
+        team = self.store.find_team(team_name)
+        name = team["Team Name"] if team else team_name
+        try:
+            png = await self.history_chart(name)
+        except ChartRenderError as e:
+            await ctx.send(str(e))
+            return
+        except Exception as e:
+            logging.error("Error in team_elo_history command", exc_info=True)
+            await ctx.send(f"Error displaying rating history: {str(e)}")
+            return
+        if png is None:
+            await ctx.send(f"No match history found for {team_name}.")
+            return
+        await ctx.send(file=discord.File(fp=BytesIO(png), filename='elo_history.png'))
+
+    @commands.command(name='head_to_head', help='Show the record between two teams, e.g. !head_to_head Team A vs Team B')
+    async def show_head_to_head(self, ctx, *, teams: str):
+        try:
+            team_a, team_b = parse_teams(teams)
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        record = self.store.head_to_head.head_to_head(team_a, team_b)
+        if record is None:
+            await ctx.send(f"{team_a} and {team_b} have not played each other.")
+            return
+        team = self.store.head_to_head.team_record(team_a)
+        embed = discord.Embed(title=f"{team.name} vs {record.name}", color=discord.Color.blue())
+        embed.add_field(name="Record", value=f"{record.wins}-{record.losses} ({record.played} matches)", inline=False)
+        embed.add_field(name="Last Played", value=record.last_played, inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name='team_profile', help='Show a team\'s rating, ladder position, record and most frequent opponents')
+    async def show_team_profile(self, ctx, *, team_name: str):
+        team = self.store.find_team(team_name)
+        record = self.store.head_to_head.team_record(team_name)
+        if team is None and record is None:
+            await ctx.send(f"Team not found: {team_name}")
+            return
+
+        embed = discord.Embed(title=team["Team Name"] if team else record.name, color=discord.Color.blue())
+        if team:
+            embed.add_field(name="Elo Rating", value=f"{team['Elo Rating']:.2f}", inline=True)
+            embed.add_field(name="Rank", value=f"#{self.store.registry.rank(team_name)} of {len(self.store.registry)}",
+                            inline=True)
+        if record:
+            win_rate = record.wins / record.played * 100
+            embed.add_field(name="Record", value=f"{record.wins}-{record.losses} ({win_rate:.0f}% wins)", inline=True)
+            embed.add_field(name="Last Played", value=record.last_played, inline=True)
+            opponents = self.store.head_to_head.opponents(team_name)[:5]
+            embed.add_field(name="Most Played Opponents",
+                            value="\n".join(f"{opponent.name}: {opponent.wins}-{opponent.losses}" for opponent in opponents),
+                            inline=False)
+        await ctx.send(embed=embed)
+
+    def resolve_teams(self, team_names: List[str]) -> Tuple[List[Dict], List[str]]:
+        """Look up teams by name; returns the teams found and the names that were not."""
+        teams, unknown = [], []
+        for team_name in team_names:
+            team = self.store.find_team(team_name)
+            if team is None:
+                unknown.append(team_name)
+            else:
+                teams.append(team)
+        return teams, unknown
+
+    @staticmethod
+    def format_probabilities(names: List[str], probabilities, columns: List[str]) -> List[str]:
+        """The probability table as code blocks that each fit in a message, repeating the header row."""
+        columns = columns[:MAX_SIMULATION_COLUMNS]
+        header = f"{'Team':<20}" + "".join(f"{column[:7]:>8}" for column in columns)
+        blocks, lines = [], [header]
+        for name, row in zip(names, probabilities.tolist()):
+            line = f"{name[:20]:<20}" + "".join(f"{value * 100:7.1f}%" for value in row[:len(columns)])
+            if len(lines) > 1 and sum(len(text) + 1 for text in lines) + len(line) + 6 > TABLE_MESSAGE_LIMIT:
+                blocks.append("```" + "\n".join(lines) + "```")
+                lines = [header]
+            lines.append(line)
+        blocks.append("```" + "\n".join(lines) + "```")
+        return blocks
+
+    @staticmethod
+    async def send_table(ctx, heading: str, blocks: List[str]) -> None:
+        await ctx.send(f"{heading}\n{blocks[0]}")
+        for block in blocks[1:]:
+            await ctx.send(block)
+
+    @commands.command(name='simulate_season',
+                      help='Forecast league positions from Elo, e.g. !simulate_season Team A vs Team B; Team C vs Team A')
+    async def simulate_season_command(self, ctx, *, fixtures: str):
+        try:
+            pairs = [parse_teams(fixture) for fixture in fixtures.replace("\n", ";").split(";") if fixture.strip()]
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+        named: Dict[str, str] = {}
+        for pair in pairs:
+            for name in pair:
+                named.setdefault(normalize_name(name), name)
+        teams, unknown = self.resolve_teams(list(named.values()))
+        if unknown:
+            await ctx.send(f"Unknown team(s): {', '.join(unknown)}")
+            return
+
+        index = {normalize_name(team["Team Name"]): position for position, team in enumerate(teams)}
+        codes = [(index[normalize_name(first)], index[normalize_name(second)]) for first, second in pairs]
+        try:
+            probabilities = await asyncio.to_thread(simulate_season, [team["Elo Rating"] for team in teams], codes)
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        # Most likely champions first
+        order = sorted(range(len(teams)), key=lambda position: tuple(-probabilities[position]))
+        names = [teams[position]["Team Name"] for position in order]
+        ordinals = [f"{n}{'st' if n == 1 else 'nd' if n == 2 else 'rd' if n == 3 else 'th'}" for n in range(1, len(teams) + 1)]
+        await self.send_table(ctx, f"Finishing position odds over {DEFAULT_SIMULATIONS:,} simulated seasons "
+                                   f"({len(pairs)} fixtures):",
+                              self.format_probabilities(names, probabilities[order], ordinals))
+
+    @commands.command(name='simulate_bracket',
+                      help='Forecast a knockout bracket from Elo, e.g. !simulate_bracket Team A, Team B, Team C, Team D')
+    async def simulate_bracket_command(self, ctx, *, bracket: str):
+        team_names = [name.strip() for name in bracket.split(",") if name.strip()]
+        if len({normalize_name(name) for name in team_names}) != len(team_names):
+            await ctx.send("Each team can only appear once in a bracket.")
+            return
+        teams, unknown = self.resolve_teams(team_names)
+        if unknown:
+            await ctx.send(f"Unknown team(s): {', '.join(unknown)}")
+            return
+        try:
+            probabilities = await asyncio.to_thread(simulate_bracket, [team["Elo Rating"] for team in teams])
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        # Title odds first, then the deepest runs
+        columns = bracket_round_names(len(teams))[::-1]
+        probabilities = probabilities[:, ::-1]
+        order = sorted(range(len(teams)), key=lambda position: tuple(-probabilities[position]))
+        await self.send_table(ctx, f"Bracket odds over {DEFAULT_SIMULATIONS:,} simulations (going out in each round):",
+                              self.format_probabilities([teams[position]["Team Name"] for position in order],
+                                                        probabilities[order], columns))
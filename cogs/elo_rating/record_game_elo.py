@@ -1,9 +1,13 @@
-import json
-import os
+import asyncio
 import datetime
 import logging
 from discord.ext import commands
-from typing import Dict
+from typing import Any, Dict, Optional
+from utils.elo_store import EloStore, get_elo_store, expected_score, elo_deltas, DEFAULT_RATING, PLAYOFF_MULTIPLIER
+from utils.elo_replay import replay_ratings
+from utils.elo_writer import EloWriter
+from utils.match_import import MatchImportError, parse_match_import, parse_teams, rating_deltas
+from utils.name_index import normalize_name
 
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -11,70 +15,53 @@ logging.basicConfig(
 
 
 class TeamRecordingSystem(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, store: Optional[EloStore] = None):
         self.bot = bot
         self.k_factor = 32
-        self.json_path = os.path.join(
-            os.path.dirname(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            ),
-            "data",
-            "elo_rating.json",
-        )
+        self.store = store or get_elo_store()
+        # Every change goes through the writer, so concurrent commands are applied in order
+        self.writer = EloWriter(self.store)
+        self.json_path = self.store.snapshot_path
+
+    @property
+    def unit_data(self) -> Dict:
+        return self.store.data
 
-        with open(self.json_path) as f:
-            self.unit_data = json.load(f)
+    async def cog_unload(self):
+        await self.writer.flush()
+        await self.writer.stop()
 
     def calculate_expected_score(
         self, team_rating: float, opponent_rating: float
     ) -> float:
         """Calculate expected score for a team"""
-        return 1 / (1 + 10 ** ((opponent_rating - team_rating) / 400))
+        return expected_score(team_rating, opponent_rating)
 
     def update_elo(
         self, winning_team: Dict, losing_team: Dict, playoff_multiplier: float = 1.0
     ):
         """Update Elo ratings for the winning and losing teams"""
-        expected_winner = self.calculate_expected_score(
-            winning_team["Elo Rating"], losing_team["Elo Rating"]
+        winner_delta, loser_delta = elo_deltas(
+            winning_team["Elo Rating"],
+            losing_team["Elo Rating"],
+            self.k_factor,
+            playoff_multiplier,
         )
-        expected_loser = self.calculate_expected_score(
-            losing_team["Elo Rating"], winning_team["Elo Rating"]
-        )
-
-        adjustment = self.k_factor * playoff_multiplier
 
-        winning_team["Elo Rating"] += adjustment * (1 - expected_winner)
-        losing_team["Elo Rating"] += adjustment * (0 - expected_loser)
+        for team, delta in ((winning_team, winner_delta), (losing_team, loser_delta)):
+            if self.store.find_team(team.get("Team Name", "")) is team:
+                # Through the registry, so the ranking it keeps moves with the rating
+                self.store.registry.set_rating(team, team["Elo Rating"] + delta)
+            else:
+                team["Elo Rating"] += delta
 
     def parse_teams(self, match_details: str):
         """Parse team names from the input using multiple separators"""
-        match_details_lower = match_details.lower()
-        if " vs " in match_details_lower:
-            team_a, team_b = match_details.split(" vs ", 1)
-        elif " versus " in match_details_lower:
-            team_a, team_b = match_details.split(" versus ", 1)
-        elif " and " in match_details_lower:
-            team_a, team_b = match_details.rsplit(" and ", 1)
-        else:
-            parts = [p.strip() for p in match_details.split(",")]
-            if len(parts) == 2:
-                team_a, team_b = parts
-            else:
-                raise ValueError(
-                    "Unable to parse team names. Use 'vs', 'versus', 'and', or ',' as separators."
-                )
-        return team_a.strip(), team_b.strip()
+        return parse_teams(match_details)
 
     def add_team_if_not_exists(self, team_name: str):
         """Add a new team to the data if it doesn't already exist"""
-        if not any(
-            team["Team Name"].lower() == team_name.lower()
-            for team in self.unit_data["teams"]
-        ):
-            logging.info(f"Adding new team: {team_name}")
-            new_team = {"Team Name": team_name, "Elo Rating": 1000.0, "Matches": []}
-            self.unit_data["teams"].append(new_team)
+        self.store.add_team_if_not_exists(team_name)
 
     @commands.command(
         name="record_match",
@@ -88,7 +75,9 @@ class TeamRecordingSystem(commands.Cog):
             )
 
             # Determine playoff multiplier
-            playoff_multiplier = 1.5 if match_type.lower() == "playoff" else 1.0
+            playoff_multiplier = (
+                PLAYOFF_MULTIPLIER if match_type.lower() == "playoff" else 1.0
+            )
 
             # Parse team names
             try:
@@ -97,44 +86,15 @@ class TeamRecordingSystem(commands.Cog):
                 await ctx.send(str(e))
                 return
 
-            # Ensure both teams exist in the data
-            self.add_team_if_not_exists(winning_team_name)
-            self.add_team_if_not_exists(losing_team_name)
-
-            # Look up the winning and losing teams
-            teams = self.unit_data["teams"]
-            winning_team = next(
-                t for t in teams if t["Team Name"].lower() == winning_team_name.lower()
-            )
-            losing_team = next(
-                t for t in teams if t["Team Name"].lower() == losing_team_name.lower()
-            )
-
-            self.update_elo(
-                winning_team, losing_team, playoff_multiplier=playoff_multiplier
+            # Rate the match and append it to the journal; teams are created if needed
+            await self.writer.record_match(
+                winning_team_name,
+                losing_team_name,
+                str(datetime.date.today()),
+                playoff_multiplier=playoff_multiplier,
+                k_factor=self.k_factor,
             )
 
-            # Record the match result
-            match_date = str(datetime.date.today())
-            winning_team["Matches"].append(
-                {
-                    "Opponent": losing_team["Team Name"],
-                    "Result": "Win",
-                    "Date": match_date,
-                }
-            )
-            losing_team["Matches"].append(
-                {
-                    "Opponent": winning_team["Team Name"],
-                    "Result": "Loss",
-                    "Date": match_date,
-                }
-            )
-
-            # Save updated data back to the JSON file
-            with open(self.json_path, "w") as f:
-                json.dump(self.unit_data, f, indent=4)
-
             await ctx.send(
                 f"Match recorded: {winning_team_name} wins against {losing_team_name}!"
             )
@@ -150,3 +110,175 @@ class TeamRecordingSystem(commands.Cog):
             await ctx.send("Only my creator can use this command.")
         else:
             await ctx.send("An error occurred while processing the command.")
+
+    def parse_replay_options(self, options: str) -> Dict[str, Any]:
+        """Parse `k=24 playoff=2 exclude=3,17 apply` style options for replay_elo."""
+        settings: Dict[str, Any] = {
+            "k_factor": float(self.k_factor),
+            "playoff_multiplier": None,
+            "exclude": set(),
+            "apply": False,
+        }
+        for option in options.split():
+            key, _, value = option.partition("=")
+            key = key.lower()
+            try:
+                if key == "k":
+                    settings["k_factor"] = float(value)
+                elif key == "playoff":
+                    settings["playoff_multiplier"] = float(value)
+                elif key == "exclude":
+                    # Match numbers are shown 1-based by !match_log
+                    settings["exclude"] = {int(number) - 1 for number in value.split(",") if number}
+                elif key == "apply" and not value:
+                    settings["apply"] = True
+                else:
+                    raise ValueError
+            except ValueError:
+                raise ValueError(
+                    f"Invalid option '{option}'. Use k=<number>, playoff=<number>, exclude=<n,n,...> or apply."
+                )
+        return settings
+
+    @commands.command(
+        name="replay_elo",
+        help="Show how other replay settings would move every Elo rating. Options: k=, playoff=, exclude=, apply",
+    )
+    @commands.is_owner()
+    async def replay_elo(self, ctx, *, options: str = ""):
+        try:
+            settings = self.parse_replay_options(options)
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        match_log = list(self.store.match_log)
+        scenario = await asyncio.to_thread(
+            replay_ratings,
+            match_log,
+            settings["k_factor"],
+            settings["playoff_multiplier"],
+            settings["exclude"],
+        )
+        baseline = await asyncio.to_thread(replay_ratings, match_log, self.k_factor)
+
+        def by_team(replay):
+            team_names, ratings = replay
+            return {normalize_name(name): rating for name, rating in zip(team_names, ratings[0].tolist())}
+
+        # Older matches were derived without a reliable order, so a replay from scratch does not
+        # reproduce the ladder; the options' effect is measured against a plain replay instead
+        scenario, baseline = by_team(scenario), by_team(baseline)
+
+        def replayed_rating(team):
+            key = normalize_name(team["Team Name"])
+            return team["Elo Rating"] + scenario.get(key, DEFAULT_RATING) - baseline.get(key, DEFAULT_RATING)
+
+        replayed = {normalize_name(team["Team Name"]): replayed_rating(team) for team in self.store.teams}
+        top_teams = sorted(self.store.teams, key=replayed_rating, reverse=True)[:10]
+        lines = [
+            f"{team['Team Name'][:28]:<28} {replayed_rating(team):8.2f} "
+            f"({replayed_rating(team) - team['Elo Rating']:+.2f})"
+            for team in top_teams
+        ]
+        summary = (
+            f"Replayed {len(match_log) - len(settings['exclude'] & set(range(len(match_log))))} matches "
+            f"with K={settings['k_factor']:g}"
+            + (f", playoff x{settings['playoff_multiplier']:g}" if settings["playoff_multiplier"] else "")
+            + (f", excluding {len(settings['exclude'])} match(es)" if settings["exclude"] else "")
+            + ". Top 10 (change vs current):\n```" + "\n".join(lines) + "```\n"
+        )
+
+        if settings["apply"]:
+            kept_log = [match for position, match in enumerate(match_log) if position not in settings["exclude"]]
+            if settings["playoff_multiplier"]:
+                # Keep the log in line with the replayed ratings, so the history matches them
+                kept_log = [dict(match, Multiplier=settings["playoff_multiplier"])
+                            if match.get("Multiplier", 1.0) > 1.0 else match for match in kept_log]
+            # The writer checks the log length once every queued result is in, not just now
+            if await self.writer.replace_history(kept_log, replayed, settings["k_factor"],
+                                                 expected_length=len(match_log)):
+                summary += "Replayed ratings applied and saved."
+            else:
+                summary += "Matches were recorded during the replay, so the result was not applied."
+        await ctx.send(summary)
+
+    @commands.command(name="match_log", help="Show the latest numbered matches, optionally for one team")
+    @commands.is_owner()
+    async def show_match_log(self, ctx, *, team_name: Optional[str] = None):
+        numbered = [
+            (number, match)
+            for number, match in enumerate(self.store.match_log, 1)
+            if not team_name or team_name.lower() in (match["Winner"].lower(), match["Loser"].lower())
+        ][-15:]
+        if not numbered:
+            await ctx.send("No matches found.")
+            return
+        lines = [
+            f"#{number} {match['Date']}: {match['Winner']} beat {match['Loser']}"
+            + (" (playoff)" if match.get("Multiplier", 1.0) > 1.0 else "")
+            for number, match in numbered
+        ]
+        await ctx.send("```" + "\n".join(lines) + "```")
+
+    @commands.command(
+        name="import_matches",
+        help="Import a season of results from an attached CSV/JSON file or a local file path",
+    )
+    @commands.is_owner()
+    async def import_matches(self, ctx, *, path: Optional[str] = None):
+        if ctx.message.attachments:
+            attachment = ctx.message.attachments[0]
+            try:
+                filename, content = attachment.filename, (await attachment.read()).decode("utf-8-sig")
+            except UnicodeDecodeError:
+                await ctx.send("The attachment is not a UTF-8 text file.")
+                return
+        elif path:
+            try:
+                filename = path.strip()
+                with open(filename, "r", encoding="utf-8-sig") as f:
+                    content = f.read()
+            except OSError as e:
+                await ctx.send(f"Could not read {path}: {e.strerror}")
+                return
+        else:
+            await ctx.send("Attach a CSV or JSON file (winner, loser, date, type columns) or give a file path.")
+            return
+
+        try:
+            matches = parse_match_import(content, filename)
+        except MatchImportError as e:
+            errors = e.errors[:10] + ([f"... and {len(e.errors) - 10} more"] if len(e.errors) > 10 else [])
+            await ctx.send("Nothing was imported:\n```" + "\n".join(errors) + "```")
+            return
+
+        try:
+            before, after, imported, skipped = await self.writer.import_matches(matches, self.k_factor)
+        except Exception as e:
+            logging.error("Error in import_matches command", exc_info=True)
+            await ctx.send(f"Error importing matches: {str(e)}")
+            return
+        if not imported:
+            await ctx.send(f"Nothing was imported: all {skipped} matches are already in the log.")
+            return
+        duplicates = f" Skipped {skipped} match(es) already in the log." if skipped else ""
+        lines = [f"{name[:28]:<28} {rating:8.2f} ({delta:+.2f})" for name, rating, delta in rating_deltas(before, after)]
+        if len(lines) > 25:
+            lines = lines[:12] + [f"... {len(lines) - 24} more teams ..."] + lines[-12:]
+        await ctx.send(
+            f"Imported {len(imported)} matches from {imported[0]['Date']} to {imported[-1]['Date']}.{duplicates} "
+            "Rating changes:\n```" + "\n".join(lines) + "```"
+        )
+
+    @replay_elo.error
+    async def replay_elo_error(self, ctx, error):
+        await self.record_match_error(ctx, error)
+
+    @show_match_log.error
+    async def show_match_log_error(self, ctx, error):
+        await self.record_match_error(ctx, error)
+
+    @import_matches.error
+    async def import_matches_error(self, ctx, error):
+        await self.record_match_error(ctx, error)
@@ -1,31 +1,41 @@
 from discord.ext import commands
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import textwrap
 from concurrent.futures import ThreadPoolExecutor
-from utils.data_loader import load_unit_data
-from utils.gemini_prompt import generate_analysis
-from utils.unit_performance import make_hashable_unit, analyze_faction_weights, calculate_all_faction_stats
+from utils.data_loader import UnitCatalog, get_unit_catalog
+from utils.gemini_prompt import GEMINI_REQUEST_TIMEOUT, build_prompt, request_analysis
 
 UnitData = Dict[str, Any]
 FactionData = Dict[str, List[UnitData]]
 
+# Gemini calls at once; more requests wait for a free slot instead of piling onto the API
+MAX_CONCURRENT_ANALYSES = 4
+# Seconds a command waits for Gemini once its call has started
+ANALYSIS_TIMEOUT = GEMINI_REQUEST_TIMEOUT + 5
+
 logging.basicConfig(level=logging.INFO)
-executor = ThreadPoolExecutor(max_workers=4)
+# Gemini's client blocks for the whole LLM round trip, so calls run here rather than on the event loop
+executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ANALYSES, thread_name_prefix='gemini')
 
 class FactionAnalysisBot(commands.Cog):
-    def __init__(self, bot: commands.Bot):
+    def __init__(self, bot: commands.Bot, catalog: Optional[UnitCatalog] = None):
         self.bot = bot
-        self.analysis_cache: Dict[str, str] = {}
-        self.unit_data: List[UnitData] = load_unit_data()
-        self.factions: Dict[str, List[UnitData]] = self._group_units_by_faction()
+        # Analyses are keyed by faction and catalog version, so reloaded data is re-analysed
+        self.analysis_cache: Dict[Tuple[str, int], str] = {}
+        self.catalog = catalog or get_unit_catalog()
+        self.analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+        # Analyses being generated, so concurrent requests for one faction share a call
+        self.pending_analyses: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    def cog_unload(self) -> None:
+        for task in self.pending_analyses.values():
+            task.cancel()
 
-    def _group_units_by_faction(self) -> Dict[str, List[UnitData]]:
-        """Organize units by faction."""
-        factions: Dict[str, List[UnitData]] = {}
-        for unit in self.unit_data:
-            factions.setdefault(unit["Faction"], []).append(unit)
-        return factions
+    @property
+    def factions(self) -> FactionData:
+        return self.catalog.factions
 
     async def send_long_message(self, ctx: commands.Context, faction_name: str, content: str) -> None:
         """Send a long message in chunks to avoid character limits."""
@@ -36,14 +46,36 @@ class FactionAnalysisBot(commands.Cog):
 
     async def get_or_generate_analysis(self, faction_name: str) -> str:
         """Retrieve cached analysis or generate new analysis for a faction."""
-        if faction_name in self.analysis_cache:
-            return self.analysis_cache[faction_name]
+        cache_key = (faction_name, self.catalog.version)
+        if cache_key in self.analysis_cache:
+            return self.analysis_cache[cache_key]
+
+        task = self.pending_analyses.get(cache_key)
+        if task is None:
+            all_factions_stats = self.catalog.faction_stats
+            prompt = build_prompt(faction_name, all_factions_stats[faction_name], all_factions_stats)
+            task = asyncio.ensure_future(self.generate_analysis(cache_key, prompt))
+            self.pending_analyses[cache_key] = task
+            task.add_done_callback(lambda _: self.pending_analyses.pop(cache_key, None))
+        # Shielded, so one caller timing out or being cancelled does not abort the call for the others
+        return await asyncio.shield(task)
 
-        units_tuple = tuple(make_hashable_unit(unit) for unit in self.factions[faction_name])
-        stats = analyze_faction_weights(units_tuple, faction_name)
-        all_factions_stats = calculate_all_faction_stats(self.factions)
-        analysis = generate_analysis(faction_name, stats, all_factions_stats)
-        self.analysis_cache[faction_name] = analysis
+    async def generate_analysis(self, cache_key: Tuple[str, int], prompt: str) -> str:
+        """
+        Ask Gemini on the executor, at most MAX_CONCURRENT_ANALYSES calls at once.
+        Raises asyncio.TimeoutError after ANALYSIS_TIMEOUT; failures are not cached.
+        """
+        await self.analysis_slots.acquire()
+        try:
+            call = asyncio.get_running_loop().run_in_executor(executor, request_analysis, prompt)
+        except BaseException:
+            self.analysis_slots.release()
+            raise
+        # A timed-out call keeps its executor thread, so it keeps its slot until the thread is done;
+        # otherwise the next call's timeout would include time spent queued behind it
+        call.add_done_callback(lambda _: self.analysis_slots.release())
+        analysis = await asyncio.wait_for(asyncio.shield(call), ANALYSIS_TIMEOUT)
+        self.analysis_cache[cache_key] = analysis
         return analysis
 
     @commands.command(name='faction_analysis', help='Analyze the strengths and weaknesses of a faction.')
@@ -63,6 +95,9 @@ class FactionAnalysisBot(commands.Cog):
             try:
                 analysis = await self.get_or_generate_analysis(faction_name)
                 await self.send_long_message(ctx, faction_name, analysis)
+            except asyncio.TimeoutError:
+                logging.error(f"Analysis of faction {faction_name} timed out")
+                await ctx.send(f"Analysing {faction_name} took too long. Please try again later.")
             except Exception as e:
                 logging.error(f"Error analyzing faction {faction_name}: {e}")
                 await ctx.send(f"Error analyzing faction {faction_name}. Please try again later.")
\ No newline at end of file
@@ -1,31 +1,22 @@
 from typing import Dict, List, Optional
 from discord.ext import commands
-from utils.unit_performance import make_hashable_unit, analyze_faction_weights
-from utils.data_loader import load_unit_data
+from utils.data_loader import UnitCatalog, get_unit_catalog
 
 class FactionComparison(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, catalog: Optional[UnitCatalog] = None):
         self.bot = bot
-        self.unit_data = load_unit_data()
+        self.catalog = catalog or get_unit_catalog()
 
-        self.factions: Dict[str, List[dict]] = {}
-        self._group_units_by_faction()
-
-    def _group_units_by_faction(self):
-        for unit in self.unit_data:
-            faction = unit["Faction"]
-            if faction not in self.factions:
-                self.factions[faction] = []
-            self.factions[faction].append(unit)
+    @property
+    def factions(self) -> Dict[str, List[dict]]:
+        return self.catalog.factions
 
     async def compare_factions(self, faction1: str, faction2: str) -> str:
         if faction1 not in self.factions or faction2 not in self.factions:
             return f"One or both factions '{faction1}' and '{faction2}' not found."
 
-        stats_faction1 = analyze_faction_weights(tuple(make_hashable_unit(unit)
-                        for unit in self.factions[faction1]),faction_name=faction1)
-        stats_faction2 = analyze_faction_weights(tuple(make_hashable_unit(unit)
-                        for unit in self.factions[faction2]), faction_name=faction2)
+        stats_faction1 = self.catalog.faction_stats[faction1]
+        stats_faction2 = self.catalog.faction_stats[faction2]
 
         comparison = (
         f"**Comparison between {faction1} and {faction2}:**\n\n"
@@ -1,82 +1,69 @@
 import discord
 from discord.ext import commands
 from typing import Optional, List, Dict, Any
-from utils.data_loader import load_player_data
+import numpy as np
+from utils.leaderboard_pages import PAGE_SIZE, LeaderboardPages, page_count, send_leaderboard
+from utils.player_stats import (PlayerStats, RatingWeights, DEFAULT_RATING_WEIGHTS, RATING_MIN_GAMES,
+                                calculate_player_rating, get_player_stats, parse_stat)
+
+# Option names accepted by !tune_rating, mapped to RatingWeights fields
+WEIGHT_OPTIONS = {
+    'base': 'base_rating',
+    'win': 'win_percentage',
+    'kd': 'kd_ratio',
+    'chevrons': 'chevrons_per_game',
+    'playoff': 'playoff_rate',
+    'min_games': 'min_games',
+    'low_games': 'low_games_multiplier',
+}
 
 class HistoricalResults(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, stats: Optional[PlayerStats] = None):
         self.bot = bot
+        # Parsed once and hot-reloaded by the data watcher, so commands never touch the file
+        self.stats = stats or get_player_stats()
+        self.leaderboard_pages = LeaderboardPages()
 
     def _parse_percentage(self, percentage_str: Optional[str]) -> float:
         """Convert a percentage string or numeric to a float."""
-        if not percentage_str:
-            return 0.0
-        try:
-            return float(str(percentage_str).strip('%'))
-        except ValueError:
-            return 0.0
+        return parse_stat(percentage_str)
 
     def calculate_player_rating(self, player_data: dict) -> float:
         """Calculates the player's rating based on various metrics."""
-        base_rating = 1000.0
-        win_percentage = self._parse_percentage(player_data.get('Win %', ''))
-        playoff_rate = self._parse_percentage(player_data.get('Playoff Rate', ''))
-        games_played = int(player_data.get('Games Played', 0) or 0)
-
-        # Calculate the rating
-        performance_multiplier = 0.5 if games_played < 20 else 1.0
-        rating = base_rating + (win_percentage * 5) + (float(player_data.get('K/D ratio', 0) or 0) * 100)
-        rating += float(player_data.get('Chevrons/game', 0) or 0) * 25
-
-        # Add extra points for achievements
-        achievements = {
-            'Championships': 30,
-            'Runner-ups': 20,
-            'Third Places': 10,
-            'Top 3 Best KD Ratios': 5,
-            'Top 3 Most Chevrons/Game': 5
-        }
-        for key, points in achievements.items():
-            rating += int(player_data.get(key, 0) or 0) * points
-
-        rating += playoff_rate * 3
-        rating *= performance_multiplier
-        return round(rating, 2)
-
-    def generate_leaderboard(self) -> List[Dict[str, Any]]:
+        return calculate_player_rating(player_data)
+
+    def generate_leaderboard(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """Generates a leaderboard based on player ratings."""
-        players_data = load_player_data()
-        leaderboard = [
+        stats = self.stats
+        return [
             {
-                'Player': player['Player'],
-                'Rating': self.calculate_player_rating(player),
-                'Games Played': int(player.get('Games Played', 0) or 0),
-                'Win %': player.get('Win %', ''),
-                'K/D ratio': player.get('K/D ratio', ''),
-                'Chevrons/game': player.get('Chevrons/game', ''),
-                'Championships': player.get('Championships', 0)
+                'Player': stats.names[row],
+                'Rating': float(stats.column('Rating')[row]),
+                'Games Played': int(stats.column('Games Played')[row]),
+                'Win %': stats.players[row].get('Win %', ''),
+                'K/D ratio': stats.players[row].get('K/D ratio', ''),
+                'Chevrons/game': stats.players[row].get('Chevrons/game', ''),
+                'Championships': stats.players[row].get('Championships', 0)
             }
-            for player in players_data if int(player.get('Games Played', 0) or 0) >= 10
+            for row in stats.leaderboard('Rating', limit, offset).tolist()
         ]
-        return sorted(leaderboard, key=lambda x: x['Rating'], reverse=True)
 
-    def generate_metric_leaderboard(self, metric_key: str) -> List[Dict[str, Any]]:
+    def generate_metric_leaderboard(self, metric_key: str, limit: Optional[int] = None,
+                                    offset: int = 0) -> List[Dict[str, Any]]:
         """Generates a leaderboard based on a specific metric."""
-        players_data = load_player_data()
-        leaderboard = [
+        stats = self.stats
+        return [
             {
-                'Player': player['Player'],
-                metric_key: self._parse_percentage(player.get(metric_key, '0')),
-                'Games Played': int(player.get('Games Played', 0) or 0)
+                'Player': stats.names[row],
+                metric_key: float(stats.column(metric_key)[row]),
+                'Games Played': int(stats.column('Games Played')[row])
             }
-            for player in players_data if int(player.get('Games Played', 0) or 0) >= 20
+            for row in stats.leaderboard(metric_key, limit, offset).tolist()
         ]
-        return sorted(leaderboard, key=lambda x: x[metric_key], reverse=True)
 
     def get_player_history(self, player_name: str) -> Optional[dict]:
-        """Retrieve a player's historical data by name"""
-        players_data = load_player_data()
-        player = next((p for p in players_data if p['Player'].lower() == player_name.lower()), None)
+        """Retrieve a player's historical data by name, tolerating case, prefixes and small typos"""
+        player = self.stats.find(player_name)
         if player:
             return {key: player.get(key, 'N/A') for key in (
                 "Total Kills", "Total Losses", "Games Played", "Games Won",
@@ -85,29 +72,60 @@ class HistoricalResults(commands.Cog):
             )}
         return None
 
-    async def display_leaderboard(self, ctx, title: str, leaderboard: List[dict], metric: str):
-        """Send an embedded leaderboard message."""
+    def player_not_found_message(self, player_name: str) -> str:
+        suggestions = self.stats.suggest_players(player_name)
+        if suggestions:
+            return f"No historical data found for player '{player_name}'! Did you mean: {', '.join(suggestions)}?"
+        return f"No historical data found for player '{player_name}'!"
+
+    def leaderboard_embed(self, title: str, leaderboard: List[dict], metric: str, start: int = 0) -> discord.Embed:
+        """An embedded leaderboard whose first entry is ranked `start + 1`."""
         embed = discord.Embed(title=title, color=discord.Color.gold())
-        for rank, player in enumerate(leaderboard[:10], 1):
+        for rank, player in enumerate(leaderboard[:PAGE_SIZE], start + 1):
             embed.add_field(
                 name=f"{rank}. {player['Player']}",
                 value=f"{metric}: {player[metric]}, Games Played: {player['Games Played']}",
                 inline=False
             )
-        await ctx.send(embed=embed)
+        return embed
+
+    async def display_leaderboard(self, ctx, title: str, leaderboard: List[dict], metric: str):
+        """Send an embedded leaderboard message."""
+        await ctx.send(embed=self.leaderboard_embed(title, leaderboard, metric))
+
+    def leaderboard_page(self, title: str, metric: str, page: int) -> discord.Embed:
+        start = page * PAGE_SIZE
+        if metric == 'Rating':
+            leaderboard = self.generate_leaderboard(PAGE_SIZE, start)
+        else:
+            leaderboard = self.generate_metric_leaderboard(metric, PAGE_SIZE, start)
+        embed = self.leaderboard_embed(title, leaderboard, metric, start)
+        embed.set_footer(text=f"Page {page + 1}/{page_count(len(self.stats.leaderboard(metric)))}")
+        return embed
+
+    async def display_paged_leaderboard(self, ctx, title: str, metric: str):
+        """Send a leaderboard of every eligible player, ten per page, with buttons to page through it."""
+        def render(page: int) -> discord.Embed:
+            return self.leaderboard_pages.page(('historical', metric, title), self.stats.version, page,
+                                               lambda page: self.leaderboard_page(title, metric, page))
+
+        await send_leaderboard(ctx, lambda: page_count(len(self.stats.leaderboard(metric))), render)
 
     @commands.command(name='player_history', help='Display the historical results and achievent of a specific player')
     async def show_player_history(self, ctx, *, player_name: Optional[str] = None):
         if not player_name:
             await ctx.send("Please enter a player's name. Example: !player_history Hyena")
             return
-        history = self.get_player_history(player_name)
-        if not history:
-            await ctx.send(f"No historical data found for player '{player_name}'!")
+        row = self.stats.find_row(player_name)
+        if row is None:
+            await ctx.send(self.player_not_found_message(player_name))
             return
 
-        rating = self.calculate_player_rating(history)
-        embed = discord.Embed(title=f"Historical Results: {player_name}", color=discord.Color.purple())
+        name = self.stats.names[row]
+        history = self.get_player_history(name)
+        # From the parsed columns, as the history pads missing stats with 'N/A'
+        rating = float(self.stats.column('Rating')[row])
+        embed = discord.Embed(title=f"Historical Results: {name}", color=discord.Color.purple())
         for stat, value in history.items():
             embed.add_field(name=stat, value=value, inline=True)
 
@@ -116,15 +134,70 @@ class HistoricalResults(commands.Cog):
 
     @commands.command(name='historical_leaderboard', help = 'Display the players with the highest rating')
     async def show_leaderboard(self, ctx):
-        leaderboard = self.generate_leaderboard()
-        await self.display_leaderboard(ctx, "Top Players Leaderboard", leaderboard, "Rating")
+        await self.display_paged_leaderboard(ctx, "Top Players Leaderboard", "Rating")
 
     @commands.command(name='win_percentage_leaderboard', help = 'Display the players with the highest win rate')
     async def win_percentage_leaderboard(self, ctx):
-        leaderboard = self.generate_metric_leaderboard("Win %")
-        await self.display_leaderboard(ctx, "Top Players by Win %", leaderboard, "Win %")
+        await self.display_paged_leaderboard(ctx, "Top Players by Win %", "Win %")
 
     @commands.command(name='kd_ratio_leaderboard', help = 'Display the players with the highest k/d ratio')
     async def kd_ratio_leaderboard(self, ctx):
-        leaderboard = self.generate_metric_leaderboard("K/D ratio")
-        await self.display_leaderboard(ctx, "Top Players by K/D Ratio", leaderboard, "K/D ratio")
\ No newline at end of file
+        await self.display_paged_leaderboard(ctx, "Top Players by K/D Ratio", "K/D ratio")
+
+    @commands.command(name='leaderboard', help='Display the top players by any stat, e.g. !leaderboard Chevrons/game')
+    async def metric_leaderboard(self, ctx, *, metric: Optional[str] = None):
+        metric_key = self.stats.resolve_metric(metric) if metric else None
+        if metric_key is None:
+            await ctx.send("Please choose one of these stats: " + ", ".join(self.stats.metrics()))
+            return
+        title = "Top Players Leaderboard" if metric_key == 'Rating' else f"Top Players by {metric_key}"
+        await self.display_paged_leaderboard(ctx, title, metric_key)
+
+    def parse_weight_options(self, options: str) -> RatingWeights:
+        """Parse `kd=80 championships=50 min_games=10` style options for tune_rating."""
+        changes: Dict[str, Any] = {'achievements': {}}
+        achievements = {key.lower().replace(' ', '_'): key for key in DEFAULT_RATING_WEIGHTS.achievements}
+        for option in options.split():
+            key, _, value = option.partition('=')
+            key = key.lower()
+            try:
+                number = float(value)
+            except ValueError:
+                number = None
+            if number is None or (key not in WEIGHT_OPTIONS and key not in achievements):
+                raise ValueError(
+                    f"Invalid option '{option}'. Use <name>=<number> with one of: "
+                    + ", ".join(list(WEIGHT_OPTIONS) + list(achievements))
+                )
+            if key in WEIGHT_OPTIONS:
+                changes[WEIGHT_OPTIONS[key]] = number
+            else:
+                changes['achievements'][achievements[key]] = number
+        return DEFAULT_RATING_WEIGHTS.replaced(**changes)
+
+    @commands.command(name='tune_rating', help='Preview the rating leaderboard under other weights, e.g. !tune_rating kd=80 min_games=10')
+    @commands.is_owner()
+    async def tune_rating(self, ctx, *, options: str = ""):
+        try:
+            weights = self.parse_weight_options(options)
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        stats = self.stats
+        ratings = stats.rerated(weights)
+        rows = np.flatnonzero(stats.column('Games Played') >= RATING_MIN_GAMES)
+        rows = rows[np.argsort(-ratings[rows], kind='stable')][:10]
+        current = {row: rank for rank, row in enumerate(stats.leaderboard('Rating').tolist(), 1)}
+        lines = [
+            f"{rank:>2}. {stats.names[row][:20]:<20} {ratings[row]:8.2f} (was #{current.get(row, '-')})"
+            for rank, row in enumerate(rows.tolist(), 1)
+        ]
+        await ctx.send("Top 10 with the tuned weights:\n```" + "\n".join(lines) + "```")
+
+    @tune_rating.error
+    async def tune_rating_error(self, ctx, error):
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("Only my creator can use this command.")
+        else:
+            await ctx.send("An error occurred while processing the command.")
\ No newline at end of file
@@ -1,79 +1,61 @@
 import discord
 from discord.ext import commands
 import logging
-import matplotlib.pyplot as plt
-import matplotlib.axes
-import numpy as np
-from typing import Optional
+import re
+from typing import List, Optional
 from io import BytesIO
-from utils.data_loader import load_unit_data
+from utils.chart_cache import ChartCache, chart_key, get_chart_cache
+from utils.chart_renderer import ChartRenderer, ChartRenderError, get_chart_renderer
+from utils.charts import COMPARISON_STYLE, render_unit_bars, render_unit_comparison, render_unit_radar
+from utils.data_loader import UnitCatalog, get_unit_catalog
+from utils.stat_scales import COMPARISON_STATS, SCALES, stat_matrix
+
+# Bump when the drawing code changes, so cached charts are not reused
+COMPARISON_CHART_FORMAT = 1
+MAX_COMPARED_UNITS = 6
+COMPARISON_MODES = ('radar', 'bars')
+
+
+def parse_unit_list(units: str) -> List[str]:
+    """Split `A, B vs C` style unit lists into names."""
+    return [name.strip() for name in re.split(r',|\s+(?:vs|versus)\s+', units, flags=re.IGNORECASE) if name.strip()]
 
 class UnitStatsComparison(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, catalog: Optional[UnitCatalog] = None, chart_cache: Optional[ChartCache] = None,
+                 renderer: Optional[ChartRenderer] = None):
         self.bot = bot
-        self.unit_data = load_unit_data()
+        self.catalog = catalog or get_unit_catalog()
+        self.chart_cache = chart_cache or get_chart_cache()
+        # Renders in worker processes, so a chart never blocks the event loop
+        self.renderer = renderer or get_chart_renderer()
     def query_unit_stats(self, unit_name):
-        """Extract specific stat information for a unit."""
+        """Extract specific stat information for a unit, tolerating small typos in the name."""
         logging.info(f"Looking for unit: {unit_name}")
-        return next((unit for unit in self.unit_data if unit['Unit'].lower() == unit_name.lower()), None)
-
-    def compare_stats(self, unit1, unit2):
-        """Generate a comparison image for unit damage stats."""
-        plt.style.use('ggplot')
-        fig, ax = plt.subplots(figsize=(20, 8), dpi=100)
-
-        stats = [
-            'Base Damage', 'AP Damage', 'Weapon Damage',
-            'Bonus vs Large', 'Bonus vs Infantry',
-            'Charge Bonus', 'Melee Defense', 'Melee Attack',
-            'Armor', 'HP', 'Morale', 'Range',
-            'Base Missile Damage', 'AP Missile Damage',
-            'Total Missile Damage', 'Missile Block Chance', 'Ammo'
-        ]
-
-        unit1_stats = [unit1.get(stat, 0) for stat in stats]
-        unit2_stats = [unit2.get(stat, 0) for stat in stats]
-
-        color1, color2 = '#2ecc71', '#3498db'
-        bar_width = 0.35
-        index = np.arange(len(stats))
-
-        bars1 = ax.bar(index, unit1_stats, bar_width, color=color1, alpha=0.8)
-        bars2 = ax.bar(index + bar_width, unit2_stats, bar_width, color=color2, alpha=0.8)
-
-        self.add_value_labels(bars1, ax)
-        self.add_value_labels(bars2, ax)
-
-        self.setup_axes(ax, unit1, unit2, stats, index, bar_width)
-
-        buf = BytesIO()
-        plt.savefig(buf, format='png', facecolor='white', edgecolor='none',
-                    bbox_inches='tight', pad_inches=0.3)
-        buf.seek(0)
-        plt.close()
-        return buf
-
-    def add_value_labels(self, bars, ax):
-        """Add value labels on top of the bars."""
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2, height, f'{int(height)}',
-                    ha='center', va='bottom', fontsize=10, fontweight='bold', color='#444444')
-
-    def setup_axes(self, ax: matplotlib.axes.Axes, unit1, unit2, stats, index, bar_width):
-        """Setup the axes for the comparison plot."""
-        ax.set_xlabel('Unit Statistics', fontsize=12, fontweight='bold', labelpad=15)
-        ax.set_ylabel('Values', fontsize=12, fontweight='bold', labelpad=15)
-        ax.set_title(f"{unit1['Unit']} vs {unit2['Unit']}\n"
-                     f"[{unit1['Faction']} vs {unit2['Faction']}]", fontsize=14, fontweight='bold', pad=20)
-        ax.set_xticks(index + bar_width / 2)
-        ax.set_xticklabels(stats, fontsize=10, rotation=45, ha='right')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.set_facecolor('white')
-
-        custom_legend_labels = [f"{unit1['Unit']} (Green)", f"{unit2['Unit']} (Blue)"]
-        ax.legend(custom_legend_labels, loc='upper right', fontsize=12, frameon=False)
+        return self.catalog.find_unit(unit_name)
+
+    def unit_not_found_message(self, unit_name: str) -> str:
+        suggestions = self.catalog.suggest_units(unit_name)
+        if suggestions:
+            return f"Unit not found: {unit_name}. Did you mean: {', '.join(suggestions)}?"
+        return f"Unit not found: {unit_name}"
+
+    def comparison_key(self, unit1, unit2) -> str:
+        """
+        Cache key of a comparison chart: the ordered unit pair with the values it plots, the
+        style and the drawing code's format, so the key changes exactly when the chart would.
+        """
+        def plotted(unit):
+            return [unit['Unit'], unit['Faction'], [unit.get(stat, 0) for stat in COMPARISON_STATS]]
+        return chart_key('compare_stats', COMPARISON_CHART_FORMAT, COMPARISON_STYLE, plotted(unit1), plotted(unit2))
+
+    async def comparison_chart(self, unit1, unit2) -> bytes:
+        """PNG comparing two units, served from the chart cache and rendered off the event loop on a miss."""
+        key = self.comparison_key(unit1, unit2)
+        png = await self.chart_cache.get(key)
+        if png is None:
+            png = await self.renderer.render(render_unit_comparison, unit1, unit2, key=key)
+            await self.chart_cache.put(key, png)
+        return png
 
     @commands.command(name='compare_stats', help='Compare damage stats of two units')
     async def compare_stats_command(self, ctx: commands.Context, *, units: Optional[str] = None):
@@ -111,13 +93,71 @@ class UnitStatsComparison(commands.Cog):
         unit2 = self.query_unit_stats(unit2_name)
 
         if not unit1:
-            await ctx.send(f"Unit not found: {unit1_name}")
+            await ctx.send(self.unit_not_found_message(unit1_name))
             return
         if not unit2:
-            await ctx.send(f"Unit not found: {unit2_name}")
+            await ctx.send(self.unit_not_found_message(unit2_name))
             return
 
         # Run the comparison and send the result
-        comparison_image = self.compare_stats(unit1, unit2)
+        try:
+            comparison_image = BytesIO(await self.comparison_chart(unit1, unit2))
+        except ChartRenderError as e:
+            await ctx.send(str(e))
+            return
         file = discord.File(fp=comparison_image, filename='stats_comparison.png')
         await ctx.send(file=file)
+
+    async def multi_comparison_chart(self, units: List[dict], mode: str, scale: str) -> bytes:
+        """
+        PNG comparing several units on a normalized scale. The dataset-wide stat distribution is
+        precomputed on the catalog, so normalizing is one vectorized transform of the units' stats.
+        """
+        raw = stat_matrix(units)
+        normalized = self.catalog.stat_scales.normalize(raw, scale)
+        key = chart_key('compare_units', COMPARISON_CHART_FORMAT, COMPARISON_STYLE, mode, scale,
+                        [[unit['Unit'], unit['Faction']] for unit in units], raw.tolist(), normalized.tolist())
+        png = await self.chart_cache.get(key)
+        if png is None:
+            if mode == 'radar':
+                png = await self.renderer.render(render_unit_radar, units, normalized, scale, key=key)
+            else:
+                png = await self.renderer.render(render_unit_bars, units, normalized, raw, scale, key=key)
+            await self.chart_cache.put(key, png)
+        return png
+
+    @commands.command(name='compare_units',
+                      help='Compare 2-6 units on a normalized radar or bar chart, '
+                           'e.g. !compare_units radar Evocati Cohort, Sword Followers, Oathsworn')
+    async def compare_units_command(self, ctx: commands.Context, *, units: Optional[str] = None):
+        guidance_message = (f"Please list 2 to {MAX_COMPARED_UNITS} units separated by commas, optionally "
+                            f"starting with a chart ({' or '.join(COMPARISON_MODES)}) and a scale "
+                            f"({' or '.join(SCALES)}).\n"
+                            "Example: `!compare_units radar Evocati Cohort, Sword Followers, Oathsworn`")
+        words = (units or '').split()
+        mode, scale = COMPARISON_MODES[0], SCALES[0]
+        while words and words[0].lower() in COMPARISON_MODES + SCALES:
+            option = words.pop(0).lower()
+            if option in COMPARISON_MODES:
+                mode = option
+            else:
+                scale = option
+        names = parse_unit_list(' '.join(words))
+        if not 2 <= len(names) <= MAX_COMPARED_UNITS:
+            await ctx.send(guidance_message)
+            return
+
+        found = []
+        for name in names:
+            unit = self.query_unit_stats(name)
+            if not unit:
+                await ctx.send(self.unit_not_found_message(name))
+                return
+            found.append(unit)
+
+        try:
+            chart = BytesIO(await self.multi_comparison_chart(found, mode, scale))
+        except ChartRenderError as e:
+            await ctx.send(str(e))
+            return
+        await ctx.send(file=discord.File(fp=chart, filename=f'units_{mode}.png'))
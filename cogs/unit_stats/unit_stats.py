@@ -1,23 +1,20 @@
 from discord.ext import commands
 import logging
-from utils.data_loader import load_unit_data
+from utils.data_loader import UnitCatalog, get_unit_catalog
 from typing import Optional
 
 logging.basicConfig(level=logging.INFO)
 
-unit_data = load_unit_data()
-
-def query_unit_stats(unit_name):
-    """Extract specific stat information for a unit."""
+def query_unit_stats(unit_name, catalog: Optional[UnitCatalog] = None):
+    """Extract specific stat information for a unit, tolerating small typos in the name."""
     logging.info(f"Looking for unit: {unit_name}")
-    for unit in unit_data:
-        if unit['Unit'].lower() == unit_name.lower():
-            return unit
-    return "Unit not found"
+    unit = (catalog or get_unit_catalog()).find_unit(unit_name)
+    return unit if unit is not None else "Unit not found"
 
 class UnitStats(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, catalog: Optional[UnitCatalog] = None):
         self.bot = bot
+        self.catalog = catalog or get_unit_catalog()
 
     @commands.command(name='unit_stats', help='Get information for a specified unit')
     async def unit_stats(self, ctx, *, unit_name: Optional[str] = None):
@@ -26,11 +23,14 @@ class UnitStats(commands.Cog):
         if not unit_name:
             await ctx.send(guidance_message)
             return
-        unit_info = query_unit_stats(unit_name)
+        unit_info = query_unit_stats(unit_name, self.catalog)
         if unit_info == "Unit not found":
+            suggestions = self.catalog.suggest_units(unit_name)
+            if suggestions:
+                unit_info += f". Did you mean: {', '.join(suggestions)}?"
             await ctx.send(unit_info)
         else:
-            response = f"Information for {unit_name}:\n```"
+            response = f"Information for {unit_info['Unit']}:\n```"
             for key, value in unit_info.items():
                 if key not in ['Unit', 'Soldiers', 'Campaign Cost']:
                     response += f"• {key}: {value}\n"
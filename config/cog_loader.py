@@ -9,19 +9,44 @@ async def setup_cogs(bot):
     from cogs.elo_rating.display_elo import TeamDisplaySystem
     from cogs.land_guide.land_guide_command import LandGuidePlaylist
     from cogs.elo_rating.record_game_elo import TeamRecordingSystem
+    from utils.data_loader import get_unit_catalog, watch_unit_catalog, ELO_PATH
+    from utils.elo_store import get_elo_store
+    from utils.player_stats import get_player_stats, watch_player_stats
+    from utils.data_watcher import DataWatcher
+    from utils.chart_renderer import get_chart_renderer
+
+    # Parse the unit data once and share it between every cog that needs it
+    catalog = get_unit_catalog()
+    player_stats = get_player_stats()
+    # Both Elo cogs work off the same store, so recorded results are ranked without a reload
+    elo_store = get_elo_store()
+    # One pool of chart worker processes for every cog that draws charts
+    renderer = get_chart_renderer()
+    team_display = TeamDisplaySystem(bot, elo_store, renderer)
+    team_recording = TeamRecordingSystem(bot, elo_store)
 
     cogs = [
-        FactionAnalysisBot(bot),
-        FactionComparison(bot),
-        UnitStats(bot),
+        FactionAnalysisBot(bot, catalog),
+        FactionComparison(bot, catalog),
+        UnitStats(bot, catalog),
         TierList(bot),
         CommandsList(bot),
-        HistoricalResults(bot),
-        TeamDisplaySystem(bot),
-        UnitStatsComparison(bot),
+        HistoricalResults(bot, player_stats),
+        team_display,
+        UnitStatsComparison(bot, catalog, renderer=renderer),
         LandGuidePlaylist(bot),
-        TeamRecordingSystem(bot),
+        team_recording,
     ]
 
     for cog in cogs:
         await bot.add_cog(cog)
+
+    # Pick up edits to data/*.json without a restart
+    watcher = DataWatcher()
+    watch_unit_catalog(catalog, watcher)
+    watch_player_stats(player_stats, watcher)
+    watcher.watch(ELO_PATH, lambda path: elo_store.read_state(), elo_store.swap_in)
+    # Compactions by the bot itself are already in memory; only outside edits need a reload
+    elo_store.on_snapshot_written = watcher.acknowledge
+    watcher.start()
+    bot.data_watcher = watcher
@@ -1,7 +1,10 @@
+import asyncio
+import threading
+import time
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from discord.ext import commands
-from cogs.faction_analysis.bot import FactionAnalysisBot
+from cogs.faction_analysis.bot import MAX_CONCURRENT_ANALYSES, FactionAnalysisBot
 
 
 @pytest.mark.asyncio
@@ -41,3 +44,74 @@ async def test_faction_analysis_command():
     calls = ctx.send.call_args_list
     assert calls[0][0][0] == "**Analysis for Odrysian Kingdom:**"
     assert calls[1][0][0] == "Odrysian Kingdom is a balanced faction."
+
+
+@pytest.mark.asyncio
+async def test_analyses_run_off_the_event_loop_with_bounded_concurrency():
+    faction_bot = FactionAnalysisBot(MagicMock(spec=commands.Bot))
+    factions = list(faction_bot.factions)[:6]
+    running, peak, threads = 0, 0, set()
+    lock = threading.Lock()
+    all_slots_taken = threading.Event()
+
+    def slow_gemini(prompt):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+            threads.add(threading.current_thread().name)
+            if running == MAX_CONCURRENT_ANALYSES:
+                all_slots_taken.set()
+        # The first calls hold their slots until every slot is taken
+        all_slots_taken.wait(10)
+        with lock:
+            running -= 1
+        return prompt.split(" faction")[0]
+
+    with patch("cogs.faction_analysis.bot.request_analysis", side_effect=slow_gemini) as gemini:
+        results = await asyncio.gather(*(faction_bot.get_or_generate_analysis(name) for name in factions + factions[:1]))
+
+    assert gemini.call_count == 6
+    assert peak == MAX_CONCURRENT_ANALYSES
+    assert threads and all(name.startswith("gemini") for name in threads)
+    assert results[0] == results[-1]
+    assert await faction_bot.get_or_generate_analysis(factions[0]) == results[0]
+
+
+@pytest.mark.asyncio
+async def test_analysis_timeout_is_reported_and_not_cached():
+    faction_bot = FactionAnalysisBot(MagicMock(spec=commands.Bot))
+    faction = next(iter(faction_bot.factions))
+    ctx = AsyncMock(spec=commands.Context)
+    ctx.send = AsyncMock()
+
+    with patch("cogs.faction_analysis.bot.request_analysis", side_effect=lambda prompt: time.sleep(0.3)), \
+         patch("cogs.faction_analysis.bot.ANALYSIS_TIMEOUT", 0.05):
+        await faction_bot.faction_analysis_command.callback(faction_bot, ctx, faction_name=faction)
+
+    ctx.send.assert_called_once_with(f"Analysing {faction} took too long. Please try again later.")
+    assert faction_bot.analysis_cache == {} and faction_bot.pending_analyses == {}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_keeps_its_slot_until_its_thread_finishes():
+    faction_bot = FactionAnalysisBot(MagicMock(spec=commands.Bot))
+    faction_bot.analysis_slots = asyncio.Semaphore(1)
+    faction = next(iter(faction_bot.factions))
+    answer = threading.Event()
+
+    def stuck_gemini(prompt):
+        answer.wait()
+        return "late"
+
+    with patch("cogs.faction_analysis.bot.request_analysis", side_effect=stuck_gemini), \
+         patch("cogs.faction_analysis.bot.ANALYSIS_TIMEOUT", 0.05):
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await faction_bot.get_or_generate_analysis(faction)
+            assert faction_bot.analysis_slots.locked()
+        finally:
+            answer.set()
+        # The slot comes back once the thread returns, not when the caller gave up
+        await asyncio.wait_for(faction_bot.analysis_slots.acquire(), 10)
+    assert faction_bot.analysis_cache == {}
@@ -0,0 +1,127 @@
+import json
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from cogs.elo_rating.record_game_elo import TeamRecordingSystem
+from utils.elo_replay import replay_ratings
+import utils.elo_replay as elo_replay
+from utils.elo_store import EloStore, derive_match_log, elo_deltas
+
+
+def sequential_replay(matches, k_factor=32):
+    ratings = {}
+    for match in matches:
+        winner, loser = ratings.get(match["Winner"], 1000.0), ratings.get(match["Loser"], 1000.0)
+        winner_delta, loser_delta = elo_deltas(winner, loser, k_factor, match.get("Multiplier", 1.0))
+        ratings[match["Winner"]], ratings[match["Loser"]] = winner + winner_delta, loser + loser_delta
+    return ratings
+
+
+@pytest.fixture
+def match_log():
+    rng = np.random.default_rng(1)
+    winners = rng.integers(0, 40, 2000)
+    losers = (winners + rng.integers(1, 40, 2000)) % 40
+    return [
+        {"Winner": f"Team {w}", "Loser": f"Team {l}", "Date": "2025-01-01", "Multiplier": 1.5 if w % 7 == 0 else 1.0}
+        for w, l in zip(winners.tolist(), losers.tolist())
+    ]
+
+
+def test_derive_match_log_counts_each_match_once():
+    data = {"teams": [
+        {"Team Name": "A", "Matches": [{"Opponent": "B", "Result": "Win", "Date": "2025-02-01"},
+                                       {"Opponent": "B", "Result": "Loss", "Date": "2025-01-01"}]},
+        {"Team Name": "B", "Matches": [{"Opponent": "A", "Result": "Loss", "Date": "2025-02-01"},
+                                       {"Opponent": "A", "Result": "Win", "Date": "2025-01-01"},
+                                       {"Opponent": "C", "Result": "Win", "Date": "2025-03-01"}]},
+    ]}
+
+    assert [(m["Winner"], m["Loser"], m["Date"]) for m in derive_match_log(data)] == [
+        ("B", "A", "2025-01-01"), ("A", "B", "2025-02-01"), ("B", "C", "2025-03-01"),
+    ]
+
+
+def test_batched_replay_matches_sequential_elo(match_log):
+    expected = sequential_replay(match_log)
+    team_names, ratings = replay_ratings(match_log)
+
+    assert {name: ratings[0, i] for i, name in enumerate(team_names)} == pytest.approx(expected)
+
+
+def test_scalar_fallback_matches_batched_replay(match_log, monkeypatch):
+    _, batched = replay_ratings(match_log, [16, 32])
+    monkeypatch.setattr(elo_replay, "MIN_BATCH_WIDTH", float("inf"))
+    _, scalar = replay_ratings(match_log, [16, 32])
+
+    assert np.allclose(batched, scalar)
+
+
+def test_what_if_scenarios(match_log):
+    team_names, ratings = replay_ratings(match_log, [16, 32], playoff_multiplier=1.0, exclude=[0, 1])
+    expected = sequential_replay([dict(m, Multiplier=1.0) for m in match_log[2:]], k_factor=16)
+
+    assert ratings.shape == (2, len(team_names))
+    assert {name: ratings[0, i] for i, name in enumerate(team_names)} == pytest.approx(expected)
+
+
+def test_replace_history_persists_corrected_ladder(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({"teams": [
+        {"Team Name": "A", "Elo Rating": 1000.0, "Matches": []},
+        {"Team Name": "B", "Elo Rating": 1000.0, "Matches": []},
+    ]}))
+    store = EloStore(str(path))
+    store.record_match("A", "B", "2025-01-01")
+    store.record_match("B", "A", "2025-01-02")
+
+    kept = store.match_log[1:]
+    team_names, ratings = replay_ratings(kept)
+    store.replace_history(kept, {name.lower(): r for name, r in zip(team_names, ratings[0].tolist())})
+
+    reloaded = EloStore(str(path))
+    assert reloaded.find_team("B")["Elo Rating"] == pytest.approx(1016.0)
+    assert reloaded.find_team("A")["Matches"] == [{"Opponent": "B", "Result": "Loss", "Date": "2025-01-02"}]
+    assert len(reloaded.match_log) == 1
+
+
+def test_replace_history_resets_teams_whose_only_match_was_excluded(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({"teams": [
+        {"Team Name": name, "Elo Rating": 1000.0, "Matches": []} for name in ("A", "B", "C")
+    ]}))
+    store = EloStore(str(path))
+    store.record_match("A", "B", "2025-01-01")
+    store.record_match("C", "A", "2025-01-02")
+
+    kept = store.match_log[:1]
+    team_names, ratings = replay_ratings(store.match_log, exclude={1})
+    store.replace_history(kept, {name.lower(): r for name, r in zip(team_names, ratings[0].tolist())})
+
+    reloaded = EloStore(str(path))
+    assert reloaded.find_team("C")["Elo Rating"] == pytest.approx(1000.0)
+    assert reloaded.find_team("C")["Matches"] == []
+    assert reloaded.find_team("A")["Elo Rating"] == pytest.approx(1016.0)
+
+
+@pytest.mark.asyncio
+async def test_replay_elo_is_anchored_to_the_current_ratings(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    # Derived from the match lists: a replay from scratch would give A 1016 and B 984
+    path.write_text(json.dumps({"teams": [
+        {"Team Name": "A", "Elo Rating": 1100.0, "Matches": [{"Opponent": "B", "Result": "Win", "Date": "2025-01-01"}]},
+        {"Team Name": "B", "Elo Rating": 950.0, "Matches": [{"Opponent": "A", "Result": "Loss", "Date": "2025-01-01"}]},
+        {"Team Name": "C", "Elo Rating": 1200.0, "Matches": []},
+    ]}))
+    cog = TeamRecordingSystem(MagicMock(), EloStore(str(path)))
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.replay_elo.callback(cog, ctx, options="apply")
+    assert ctx.send.call_args[0][0].endswith("```\nReplayed ratings applied and saved.")
+    assert {team["Team Name"]: team["Elo Rating"] for team in cog.store.teams} == {"A": 1100.0, "B": 950.0, "C": 1200.0}
+
+    await cog.replay_elo.callback(cog, ctx, options="exclude=1 apply")
+    ratings = {team["Team Name"]: team["Elo Rating"] for team in EloStore(str(path)).teams}
+    assert ratings == pytest.approx({"A": 1084.0, "B": 966.0, "C": 1200.0})
+    await cog.writer.stop()
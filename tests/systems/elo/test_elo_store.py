@@ -0,0 +1,95 @@
+import json
+import pytest
+from utils.elo_store import EloStore, expected_score
+
+TEST_DATA = {
+    "teams": [
+        {"Team Name": "Team A", "Elo Rating": 1000.0, "Matches": []},
+        {"Team Name": "Team B", "Elo Rating": 1000.0, "Matches": []},
+    ]
+}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps(TEST_DATA))
+    return path
+
+
+def test_expected_score_is_symmetric():
+    assert expected_score(1000, 1000) == pytest.approx(0.5)
+    assert expected_score(1200, 1000) + expected_score(1000, 1200) == pytest.approx(1.0)
+
+
+def test_record_match_appends_to_journal_without_rewriting_snapshot(snapshot_path):
+    store = EloStore(str(snapshot_path))
+    snapshot_before = snapshot_path.read_text()
+
+    store.record_match("team a", "Team C", "2025-01-01")
+
+    assert snapshot_path.read_text() == snapshot_before
+    journal = [json.loads(line) for line in open(store.journal_path)]
+    assert [(entry["Seq"], entry["Winner"], entry["Loser"]) for entry in journal] == [(1, "Team A", "Team C")]
+    assert store.find_team("Team A")["Elo Rating"] == pytest.approx(1016.0)
+    assert store.find_team("Team C")["Matches"] == [{"Opponent": "Team A", "Result": "Loss", "Date": "2025-01-01"}]
+
+
+def test_journal_is_replayed_on_load(snapshot_path):
+    store = EloStore(str(snapshot_path))
+    store.record_match("Team A", "Team B", "2025-01-01", playoff_multiplier=1.5)
+    store.record_match("Team B", "Team A", "2025-01-02")
+
+    reloaded = EloStore(str(snapshot_path))
+
+    assert reloaded.data == store.data
+    assert reloaded.seq == 2
+
+
+def test_torn_journal_line_is_skipped(snapshot_path):
+    store = EloStore(str(snapshot_path))
+    store.record_match("Team A", "Team B", "2025-01-01")
+    with open(store.journal_path, "a") as f:
+        f.write('{"Seq": 2, "Winner": "Team')
+
+    reloaded = EloStore(str(snapshot_path))
+
+    assert reloaded.seq == 1
+    assert len(reloaded.find_team("Team A")["Matches"]) == 1
+
+
+def test_matches_after_a_torn_line_survive_a_reload(snapshot_path):
+    store = EloStore(str(snapshot_path))
+    store.record_match("Team A", "Team B", "2025-01-01")
+    with open(store.journal_path, "a") as f:
+        f.write('{"Seq": 2, "Winner": "Team')
+
+    reloaded = EloStore(str(snapshot_path))
+    reloaded.record_match("Team B", "Team A", "2025-01-02")
+
+    assert [match["Date"] for match in EloStore(str(snapshot_path)).match_log] == ["2025-01-01", "2025-01-02"]
+
+
+def test_compaction_folds_journal_into_snapshot(snapshot_path):
+    store = EloStore(str(snapshot_path), compact_every=2)
+    store.record_match("Team A", "Team B", "2025-01-01")
+    store.record_match("Team A", "Team B", "2025-01-02")
+
+    assert open(store.journal_path).read() == ""
+    snapshot = json.loads(snapshot_path.read_text())
+    assert snapshot["Journal Seq"] == 2
+    assert EloStore(str(snapshot_path)).data == store.data
+
+
+def test_journal_entries_already_in_snapshot_are_not_reapplied(snapshot_path):
+    store = EloStore(str(snapshot_path))
+    store.record_match("Team A", "Team B", "2025-01-01")
+    journal = open(store.journal_path).read()
+    store.compact()
+    # Simulate a crash after the snapshot was replaced but before the journal was truncated
+    with open(store.journal_path, "w") as f:
+        f.write(journal)
+
+    reloaded = EloStore(str(snapshot_path))
+
+    assert len(reloaded.find_team("Team A")["Matches"]) == 1
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from utils.elo_store import EloStore
+from utils.elo_writer import EloWriter
+
+TEST_DATA = {
+    "teams": [
+        {"Team Name": "Team A", "Elo Rating": 1000.0, "Matches": []},
+        {"Team Name": "Team B", "Elo Rating": 1000.0, "Matches": []},
+    ]
+}
+
+RESULTS = [("Team A", "Team B"), ("team b", "Team C"), ("Team C", "TEAM A"), ("Team A", "Team B")] * 5
+
+
+def make_store(tmp_path, name, compact_every=50):
+    path = tmp_path / f"{name}.json"
+    path.write_text(json.dumps(TEST_DATA))
+    return EloStore(str(path), journal_path=str(tmp_path / f"{name}.jsonl"), compact_every=compact_every)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_results_match_sequential_recording(tmp_path):
+    sequential = make_store(tmp_path, "sequential")
+    for winner, loser in RESULTS:
+        sequential.record_match(winner, loser, "2025-01-01")
+
+    store = make_store(tmp_path, "queued")
+    writes = []
+    append_journal = store.append_journal
+    store.append_journal = lambda entries: (writes.append(len(entries)), append_journal(entries))
+    writer = EloWriter(store)
+
+    entries = await asyncio.gather(*(writer.record_match(winner, loser, "2025-01-01") for winner, loser in RESULTS))
+
+    assert [entry["Seq"] for entry in entries] == list(range(1, len(RESULTS) + 1))
+    assert writes == [len(RESULTS)]
+    assert store.data == sequential.data
+    assert EloStore(store.snapshot_path, store.journal_path).data == sequential.data
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_history_replacement_waits_for_queued_results(tmp_path):
+    store = make_store(tmp_path, "elo", compact_every=3)
+    writer = EloWriter(store)
+
+    first = writer.record_match("Team A", "Team B", "2025-01-01")
+    replaced = writer.replace_history([], {"team a": 1200.0})
+    last = writer.record_match("Team B", "Team A", "2025-01-02")
+    _, applied, _ = await asyncio.gather(first, replaced, last)
+
+    assert applied
+    assert [match["Date"] for match in store.match_log] == ["2025-01-02"]
+    reloaded = EloStore(store.snapshot_path, store.journal_path)
+    assert reloaded.find_team("Team A")["Elo Rating"] == store.find_team("Team A")["Elo Rating"] < 1200.0
+    assert reloaded.match_log == store.match_log
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stale_history_replacement_keeps_queued_results(tmp_path):
+    store = make_store(tmp_path, "elo")
+    writer = EloWriter(store)
+
+    # The replacement was computed from the empty log, before this result was queued
+    recorded = writer.record_match("Team A", "Team B", "2025-01-01")
+    replaced = writer.replace_history([], {"team a": 1200.0}, expected_length=0)
+    entry, applied = await asyncio.gather(recorded, replaced)
+
+    assert not applied
+    assert [match["Date"] for match in store.match_log] == ["2025-01-01"]
+    reloaded = EloStore(store.snapshot_path, store.journal_path)
+    assert reloaded.find_team("Team A")["Elo Rating"] == entry["Winner Rating"] > 1000.0
+    assert reloaded.match_log == store.match_log
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_journal_write_leaves_ratings_untouched(tmp_path):
+    store = make_store(tmp_path, "elo")
+    def fail(entries):
+        raise OSError("disk full")
+    store.append_journal = fail
+    writer = EloWriter(store)
+
+    with pytest.raises(OSError):
+        await writer.record_match("Team A", "Team B", "2025-01-01")
+
+    assert store.seq == 0
+    assert store.find_team("Team A")["Elo Rating"] == 1000.0
+    await writer.stop()
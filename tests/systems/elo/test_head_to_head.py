@@ -0,0 +1,64 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from cogs.elo_rating.display_elo import TeamDisplaySystem
+from utils.elo_store import EloStore
+from utils.head_to_head import HeadToHeadIndex
+
+MATCH_LOG = [
+    {"Winner": "Team A", "Loser": "Team B", "Date": "2025-01-01"},
+    {"Winner": "Team B", "Loser": "team a", "Date": "2025-01-08"},
+    {"Winner": "Team A", "Loser": "Team B", "Date": "2025-01-05"},
+    {"Winner": "Team C", "Loser": "Team A", "Date": "2025-01-02"},
+]
+
+
+def test_index_counts_both_sides_of_every_match():
+    index = HeadToHeadIndex(MATCH_LOG)
+
+    record = index.head_to_head("TEAM A", "team b")
+    assert (record.name, record.wins, record.losses, record.last_played) == ("Team B", 2, 1, "2025-01-08")
+    reverse = index.head_to_head("Team B", "Team A")
+    assert (reverse.wins, reverse.losses) == (1, 2)
+    assert index.head_to_head("Team B", "Team C") is None
+
+    team = index.team_record("Team A")
+    assert (team.wins, team.losses, team.played) == (2, 2, 4)
+    assert [opponent.name for opponent in index.opponents("Team A")] == ["Team B", "Team C"]
+
+
+def test_index_is_updated_by_recorded_matches(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({"teams": [{"Team Name": "Team A", "Elo Rating": 1000.0, "Matches": []}]}))
+    store = EloStore(str(path))
+
+    store.record_match("Team A", "Team B", "2025-01-01")
+    store.record_match("Team B", "Team A", "2025-01-02")
+
+    record = store.head_to_head.head_to_head("Team A", "Team B")
+    assert (record.wins, record.losses, record.last_played) == (1, 1, "2025-01-02")
+    reloaded = EloStore(store.snapshot_path, store.journal_path)
+    assert reloaded.head_to_head.team_record("Team B").played == 2
+
+
+@pytest.mark.asyncio
+async def test_head_to_head_command(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({"teams": []}))
+    store = EloStore(str(path))
+    store.record_match("Team A", "Team B", "2025-01-01")
+    cog = TeamDisplaySystem(MagicMock(), store)
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.show_head_to_head.callback(cog, ctx, teams="team a vs Team B")
+
+    embed = ctx.send.call_args[1]["embed"]
+    assert embed.title == "Team A vs Team B"
+    assert embed.fields[0].value == "1-0 (1 matches)"
+
+    await cog.show_team_profile.callback(cog, ctx, team_name="team b")
+    embed = ctx.send.call_args[1]["embed"]
+    assert embed.title == "Team B"
+    assert [field.name for field in embed.fields] == ["Elo Rating", "Rank", "Record", "Last Played", "Most Played Opponents"]
+    assert embed.fields[1].value == "#2 of 2"
@@ -0,0 +1,124 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, mock_open, patch
+from cogs.elo_rating.record_game_elo import TeamRecordingSystem
+from utils.elo_store import EloStore, elo_deltas
+from utils.elo_writer import EloWriter
+from utils.match_import import MatchImportError, new_matches, parse_match_import, rating_deltas
+
+CSV_IMPORT = """Winner,Loser,Date,Type
+Team B,Team A,2025-02-01,regular
+Team A,Team C,2025-01-15,playoff
+Team C,Team B,2025-01-15,
+"""
+
+
+def test_csv_import_is_sorted_by_date():
+    matches = parse_match_import(CSV_IMPORT, "season.csv")
+
+    assert [(match["Winner"], match["Date"], match["Multiplier"]) for match in matches] == [
+        ("Team A", "2025-01-15", 1.5),
+        ("Team C", "2025-01-15", 1.0),
+        ("Team B", "2025-02-01", 1.0),
+    ]
+
+
+def test_json_import_accepts_any_key_case():
+    text = json.dumps({"matches": [{"WINNER": "Team A", "loser": "Team B", "Date": "2025-01-01"}]})
+
+    assert parse_match_import(text, "season.json") == [
+        {"Winner": "Team A", "Loser": "Team B", "Date": "2025-01-01", "Multiplier": 1.0}
+    ]
+
+
+def test_invalid_rows_are_all_reported():
+    text = "winner,loser,date,type\nTeam A,team a,2025-01-01,\nTeam A,Team B,01/02/2025,final\n,Team B,2025-01-01,\n"
+
+    with pytest.raises(MatchImportError) as error:
+        parse_match_import(text, "season.csv")
+
+    assert error.value.errors == [
+        "Row 2: a team cannot play itself",
+        "Row 3: invalid date '01/02/2025' (use YYYY-MM-DD); unknown match type 'final' (use regular or playoff)",
+        "Row 4: winner and loser are required",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_is_applied_in_one_batch(tmp_path):
+    snapshot_path = tmp_path / "elo_rating.json"
+    snapshot_path.write_text(json.dumps({"teams": [{"Team Name": "Team A", "Elo Rating": 1100.0, "Matches": []}]}))
+    store = EloStore(str(snapshot_path))
+    writes = []
+    append_journal = store.append_journal
+    store.append_journal = lambda entries: (writes.append(len(entries)), append_journal(entries))
+    writer = EloWriter(store)
+
+    before, after, imported, skipped = await writer.import_matches(parse_match_import(CSV_IMPORT, "season.csv"))
+
+    assert writes == [3]
+    assert before == {"team a": 1100.0}
+    assert len(imported) == 3 and skipped == 0
+    deltas = {name: delta for name, _, delta in rating_deltas(before, after)}
+    assert deltas["Team A"] == pytest.approx(store.find_team("Team A")["Elo Rating"] - 1100.0)
+    assert deltas["Team B"] == pytest.approx(store.find_team("Team B")["Elo Rating"] - 1000.0)
+    # The batch is folded into the snapshot straight away
+    assert store.pending == 0
+    assert len(json.loads(snapshot_path.read_text())["Match Log"]) == 3
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_backfill_is_rated_against_current_ratings_and_reruns_are_skipped(tmp_path):
+    snapshot_path = tmp_path / "elo_rating.json"
+    snapshot_path.write_text(json.dumps({"teams": [{"Team Name": "Team A", "Elo Rating": 1100.0, "Matches": []},
+                                                   {"Team Name": "Team D", "Elo Rating": 1250.0, "Matches": []}]}))
+    store = EloStore(str(snapshot_path))
+    writer = EloWriter(store)
+    await writer.record_match("Team A", "Team B", "2025-03-01")
+    ratings = {team["Team Name"]: team["Elo Rating"] for team in store.teams}
+
+    season = parse_match_import(CSV_IMPORT, "season.csv")
+    _, _, imported, skipped = await writer.import_matches(season)
+
+    assert len(imported) == 3 and skipped == 0
+    # Logged in the order they were rated, each against the ratings the ladder had then
+    assert [match["Date"] for match in store.match_log] == ["2025-03-01", "2025-01-15", "2025-01-15", "2025-02-01"]
+    first = store.match_log[1]
+    assert first["Winner"] == "Team A"
+    assert first["Winner Rating"] == pytest.approx(ratings["Team A"] + elo_deltas(ratings["Team A"], 1000.0, 32, 1.5)[0])
+    # Teams outside the import keep their rating
+    assert store.find_team("Team D")["Elo Rating"] == 1250.0
+
+    ratings_before = {team["Team Name"]: team["Elo Rating"] for team in store.teams}
+    _, _, imported, skipped = await writer.import_matches(season)
+    assert imported == [] and skipped == 3
+    assert len(store.match_log) == 4
+    assert {team["Team Name"]: team["Elo Rating"] for team in store.teams} == ratings_before
+
+    reloaded = EloStore(str(snapshot_path))
+    assert {team["Team Name"]: team["Elo Rating"] for team in reloaded.teams} == ratings_before
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_import_failures_are_reported_to_the_owner(tmp_path):
+    snapshot_path = tmp_path / "elo_rating.json"
+    snapshot_path.write_text(json.dumps({"teams": []}))
+    cog = TeamRecordingSystem(MagicMock(), EloStore(str(snapshot_path)))
+    cog.writer.import_matches = AsyncMock(side_effect=OSError("disk full"))
+    ctx = MagicMock()
+    ctx.message.attachments = []
+    ctx.send = AsyncMock()
+
+    with patch("builtins.open", mock_open(read_data=CSV_IMPORT)):
+        await cog.import_matches.callback(cog, ctx, path="season.csv")
+
+    ctx.send.assert_called_once_with("Error importing matches: disk full")
+
+
+def test_only_as_many_duplicates_as_the_log_holds_are_skipped():
+    logged = [{"Winner": "Team A", "Loser": "Team B", "Date": "2025-01-01"}]
+    rematches = [{"Winner": "team a", "Loser": "Team B", "Date": "2025-01-01"}] * 2
+
+    assert new_matches(logged, rematches) == (rematches[:1], 1)
@@ -0,0 +1,65 @@
+import json
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from cogs.elo_rating.display_elo import TeamDisplaySystem
+from utils.elo_store import EloStore
+from utils.rating_engines import GLICKO_SCALE, EloEngine, Glicko2Engine
+
+MATCH_LOG = [
+    {"Winner": "Team A", "Loser": "Team B", "Date": "2025-01-01", "Multiplier": 1.0},
+    {"Winner": "Team A", "Loser": "Team C", "Date": "2025-01-01", "Multiplier": 1.0},
+    {"Winner": "Team C", "Loser": "Team B", "Date": "2025-01-08", "Multiplier": 1.0},
+    {"Winner": "team a", "Loser": "Team C", "Date": "2025-01-15", "Multiplier": 1.0},
+]
+
+
+def test_glicko2_matches_the_reference_example():
+    # Worked example from Glickman's "Example of the Glicko-2 system"
+    mu = (np.array([1500.0, 1400.0, 1550.0, 1700.0]) - 1500) / GLICKO_SCALE
+    phi = np.array([200.0, 30.0, 100.0, 300.0]) / GLICKO_SCALE
+    sigma = np.full(4, 0.06)
+
+    Glicko2Engine()._rate_period(mu, phi, sigma, np.array([0, 2, 3]), np.array([1, 0, 0]))
+
+    assert mu[0] * GLICKO_SCALE + 1500 == pytest.approx(1464.06, abs=0.01)
+    assert phi[0] * GLICKO_SCALE == pytest.approx(151.52, abs=0.01)
+    assert sigma[0] == pytest.approx(0.05999, abs=1e-5)
+
+
+def test_glicko2_rates_each_date_as_one_period():
+    table = Glicko2Engine().rate(MATCH_LOG)
+
+    assert table.names == ["Team A", "Team B", "Team C"]
+    assert [name for name, _, _ in table.top(3)] == ["Team A", "Team C", "Team B"]
+    # Team B sat out the last period, so it is less certain than Team C, which played it
+    assert table.get("team b")[1] > table.get("Team C")[1]
+    assert table.get("Team D") is None
+
+
+def test_elo_engine_replays_the_log():
+    table = EloEngine().rate(MATCH_LOG[:1])
+
+    assert table.get("Team A") == (pytest.approx(1016.0), None)
+    assert table.get("Team B") == (pytest.approx(984.0), None)
+
+
+@pytest.mark.asyncio
+async def test_display_can_pick_the_rating_system(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({"teams": []}))
+    store = EloStore(str(path))
+    for match in MATCH_LOG:
+        store.record_match(match["Winner"], match["Loser"], match["Date"])
+    cog = TeamDisplaySystem(MagicMock(), store)
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.show_top_teams.callback(cog, ctx, "Glicko2")
+    embed = ctx.send.call_args[1]["embed"]
+    assert embed.title == "Top 10 Teams by Glicko-2 Rating"
+    assert [field.name for field in embed.fields] == ["Team A", "Team C", "Team B"]
+    assert await cog.engine_table("glicko2") is await cog.engine_table("glicko2")
+
+    await cog.show_top_teams.callback(cog, ctx, "trueskill")
+    ctx.send.assert_called_with("Unknown rating system 'trueskill'. Choose one of: elo, glicko2")
@@ -0,0 +1,100 @@
+import datetime
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from cogs.elo_rating.display_elo import TeamDisplaySystem
+from utils.chart_renderer import ChartRenderer
+from utils.elo_replay import replay_ratings
+from utils.elo_store import EloStore
+
+TEST_DATA = {
+    "teams": [
+        {"Team Name": "Team A", "Elo Rating": 1000.0,
+         "Matches": [{"Opponent": "Team B", "Result": "Win", "Date": "2024-12-01"}]},
+        {"Team Name": "Team B", "Elo Rating": 1000.0,
+         "Matches": [{"Opponent": "Team A", "Result": "Loss", "Date": "2024-12-01"}]},
+        {"Team Name": "Team C", "Elo Rating": 1000.0, "Matches": []},
+    ]
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps(TEST_DATA))
+    return EloStore(str(path))
+
+
+def test_history_uses_recorded_ratings_and_estimates_legacy_matches(store):
+    entry = store.record_match("Team B", "team a", "2025-01-01")
+
+    dates, ratings = store.history.series("TEAM A")
+    assert dates == [datetime.date(2024, 12, 1), datetime.date(2025, 1, 1)]
+    # The legacy match is estimated, then anchored to the rating Team A had before recording
+    assert ratings == [pytest.approx(1000.0), entry["Loser Rating"]]
+    assert store.history.series("Team C") == ([], [])
+
+    reloaded = EloStore(store.snapshot_path, store.journal_path)
+    assert reloaded.history.series("Team A") == (dates, ratings)
+
+
+def test_estimated_history_meets_recorded_ratings(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({
+        "teams": [{"Team Name": "Team A", "Elo Rating": 1076.0, "Matches": []},
+                  {"Team Name": "Team B", "Elo Rating": 924.0, "Matches": []}],
+        "Match Log": [
+            {"Winner": "Team A", "Loser": "Team B", "Date": "2024-12-01", "Multiplier": 1.0},
+            {"Winner": "Team A", "Loser": "Team B", "Date": "2024-12-02", "Multiplier": 1.0},
+            {"Winner": "Team B", "Loser": "Team A", "Date": "2025-01-01", "Multiplier": 1.0,
+             "Winner Rating": 924.0, "Loser Rating": 1076.0},
+        ],
+    }))
+    store = EloStore(str(path))
+
+    _, ratings = store.history.series("Team A")
+    # The estimated points are shifted to lead into the recorded match, not replayed from 1000
+    assert ratings[2] == 1076.0
+    assert 1076.0 < ratings[1] < 1076.0 + 32
+    assert store.match_log[0]["Winner Rating"] == ratings[0]
+
+    store.compact()
+    assert EloStore(str(path)).history.series("Team A")[1] == ratings
+
+
+def test_replayed_history_ends_at_the_replayed_ratings(store):
+    store.record_match("Team C", "Team A", "2025-01-01")
+    team_names, ratings = replay_ratings(store.match_log, 16)
+    replayed = {name.lower(): rating for name, rating in zip(team_names, ratings[0].tolist())}
+
+    store.replace_history(store.match_log, replayed, k_factor=16)
+
+    for team in store.teams:
+        series = store.history.series(team["Team Name"])[1]
+        assert series[-1] == pytest.approx(team["Elo Rating"])
+    assert EloStore(store.snapshot_path, store.journal_path).history.series("Team A") == store.history.series("Team A")
+
+
+def test_history_version_changes_only_when_team_plays(store):
+    version_a, version_b = store.history.version("Team A"), store.history.version("Team B")
+
+    store.record_match("Team B", "Team C", "2025-01-01")
+
+    assert store.history.version("Team A") == version_a
+    assert store.history.version("Team B") != version_b
+    assert store.history.version("Team D") is None
+
+
+@pytest.mark.asyncio
+async def test_history_chart_is_cached_until_team_plays(store):
+    cog = TeamDisplaySystem(MagicMock(), store, ChartRenderer(processes=0))
+    with patch("cogs.elo_rating.display_elo.render_rating_history", return_value=b"png") as render:
+        assert await cog.history_chart("Team A") == b"png"
+        await cog.history_chart("team a")
+        store.record_match("Team B", "Team C", "2025-01-01")
+        await cog.history_chart("Team A")
+        assert render.call_count == 1
+
+        store.record_match("Team A", "Team C", "2025-01-02")
+        await cog.history_chart("Team A")
+        assert render.call_count == 2
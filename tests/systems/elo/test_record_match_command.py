@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, AsyncMock, mock_open, patch
 from discord.ext import commands
 from cogs.elo_rating.record_game_elo import TeamRecordingSystem
+from utils.elo_store import EloStore
 import json
 
 TEST_DATA = {
@@ -49,3 +50,30 @@ async def test_record_match_error_handling():
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
             raise
+
+
+def test_update_elo_keeps_the_ladder_ranked(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps(TEST_DATA))
+    store = EloStore(str(path))
+    team_recording = TeamRecordingSystem(MagicMock(spec=commands.Bot), store=store)
+
+    team_recording.update_elo(store.find_team("Team B"), store.find_team("Team A"))
+    assert [team["Team Name"] for team in store.top_teams(2)] == ["Team B", "Team A"]
+
+    team_recording.update_elo(store.find_team("Team A"), store.find_team("Team B"), playoff_multiplier=2.0)
+    assert [team["Team Name"] for team in store.top_teams(2)] == ["Team A", "Team B"]
+
+
+def test_update_elo_rates_teams_outside_the_ladder(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps(TEST_DATA))
+    store = EloStore(str(path))
+    team_recording = TeamRecordingSystem(MagicMock(spec=commands.Bot), store=store)
+    winning_team, losing_team = {"Elo Rating": 1000.0}, {"Team Name": "Team A", "Elo Rating": 1000.0}
+
+    team_recording.update_elo(winning_team, losing_team)
+
+    assert winning_team["Elo Rating"] == pytest.approx(1016.0)
+    assert losing_team["Elo Rating"] == pytest.approx(984.0)
+    assert store.find_team("Team A")["Elo Rating"] == 1000.0
@@ -0,0 +1,83 @@
+import json
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from cogs.elo_rating.display_elo import TeamDisplaySystem
+from utils.elo_store import EloStore
+from utils.season_simulator import bracket_round_names, simulate_bracket, simulate_season
+
+
+def test_two_team_season_matches_expected_score():
+    probabilities = simulate_season([1100.0, 1000.0], [(0, 1)], simulations=50_000, seed=3)
+
+    expected = 1 / (1 + 10 ** (-100 / 400))
+    assert probabilities[0, 0] == pytest.approx(expected, abs=0.01)
+    np.testing.assert_allclose(probabilities.sum(axis=0), 1.0)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+
+
+def test_simulations_are_reproducible_with_a_seed():
+    fixtures = [(0, 1), (1, 2), (2, 0), (3, 0)]
+    first = simulate_season([1000.0, 1050.0, 980.0, 1200.0], fixtures, simulations=60_000, seed=11)
+    second = simulate_season([1000.0, 1050.0, 980.0, 1200.0], fixtures, simulations=60_000, seed=11)
+
+    np.testing.assert_array_equal(first, second)
+
+
+def test_bracket_title_odds():
+    probabilities = simulate_bracket([1000.0, 1000.0, 1000.0, 1000.0], simulations=40_000, seed=5)
+
+    assert probabilities.shape == (4, 3)
+    np.testing.assert_allclose(probabilities[:, 0], 0.5, atol=0.01)
+    np.testing.assert_allclose(probabilities[:, 2], 0.25, atol=0.01)
+    assert bracket_round_names(4) == ["Semi-final", "Final", "Winner"]
+    with pytest.raises(ValueError):
+        simulate_bracket([1000.0, 1000.0, 1000.0])
+
+
+def test_full_league_positions_follow_the_ratings():
+    ratings = np.linspace(900, 1200, 16)
+    fixtures = [(home, away) for home in range(16) for away in range(16) if home != away]
+
+    probabilities = simulate_season(ratings, fixtures, simulations=20_000, seed=1)
+
+    assert probabilities.shape == (16, 16)
+    np.testing.assert_allclose(probabilities.sum(axis=0), 1.0)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+    # Better rated teams finish higher on average, and the strongest is the most likely champion
+    expected_position = probabilities @ np.arange(16)
+    assert np.all(np.diff(expected_position) < 0)
+    assert probabilities[:, 0].argmax() == 15
+
+
+@pytest.mark.asyncio
+async def test_simulate_season_command_reports_unknown_teams(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    path.write_text(json.dumps({"teams": [{"Team Name": "Team A", "Elo Rating": 1000.0, "Matches": []},
+                                          {"Team Name": "Team B", "Elo Rating": 1100.0, "Matches": []}]}))
+    cog = TeamDisplaySystem(MagicMock(), EloStore(str(path)))
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.simulate_season_command.callback(cog, ctx, fixtures="Team A vs Team C")
+    ctx.send.assert_called_with("Unknown team(s): Team C")
+
+    await cog.simulate_season_command.callback(cog, ctx, fixtures="Team A vs Team B; team b vs team a")
+    table = ctx.send.call_args[0][0].split("```")[1].splitlines()
+    assert table[0].split() == ["Team", "1st", "2nd"]
+    assert table[1].startswith("Team B")
+
+
+def test_large_probability_tables_are_split_into_messages():
+    names = [f"Team {number:02d}" for number in range(40)]
+    probabilities = np.full((40, 40), 1 / 40)
+    columns = [f"P{n}" for n in range(1, 41)]
+
+    blocks = TeamDisplaySystem.format_probabilities(names, probabilities, columns)
+
+    assert len(blocks) > 1
+    assert all(len(block) <= 1900 for block in blocks)
+    # Every block repeats the header row, and every team appears once, in order
+    tables = [block.strip("`").splitlines() for block in blocks]
+    assert all(table[0].split()[:2] == ["Team", "P1"] for table in tables)
+    assert [row[:7] for table in tables for row in table[1:]] == names
@@ -0,0 +1,48 @@
+import random
+import pytest
+from utils.team_registry import TeamRegistry
+
+
+def make_teams(ratings):
+    return [{"Team Name": f"Team {index}", "Elo Rating": rating, "Matches": []}
+            for index, rating in enumerate(ratings)]
+
+
+def test_lookup_is_case_insensitive():
+    registry = TeamRegistry(make_teams([1000.0, 1010.0]))
+
+    assert registry.get("team 1")["Elo Rating"] == 1010.0
+    assert registry.get("  TEAM   0 ") is registry.teams[0]
+    assert "Team 2" not in registry
+    assert registry.get("Team 2") is None
+
+
+def test_top_matches_stable_sort_after_updates():
+    random.seed(7)
+    registry = TeamRegistry(make_teams([random.choice([990.0, 1000.0, 1010.0]) for _ in range(50)]))
+    for _ in range(200):
+        team = random.choice(registry.teams)
+        registry.set_rating(team, random.choice([990.0, 1000.0, 1010.0, team["Elo Rating"] + 3]))
+    registry.add("Newcomer", 1000.0)
+
+    expected = sorted(registry.teams, key=lambda team: team["Elo Rating"], reverse=True)
+    assert registry.top(10) == expected[:10]
+    assert registry.top(10, offset=45) == expected[45:]
+    assert [registry.rank(team["Team Name"]) for team in expected] == list(range(1, len(expected) + 1))
+
+
+def test_add_returns_existing_team():
+    registry = TeamRegistry(make_teams([1000.0]))
+
+    assert registry.add("TEAM 0", 1200.0) is registry.teams[0]
+    assert len(registry) == 1
+    assert registry.teams[0]["Elo Rating"] == 1000.0
+
+
+def test_rebuild_picks_up_bulk_rating_changes():
+    registry = TeamRegistry(make_teams([1000.0, 1010.0]))
+    registry.teams[0]["Elo Rating"] = 1100.0
+    registry.rebuild()
+
+    assert [team["Team Name"] for team in registry.top(2)] == ["Team 0", "Team 1"]
+    assert registry.rank("Team 1") == 2
@@ -1,16 +1,15 @@
 import pytest
-from unittest.mock import patch
 import discord
+from cogs.historical_results.historical_results import HistoricalResults
+from utils.player_stats import RATING_MIN_GAMES, PlayerStats
 
 
 @pytest.mark.asyncio
-async def test_show_player_history_found(
-    historical_results, mock_ctx, sample_player_data
-):
+async def test_show_player_history_found(bot, mock_ctx, sample_player_data):
     """Test player history display when player is found."""
-    with patch("utils.data_loader.load_player_data", return_value=[sample_player_data]):
-        command = historical_results.show_player_history.callback
-        await command(historical_results, mock_ctx, player_name="Bobi")
+    historical_results = HistoricalResults(bot, PlayerStats([sample_player_data]))
+    command = historical_results.show_player_history.callback
+    await command(historical_results, mock_ctx, player_name="Bobi")
     assert mock_ctx.send.called
     call_args = mock_ctx.send.call_args
     args, kwargs = call_args
@@ -18,30 +17,31 @@ async def test_show_player_history_found(
     embed = kwargs["embed"]
     assert isinstance(embed, discord.Embed)
     assert embed.title == "Historical Results: Bobi"
+    assert embed.fields[-1].value == str(PlayerStats([sample_player_data]).column("Rating")[0])
 
 
 @pytest.mark.asyncio
-async def test_show_player_history_not_found(historical_results, mock_ctx):
+async def test_show_player_history_not_found(bot, mock_ctx, sample_player_data):
     """Test player history display when player is not found."""
-    with patch("utils.data_loader.load_player_data", return_value=[]):
-        command = historical_results.show_player_history.callback
-        await command(historical_results, mock_ctx, player_name="NonexistentPlayer")
+    historical_results = HistoricalResults(bot, PlayerStats([sample_player_data]))
+    command = historical_results.show_player_history.callback
+    await command(historical_results, mock_ctx, player_name="NonexistentPlayer")
     mock_ctx.send.assert_called_once_with(
         "No historical data found for player 'NonexistentPlayer'!"
     )
 
 
 @pytest.mark.asyncio
-async def test_command_historical_leaderboard(
-    historical_results, mock_ctx, sample_player_data
-):
+async def test_command_historical_leaderboard(bot, mock_ctx, sample_player_data):
     """Test the historical_leaderboard command."""
-    with patch("utils.data_loader.load_player_data", return_value=[sample_player_data]):
-        command = historical_results.show_leaderboard.callback
-        await command(historical_results, mock_ctx)
+    ranked_player = dict(sample_player_data, **{"Games Played": RATING_MIN_GAMES})
+    historical_results = HistoricalResults(bot, PlayerStats([ranked_player]))
+    command = historical_results.show_leaderboard.callback
+    await command(historical_results, mock_ctx)
     mock_ctx.send.assert_called_once()
     call_args = mock_ctx.send.call_args[1]
     assert "embed" in call_args
     embed = call_args["embed"]
     assert isinstance(embed, discord.Embed)
     assert embed.title == "Top Players Leaderboard"
+    assert [field.name for field in embed.fields] == ["1. Bobi"]
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from cogs.unit_comparison.unit_comparison import UnitStatsComparison
+from utils.chart_cache import ChartCache, chart_key
+from utils.chart_renderer import ChartRenderer
+from utils.charts import render_unit_comparison
+from utils.data_loader import UnitCatalog
+
+UNITS = [
+    {"Unit": "Evocati Cohort", "Faction": "Rome", "Melee Attack": 40, "Armor": 60},
+    {"Unit": "Sword Followers", "Faction": "Arverni", "Melee Attack": 45, "Armor": 30},
+]
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded_by_bytes():
+    cache = ChartCache(directory=None, max_memory_bytes=10)
+    await cache.put("a", b"12345")
+    await cache.put("b", b"12345")
+    await cache.get("a")
+    await cache.put("c", b"123")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"12345" and await cache.get("c") == b"123"
+    assert cache.memory_bytes == 8
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_a_restart_and_is_pruned(tmp_path):
+    cache = ChartCache(str(tmp_path), max_disk_bytes=10)
+    await cache.put("old", b"123456")
+    os.utime(tmp_path / "old.png", ns=(1, 1))
+    await cache.put("new", b"123456")
+
+    restarted = ChartCache(str(tmp_path))
+    assert await restarted.get("new") == b"123456"
+    assert await restarted.get("old") is None
+    assert chart_key("a", [1, 2]) == chart_key("a", [1, 2]) != chart_key("a", [1, 3])
+
+
+@pytest.mark.asyncio
+async def test_comparison_renders_once_until_the_units_change(tmp_path):
+    cog = UnitStatsComparison(MagicMock(), UnitCatalog(UNITS), ChartCache(str(tmp_path)), ChartRenderer(processes=0))
+    evocati, followers = UNITS
+
+    with patch("cogs.unit_comparison.unit_comparison.render_unit_comparison", wraps=render_unit_comparison) as render:
+        png = await cog.comparison_chart(evocati, followers)
+        cog.chart_cache.clear_memory()
+        assert await cog.comparison_chart(evocati, followers) == png
+        assert await cog.comparison_chart(evocati, followers) == png
+        assert render.call_count == 1
+
+        await cog.comparison_chart(dict(evocati, Armor=65), followers)
+        await cog.comparison_chart(followers, evocati)
+        assert render.call_count == 3
+    assert png.startswith(b"\x89PNG")
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_is_only_touched_off_the_event_loop(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    with patch("utils.chart_cache.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        await cache.put("chart", b"png")
+        cache.clear_memory()
+        assert await cache.get("chart") == b"png"
+        # Served from memory now, without another trip to the disk
+        assert await cache.get("chart") == b"png"
+
+    assert [call.args[0] for call in to_thread.call_args_list] == [cache._write, cache._read]
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import time
+import pytest
+from utils.chart_renderer import ChartRenderer, ChartRenderError
+from utils.charts import render_rating_history
+
+
+def slow_chart(seconds: float) -> bytes:
+    time.sleep(seconds)
+    return b"png"
+
+
+def worker_pid() -> bytes:
+    return str(os.getpid()).encode()
+
+
+@pytest.mark.asyncio
+async def test_renders_in_worker_processes_without_blocking_the_loop():
+    renderer = ChartRenderer(processes=2)
+    try:
+        jobs = asyncio.gather(
+            renderer.render(render_rating_history, "Team A", [1, 2, 3], [1000.0, 1016.0, 1001.0]),
+            renderer.render(render_rating_history, "Team B", [1, 2], [1000.0, 984.0]),
+        )
+        # Both renders are handed off, and the loop gets control back while they run
+        await asyncio.sleep(0)
+        assert renderer.pending == 2 and not jobs.done()
+        png, second = await jobs
+        assert png.startswith(b"\x89PNG") and second.startswith(b"\x89PNG")
+        assert renderer.pending == 0
+        assert await renderer.render(worker_pid) != str(os.getpid()).encode()
+    finally:
+        renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_and_jobs_time_out():
+    renderer = ChartRenderer(processes=0, max_pending=2, timeout=0.05)
+    try:
+        first = asyncio.ensure_future(renderer.render(slow_chart, 0.3, key="slow"))
+        shared = asyncio.ensure_future(renderer.render(slow_chart, 0.3, key="slow"))
+        await asyncio.sleep(0)
+        assert renderer.pending == 1
+        second = asyncio.ensure_future(renderer.render(slow_chart, 0.3))
+        await asyncio.sleep(0)
+        with pytest.raises(ChartRenderError, match="Too many charts"):
+            await renderer.render(slow_chart, 0.3)
+        for job in (first, shared, second):
+            with pytest.raises(ChartRenderError, match="took longer"):
+                await job
+        # The timeouts retired the pool, so its slots are free again straight away
+        assert renderer.pending == 0
+        assert await renderer.render(slow_chart, 0, key="slow") == b"png"
+    finally:
+        renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_a_hung_render_is_killed_with_its_worker():
+    renderer = ChartRenderer(processes=1, max_pending=1, timeout=5.0)
+    try:
+        # Warm the worker up first, so the timeout below only covers the hung render
+        assert await renderer.render(slow_chart, 0) == b"png"
+        workers = list(renderer._executor._processes.values())
+        renderer.timeout = 0.5
+        with pytest.raises(ChartRenderError, match="took longer"):
+            await renderer.render(slow_chart, 600)
+
+        assert renderer.pending == 0
+        for worker in workers:
+            worker.join(5)
+            assert not worker.is_alive()
+        renderer.timeout = 30.0
+        assert await renderer.render(slow_chart, 0) == b"png"
+    finally:
+        renderer.close()
@@ -0,0 +1,29 @@
+import datetime
+from utils.charts import draw_rating_history, draw_unit_comparison, render_rating_history, render_unit_comparison
+
+UNITS = [
+    {"Unit": "Evocati Cohort", "Faction": "Rome", "Melee Attack": 40, "Armor": 60, "HP": 100},
+    {"Unit": "Sword Followers", "Faction": "Arverni", "Melee Attack": 45, "Armor": 30},
+    {"Unit": "Slingers", "Faction": "Baleares", "Range": 150, "Ammo": 30},
+]
+
+
+def test_warm_comparison_template_draws_the_same_png():
+    for unit1, unit2 in ((UNITS[0], UNITS[1]), (UNITS[2], UNITS[0]), (UNITS[1], UNITS[2])):
+        assert render_unit_comparison(unit1, unit2) == draw_unit_comparison(unit1, unit2)
+
+
+def test_warm_history_template_draws_the_same_png():
+    short = [datetime.date(2025, 1, day) for day in range(1, 4)]
+    long = [datetime.date(2024, 1, 1) + datetime.timedelta(days=3 * day) for day in range(50)]
+    for team, dates, ratings in (("Team A", short, [1000.0, 1016.0, 1001.0]),
+                                 ("Team B", long, [1000.0 + day % 7 for day in range(50)])):
+        assert render_rating_history(team, dates, ratings) == draw_rating_history(team, dates, ratings)
+
+
+def test_single_match_history_matches_a_fresh_draw():
+    short = [datetime.date(2022, 1, 1), datetime.date(2024, 6, 1), datetime.date(2026, 5, 1)]
+    render_rating_history("Team A", short, [1000.0, 1016.0, 1001.0])
+
+    single = [datetime.date(2025, 3, 1)]
+    assert render_rating_history("Team C", single, [1016.0]) == draw_rating_history("Team C", single, [1016.0])
@@ -0,0 +1,31 @@
+from utils.data_loader import UnitCatalog, get_unit_catalog, load_unit_data
+
+
+def test_unit_catalog_groups_units_by_faction():
+    units = load_unit_data()
+    catalog = UnitCatalog(units)
+
+    assert sum(len(faction_units) for faction_units in catalog.factions.values()) == len(units)
+    assert all(unit["Faction"] == "Rome" for unit in catalog.factions["Rome"])
+
+
+def test_unit_catalog_lookup_is_case_insensitive():
+    catalog = UnitCatalog([
+        {"Unit": "Evocati Cohort", "Faction": "Rome"},
+        {"Unit": "Evocati Cohort", "Faction": "Other"},
+    ])
+
+    assert catalog.get_unit("evocati COHORT")["Faction"] == "Rome"
+    assert catalog.get_unit("Unknown Unit") is None
+
+
+def test_get_unit_catalog_is_shared():
+    assert get_unit_catalog() is get_unit_catalog()
+
+
+def test_faction_stats_table_is_precomputed():
+    catalog = get_unit_catalog()
+
+    assert set(catalog.faction_stats) == set(catalog.factions)
+    assert catalog.faction_stats["Rome"]["survivability"] == 92.21
+    assert catalog.faction_stats is get_unit_catalog().faction_stats
@@ -0,0 +1,116 @@
+import copy
+import json
+import os
+import threading
+import pytest
+from utils.data_watcher import DataWatcher
+from utils.data_loader import get_unit_catalog, UnitCatalog
+from utils.elo_store import EloStore
+from utils.elo_writer import EloWriter
+
+
+def write_json(path, data, mtime_ns):
+    with open(path, "w") as f:
+        json.dump(data, f)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_only_changed_files(tmp_path):
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    write_json(first, {"value": 1}, 1_000_000_000)
+    write_json(second, {"value": 1}, 1_000_000_000)
+    applied = []
+
+    watcher = DataWatcher()
+    for path in (first, second):
+        watcher.watch(str(path), lambda p: json.load(open(p)), lambda data, p=path: applied.append((p.name, data)))
+
+    assert await watcher.check() == []
+
+    write_json(first, {"value": 2}, 2_000_000_000)
+    assert await watcher.check() == [str(first)]
+    assert applied == [("first.json", {"value": 2})]
+    assert await watcher.check() == []
+
+
+@pytest.mark.asyncio
+async def test_watcher_keeps_old_data_when_file_is_invalid(tmp_path):
+    path = tmp_path / "data.json"
+    write_json(path, {"value": 1}, 1_000_000_000)
+    applied = []
+    watcher = DataWatcher()
+    watcher.watch(str(path), lambda p: json.load(open(p)), applied.append)
+
+    path.write_text("{ not json")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert await watcher.check() == []
+    assert applied == []
+
+    write_json(path, {"value": 3}, 3_000_000_000)
+    assert await watcher.check() == [str(path)]
+    assert applied == [{"value": 3}]
+
+
+@pytest.mark.asyncio
+async def test_watcher_skips_snapshots_the_store_wrote_itself(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    write_json(path, {"teams": [{"Team Name": "A", "Elo Rating": 1000.0, "Matches": []}]}, 1_000_000_000)
+    store = EloStore(str(path))
+    applied = []
+    watcher = DataWatcher()
+    watcher.watch(str(path), lambda p: json.load(open(p)), applied.append)
+    store.on_snapshot_written = watcher.acknowledge
+
+    store.record_match("A", "B", "2025-01-01")
+    store.compact()
+    assert await watcher.check() == []
+    assert applied == []
+
+    data = json.load(open(path))
+    data["teams"][0]["Elo Rating"] = 1200.0
+    write_json(path, data, 3_000_000_000)
+    assert await watcher.check() == [str(path)]
+    assert applied[0]["teams"][0]["Elo Rating"] == 1200.0
+
+
+@pytest.mark.asyncio
+async def test_writer_reports_compactions_on_the_event_loop(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    write_json(path, {"teams": []}, 1_000_000_000)
+    store = EloStore(str(path), compact_every=1)
+    threads = []
+    store.on_snapshot_written = lambda p: threads.append(threading.current_thread())
+    writer = EloWriter(store)
+
+    await writer.record_match("A", "B", "2025-01-01")
+    await writer.flush()
+
+    assert threads == [threading.current_thread()]
+    await writer.stop()
+
+
+def test_catalog_rebuild_rescores_changed_factions_only():
+    base = get_unit_catalog()
+    catalog = UnitCatalog(base.units, base.modifiers)
+    units = copy.deepcopy(base.units)
+    for unit in units:
+        if unit["Faction"] == "Rome":
+            unit["Armor"] += 10
+
+    rebuilt = catalog.rebuilt(units=units)
+
+    assert rebuilt.version == catalog.version + 1
+    assert rebuilt.faction_stats["Rome"]["survivability"] > catalog.faction_stats["Rome"]["survivability"]
+    assert rebuilt.faction_stats["Carthage"] is catalog.faction_stats["Carthage"]
+
+    modifiers = copy.deepcopy(base.modifiers)
+    modifiers["Carthage"]["melee_strength"] *= 2
+    remodified = rebuilt.rebuilt(modifiers=modifiers)
+    assert remodified.unit_index is rebuilt.unit_index
+    assert remodified.faction_stats["Carthage"]["melee_strength"] == pytest.approx(
+        rebuilt.faction_stats["Carthage"]["melee_strength"] * 2, abs=0.01)
+
+    catalog.swap_in(remodified)
+    assert catalog.version == remodified.version
+    assert catalog.faction_stats is remodified.faction_stats
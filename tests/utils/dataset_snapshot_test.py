@@ -0,0 +1,69 @@
+import json
+import shutil
+import pytest
+from utils.data_loader import DATA_DIR
+from utils.dataset_snapshot import (
+    BLOB_SOURCES,
+    UNITS_SOURCE,
+    SnapshotError,
+    compile_snapshot,
+    load_snapshot_blob,
+    load_snapshot_units,
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for source in [UNITS_SOURCE, *BLOB_SOURCES.values()]:
+        shutil.copy(f"{DATA_DIR}/{source}", tmp_path / source)
+    return tmp_path
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_snapshot_round_trips_every_file(data_dir):
+    compile_snapshot(str(data_dir))
+
+    assert load_snapshot_units(str(data_dir)) == read_json(data_dir / UNITS_SOURCE)
+    for blob_name, source in BLOB_SOURCES.items():
+        assert load_snapshot_blob(str(data_dir), blob_name) == read_json(data_dir / source)
+
+
+def test_stale_snapshot_is_ignored(data_dir):
+    compile_snapshot(str(data_dir))
+    units = read_json(data_dir / UNITS_SOURCE)
+    units[0]["Armor"] += 1
+    (data_dir / UNITS_SOURCE).write_text(json.dumps(units))
+
+    assert load_snapshot_units(str(data_dir)) is None
+    assert load_snapshot_blob(str(data_dir), "players") is not None
+
+
+def test_missing_snapshot_is_ignored(data_dir):
+    assert load_snapshot_units(str(data_dir)) is None
+    assert load_snapshot_blob(str(data_dir), "players") is None
+
+
+def test_invalid_units_are_rejected(data_dir):
+    units = read_json(data_dir / UNITS_SOURCE)
+    units[3]["HP"] = "lots"
+    (data_dir / UNITS_SOURCE).write_text(json.dumps(units))
+
+    with pytest.raises(SnapshotError, match="HP"):
+        compile_snapshot(str(data_dir))
+
+
+def test_interrupted_rebuild_leaves_no_valid_snapshot(data_dir):
+    compile_snapshot(str(data_dir))
+    (data_dir / BLOB_SOURCES["modifiers"]).write_text("{not json")
+
+    with pytest.raises(ValueError):
+        compile_snapshot(str(data_dir))
+
+    # The units and players were rewritten before the failure, but without a manifest nothing is trusted
+    assert load_snapshot_units(str(data_dir)) is None
+    assert load_snapshot_blob(str(data_dir), "players") is None
+    assert not list((data_dir / "compiled").glob("*.tmp"))
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from utils.faction_scoring import FactionScoringEngine, SCORE_COLUMNS, STAT_KEYS
+from utils.data_loader import UnitCatalog, get_unit_catalog
+
+modifiers = get_unit_catalog().modifiers
+
+
+def reference_scores(units):
+    """Straightforward per-unit loop the vectorized engine has to agree with."""
+    missile_units = sum(1 for unit in units if unit["Base Missile Damage"] > 0)
+    cavalry = [unit for unit in units if unit["Class"] in ("Shock Cavalry", "Melee Cavalry")]
+    pilla = [unit for unit in units if 0 < unit["Range"] <= 80]
+    ranged = sum(unit["Base Missile Damage"] for unit in units if unit["Range"] > 80)
+    return [
+        sum(unit["Armor"] for unit in units) / len(units),
+        sum(unit["Melee Attack"] for unit in units) / len(units),
+        ranged / missile_units if missile_units else 0.0,
+        sum(u["Charge Bonus"] + u["Melee Attack"] + u["Armor"] for u in cavalry) / len(cavalry) if cavalry else 0.0,
+        sum(u["AP Damage"] + u["Ammo"] for u in pilla) / len(pilla) if pilla else 0.0,
+    ]
+
+
+def test_engine_matches_reference_loop():
+    catalog = get_unit_catalog()
+    engine = FactionScoringEngine.from_factions(catalog.factions)
+
+    for code, faction in enumerate(engine.faction_names):
+        assert engine.raw_scores[code] == pytest.approx(reference_scores(catalog.factions[faction]))
+
+
+def test_score_all_applies_modifiers():
+    engine = FactionScoringEngine(get_unit_catalog().units)
+    scores = engine.score_all(modifiers)
+
+    assert scores["Rome"] == {
+        "survivability": 92.21,
+        "melee_strength": 88.08,
+        "ranged_strength": 88.4,
+        "cavalry_prowess": 42.5,
+        "pilla_prowess": 52.61,
+    }
+
+
+def test_sweep_scores_every_modifier_set():
+    engine = FactionScoringEngine(get_unit_catalog().units)
+    doubled = {faction: {stat: value * 2 for stat, value in stats.items()} for faction, stats in modifiers.items()}
+
+    sweep = engine.sweep([modifiers, doubled])
+
+    assert sweep.shape == (2, len(engine.faction_names), len(STAT_KEYS))
+    assert np.allclose(sweep[1], sweep[0] * 2)
+
+
+def test_engine_scores_synthetic_columns():
+    rng = np.random.default_rng(0)
+    unit_count, faction_count = 20_000, 50
+    # The unit data has no "Missile Damage" column, so neither has the reference loop
+    columns = {column: rng.integers(0, 160, unit_count).astype(float)
+               for column in SCORE_COLUMNS if column != "Missile Damage"}
+    codes = rng.integers(0, faction_count, unit_count)
+    is_cavalry = rng.random(unit_count) < 0.2
+    names = [f"Faction {i}" for i in range(faction_count)]
+
+    engine = FactionScoringEngine.from_columns(names, codes, columns, is_cavalry)
+
+    assert engine.score_matrix({}).shape == (faction_count, len(STAT_KEYS))
+    for code in range(3):
+        units = [dict({column: values[position] for column, values in columns.items()},
+                      Class="Shock Cavalry" if is_cavalry[position] else "Infantry")
+                 for position in np.flatnonzero(codes == code)]
+        assert engine.raw_scores[code] == pytest.approx(reference_scores(units))
+
+
+def test_rebuild_with_unchanged_modifiers_rescores_nothing():
+    base = get_unit_catalog()
+    catalog = UnitCatalog(base.units, base.modifiers)
+
+    # No faction changed, so the engine is built from no units at all
+    assert FactionScoringEngine.from_factions({}).score_all(modifiers) == {}
+    rebuilt = catalog.rebuilt(modifiers=dict(catalog.modifiers))
+    assert rebuilt.faction_stats == catalog.faction_stats
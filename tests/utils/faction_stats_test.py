@@ -1,5 +1,7 @@
 import pytest
 import json
+from unittest.mock import patch
+from utils.data_loader import UnitCatalog
 from utils.unit_performance import (
     analyze_faction_weights,
     make_hashable_unit,
@@ -26,6 +28,22 @@ def faction_data():
     return factions, modifiers
 
 
+def test_analysis_follows_reloaded_modifiers(faction_data):
+    factions, modifiers = faction_data
+    catalog = UnitCatalog([unit for units in factions.values() for unit in units], modifiers)
+    rome_units = tuple(make_hashable_unit(unit) for unit in factions["Rome"])
+    boosted = dict(modifiers, Rome=dict(modifiers["Rome"], survivability=modifiers["Rome"]["survivability"] * 2))
+
+    with patch("utils.unit_performance.get_unit_catalog", return_value=catalog):
+        before = analyze_faction_weights(rome_units, "Rome")
+        catalog.swap_in(catalog.rebuilt(modifiers=boosted))
+        after = analyze_faction_weights(rome_units, "Rome")
+
+    assert after["survivability"] != before["survivability"]
+    assert {key: value for key, value in after.items() if key != "survivability"} == \
+        {key: value for key, value in before.items() if key != "survivability"}
+
+
 def test_analyze_faction_weights(faction_data):
     factions, _ = faction_data
 
@@ -0,0 +1,99 @@
+import json
+import discord
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from cogs.elo_rating.display_elo import TeamDisplaySystem
+from cogs.historical_results.historical_results import HistoricalResults
+from utils.elo_store import EloStore
+from utils.leaderboard_pages import LeaderboardPages, LeaderboardView, page_count, send_leaderboard
+from utils.player_stats import PlayerStats
+
+PLAYERS = [{"Player": f"Player {index}", "Win %": f"{index}%", "Games Played": 25} for index in range(25)]
+
+
+def test_pages_are_built_once_per_version():
+    pages = LeaderboardPages(max_boards=2)
+    build = MagicMock(side_effect=lambda page: discord.Embed(title=str(page)))
+
+    first = pages.page("board", 1, 0, build)
+    assert pages.page("board", 1, 0, build) is first
+    pages.page("board", 2, 0, build)
+    pages.page("other", 1, 0, build)
+    pages.page("third", 1, 0, build)
+    pages.page("board", 2, 0, build)
+    assert build.call_count == 5
+    assert page_count(0) == 1 and page_count(21) == 3
+
+
+@pytest.mark.asyncio
+async def test_view_pages_through_the_board():
+    view = LeaderboardView(lambda: 3, lambda page: discord.Embed(title=str(page)))
+    interaction = MagicMock()
+    interaction.response.edit_message = AsyncMock()
+
+    assert view.previous_page.disabled and not view.next_page.disabled
+    await view.next_page.callback(interaction)
+    await view.next_page.callback(interaction)
+    assert interaction.response.edit_message.call_args[1]["embed"].title == "2"
+    assert view.next_page.disabled
+    await view.previous_page.callback(interaction)
+    assert view.current == 1
+
+
+@pytest.mark.asyncio
+async def test_historical_pages_are_cache_hits_until_the_data_changes():
+    stats = PlayerStats(PLAYERS)
+    cog = HistoricalResults(MagicMock(), stats)
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.win_percentage_leaderboard.callback(cog, ctx)
+    view = ctx.send.call_args[1]["view"]
+    assert view.pages == 3
+    assert [field.name for field in view.render(2).fields] == ["21. Player 4", "22. Player 3", "23. Player 2",
+                                                               "24. Player 1", "25. Player 0"]
+    assert view.render(2) is view.render(2)
+
+    stats.swap_in(stats.rebuilt(PLAYERS[:5]))
+    assert view.render(0).fields[0].name == "1. Player 4"
+
+    # The board shrank to one page, so paging on stays on it
+    interaction = MagicMock()
+    interaction.response.edit_message = AsyncMock()
+    await view.next_page.callback(interaction)
+    assert view.current == 0 and view.next_page.disabled
+    assert interaction.response.edit_message.call_args[1]["embed"].footer.text == "Page 1/1"
+
+
+@pytest.mark.asyncio
+async def test_view_disables_its_buttons_on_timeout():
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+    await send_leaderboard(ctx, lambda: 2, lambda page: discord.Embed(title=str(page)))
+    view = ctx.send.call_args[1]["view"]
+
+    await view.on_timeout()
+
+    assert view.previous_page.disabled and view.next_page.disabled
+    view.message.edit.assert_awaited_once_with(view=view)
+
+
+@pytest.mark.asyncio
+async def test_elo_ranking_is_paginated(tmp_path):
+    path = tmp_path / "elo_rating.json"
+    teams = [{"Team Name": f"Team {index}", "Elo Rating": 1000.0 + index, "Matches": []} for index in range(12)]
+    path.write_text(json.dumps({"teams": teams}))
+    store = EloStore(str(path))
+    cog = TeamDisplaySystem(MagicMock(), store)
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.show_top_teams.callback(cog, ctx)
+    view = ctx.send.call_args[1]["view"]
+    second = view.render(1)
+    assert second.title == "Teams 11-12 by Elo Rating"
+    assert [field.name for field in second.fields] == ["Team 1", "Team 0"]
+    assert view.render(1) is second
+
+    store.record_match("Team 0", "Team 11", "2025-01-01")
+    assert view.render(1) is not second
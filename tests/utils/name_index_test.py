@@ -0,0 +1,51 @@
+import pytest
+from utils.name_index import NameIndex, edit_distance, normalize_name
+from utils.data_loader import get_unit_catalog
+
+
+@pytest.fixture(scope="module")
+def unit_index():
+    return get_unit_catalog().unit_index
+
+
+def test_normalize_name():
+    assert normalize_name("  Evocati   COHORT ") == "evocati cohort"
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [("kitten", "sitting", 3), ("", "abc", 3), ("same", "same", 0)],
+)
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b) == expected
+
+
+def test_exact_lookup_ignores_case_and_spacing(unit_index):
+    assert unit_index.get("evocati  cohort")["Unit"] == "Evocati Cohort"
+
+
+def test_suggest_ranks_near_misses_first(unit_index):
+    suggestions = unit_index.suggest("Evocati Cohrt")
+    assert suggestions[0][0] == "Evocati Cohort"
+    assert all(0 < score <= 1 for _, score in suggestions)
+
+
+def test_resolve_accepts_typos_but_not_noise(unit_index):
+    assert unit_index.resolve("Evocatti Cohort")["Unit"] == "Evocati Cohort"
+    assert unit_index.resolve("zzzz qqqq") is None
+
+
+def test_resolve_refuses_ties():
+    index = NameIndex([("Alpha Beta", 1), ("Alpha Bets", 2)])
+    assert index.resolve("Alpha Betx") is None
+    assert index.resolve("alpha beta") == 1
+
+
+def test_prefix_lookup_keeps_insertion_order():
+    index = NameIndex([("Hyena", 1), ("Hydra", 2), ("Bobi", 3), ("hyena", 4)])
+    assert index.with_prefix("HY") == ["Hyena", "Hydra"]
+    assert index.with_prefix("hy", limit=1) == ["Hyena"]
+    assert index.with_prefix("x") == []
+    assert index.resolve("hyd", prefix=True) == 2
+    assert index.resolve("hyd") is None
+    assert index.resolve("hy", prefix=True) is None
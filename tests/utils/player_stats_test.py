@@ -0,0 +1,134 @@
+import json
+import os
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from cogs.historical_results.historical_results import HistoricalResults
+from utils.data_watcher import DataWatcher
+from utils.player_stats import (DEFAULT_RATING_WEIGHTS, PlayerStats, calculate_player_rating, parse_stat,
+                                rate_players, watch_player_stats)
+
+PLAYERS = [
+    {"Player": "Bobi", "Win %": "62.5%", "K/D ratio": 1.2, "Games Played": 24, "Championships": ""},
+    {"Player": "Hyena", "Win %": "70.0%", "K/D ratio": "", "Games Played": 30, "Championships": 2},
+    {"Player": "Rookie", "Win %": "100%", "K/D ratio": 3, "Games Played": 4},
+]
+
+
+def test_parse_stat_normalizes_percentages_and_blanks():
+    assert parse_stat("16.7%") == 16.7
+    assert parse_stat(" 5 ") == 5.0
+    assert parse_stat("") == 0.0
+    assert parse_stat(None) == 0.0
+    assert parse_stat("n/a") == 0.0
+
+
+def test_columns_are_typed_at_load():
+    stats = PlayerStats(PLAYERS)
+
+    assert stats.column("Win %").tolist() == [62.5, 70.0, 100.0]
+    assert stats.column("Championships").tolist() == [0.0, 2.0, 0.0]
+    assert stats.column("Missing Stat").tolist() == [0.0, 0.0, 0.0]
+    assert stats.get("HYENA") is PLAYERS[1]
+    assert stats.typed_record(0)["K/D ratio"] == 1.2
+
+
+def test_leaderboards_do_no_file_io():
+    cog = HistoricalResults(MagicMock(), PlayerStats(PLAYERS))
+
+    with patch("builtins.open", side_effect=AssertionError("file read in a command")):
+        leaderboard = cog.generate_metric_leaderboard("Win %")
+        ratings = cog.generate_leaderboard()
+
+    assert [(entry["Player"], entry["Win %"]) for entry in leaderboard] == [("Hyena", 70.0), ("Bobi", 62.5)]
+    assert [entry["Player"] for entry in ratings] == ["Bobi", "Hyena"]
+    assert ratings[0]["Rating"] == cog.calculate_player_rating(PLAYERS[0])
+
+
+@pytest.mark.asyncio
+async def test_stats_reload_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "player_stats_historical.json"
+    path.write_text(json.dumps(PLAYERS))
+    stats = PlayerStats(PLAYERS)
+    watcher = DataWatcher()
+    with patch("utils.player_stats.PLAYER_STATS_PATH", str(path)):
+        watch_player_stats(stats, watcher)
+
+    assert await watcher.check() == []
+    path.write_text(json.dumps(PLAYERS[:1]))
+    os.utime(path, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+    assert await watcher.check() == [str(path)]
+    assert stats.version == 2
+    assert stats.names == ["Bobi"]
+
+
+def test_leaderboards_are_materialized_at_load():
+    stats = PlayerStats(PLAYERS)
+
+    assert stats.leaderboard("Win %").tolist() == [1, 0]
+    assert stats.leaderboard("Rating", limit=1).tolist() == [0]
+    assert stats.leaderboard("Championships", limit=1, offset=1).tolist() == [0]
+    assert stats.leaderboard("Missing Stat").tolist() == []
+    assert stats.column("Rating")[2] == HistoricalResults.calculate_player_rating(None, PLAYERS[2])
+    assert stats.resolve_metric("kd ratio") == "K/D ratio"
+
+
+@pytest.mark.asyncio
+async def test_generic_leaderboard_command():
+    cog = HistoricalResults(MagicMock(), PlayerStats(PLAYERS))
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.metric_leaderboard.callback(cog, ctx, metric="championships")
+    embed = ctx.send.call_args[1]["embed"]
+    assert embed.title == "Top Players by Championships"
+    assert [field.name for field in embed.fields] == ["1. Hyena", "2. Bobi"]
+
+    await cog.metric_leaderboard.callback(cog, ctx, metric="elo")
+    assert ctx.send.call_args[0][0].startswith("Please choose one of these stats: Win %")
+
+
+def test_vectorized_rating_matches_the_formula():
+    stats = PlayerStats(PLAYERS)
+    weights = DEFAULT_RATING_WEIGHTS.replaced(min_games=5, kd_ratio=50, achievements={"Championships": 100})
+
+    assert stats.column("Rating").tolist() == [calculate_player_rating(player) for player in PLAYERS]
+    assert stats.rerated(weights).tolist() == [calculate_player_rating(player, weights) for player in PLAYERS]
+    assert weights.achievements["Runner-ups"] == 20
+    assert DEFAULT_RATING_WEIGHTS.achievements["Championships"] == 30
+
+
+def test_vectorized_rating_matches_the_scalar_rating_on_a_large_roster():
+    rng = np.random.default_rng(0)
+    columns = {key: np.round(rng.random(100_000) * 100, 1)
+               for key in ("Games Played", "Win %", "K/D ratio", "Chevrons/game", "Playoff Rate")}
+    columns["Championships"] = rng.integers(0, 3, 100_000).astype(np.float64)
+
+    ratings = rate_players(columns)
+    assert ratings.shape == (100_000,)
+    sample = [dict(zip(columns, values)) for values in zip(*(column[:500].tolist() for column in columns.values()))]
+    assert ratings[:500].tolist() == [calculate_player_rating(record) for record in sample]
+
+
+def test_parse_weight_options():
+    cog = HistoricalResults(MagicMock(), PlayerStats(PLAYERS))
+
+    weights = cog.parse_weight_options("kd=80 championships=50 min_games=10")
+    assert (weights.kd_ratio, weights.min_games, weights.achievements["Championships"]) == (80, 10, 50)
+    with pytest.raises(ValueError):
+        cog.parse_weight_options("elo=5")
+
+
+@pytest.mark.asyncio
+async def test_player_history_tolerates_prefixes_and_typos():
+    achievements = dict.fromkeys(DEFAULT_RATING_WEIGHTS.achievements, 0)
+    cog = HistoricalResults(MagicMock(), PlayerStats([dict(player, **achievements) for player in PLAYERS]))
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    assert cog.get_player_history("hyna")["Games Played"] == 30
+    await cog.show_player_history.callback(cog, ctx, player_name="roo")
+    assert ctx.send.call_args[1]["embed"].title == "Historical Results: Rookie"
+
+    await cog.show_player_history.callback(cog, ctx, player_name="Bobby")
+    ctx.send.assert_called_with("No historical data found for player 'Bobby'! Did you mean: Bobi?")
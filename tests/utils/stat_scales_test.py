@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from cogs.unit_comparison.unit_comparison import UnitStatsComparison, parse_unit_list
+from utils.chart_cache import ChartCache
+from utils.chart_renderer import ChartRenderer
+from utils.data_loader import UnitCatalog
+from utils.stat_scales import COMPARISON_STATS, StatScales, stat_matrix
+
+UNITS = [
+    {"Unit": f"Unit {index}", "Faction": "Rome", "HP": 60 + index * 10, "Range": 150 if index == 4 else 0}
+    for index in range(5)
+]
+
+
+def test_percentile_and_range_scales():
+    scales = StatScales(UNITS)
+    hp, range_ = COMPARISON_STATS.index("HP"), COMPARISON_STATS.index("Range")
+    percentile = scales.normalize(stat_matrix(UNITS))
+    spread = scales.normalize(stat_matrix(UNITS), "range")
+
+    assert percentile[:, hp].tolist() == sorted(percentile[:, hp].tolist())
+    assert (percentile[0, hp], percentile[4, hp]) == (0.0, 1.0)
+    # Units without a ranged attack stay at the bottom rather than sharing a median rank
+    assert percentile[:4, range_].tolist() == [0.0] * 4 and percentile[4, range_] == 1.0
+    np.testing.assert_allclose(spread[:, hp], [0, 0.25, 0.5, 0.75, 1])
+    assert spread[:, COMPARISON_STATS.index("Ammo")].tolist() == [0.0] * 5
+    assert stat_matrix([{"HP": "n/a"}])[0, hp] == 0.0
+    with pytest.raises(ValueError):
+        scales.normalize(stat_matrix(UNITS), "zscore")
+
+
+def test_scales_follow_unit_changes():
+    catalog = UnitCatalog(UNITS)
+    assert catalog.rebuilt(modifiers={}).stat_scales is catalog.stat_scales
+    assert catalog.rebuilt(UNITS[:2]).stat_scales.maximum[COMPARISON_STATS.index("HP")] == 70
+
+
+@pytest.mark.asyncio
+async def test_compare_units_command(tmp_path):
+    cog = UnitStatsComparison(MagicMock(), UnitCatalog(UNITS), ChartCache(str(tmp_path)), ChartRenderer(processes=0))
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    assert parse_unit_list("Unit 1, Unit 2 VS Unit 3") == ["Unit 1", "Unit 2", "Unit 3"]
+    await cog.compare_units_command.callback(cog, ctx, units="bars range Unit 0, Unit 3 vs Unit 4")
+    assert ctx.send.call_args[1]["file"].filename == "units_bars.png"
+    await cog.compare_units_command.callback(cog, ctx, units="Unit 0, Unit 1")
+    assert ctx.send.call_args[1]["file"].filename == "units_radar.png"
+
+    await cog.compare_units_command.callback(cog, ctx, units="radar Unit 0")
+    assert ctx.send.call_args[0][0].startswith("Please list 2 to 6 units")
+    await cog.compare_units_command.callback(cog, ctx, units="Unit 0, Legionaries")
+    assert ctx.send.call_args[0][0].startswith("Unit not found: Legionaries")
@@ -0,0 +1,152 @@
+"""
+Cache of rendered chart PNGs, so a chart is drawn once until the data behind it changes.
+
+Two tiers: an in-memory LRU bounded by the total size of the PNGs it holds, and a directory
+of `<key>.png` files that survives restarts. Keys are digests of everything that decides a
+chart's pixels (chart kind, style and the plotted values), so an entry can never be stale;
+changed data simply produces a new key, and the old file ages out of the disk tier.
+Only the memory tier is touched on the event loop; disk reads, writes and pruning run in
+a worker thread.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+from utils.data_loader import DATA_DIR
+
+CHART_CACHE_DIR = os.path.join(DATA_DIR, 'cache', 'charts')
+MAX_MEMORY_BYTES = 32 * 1024 * 1024
+MAX_DISK_BYTES = 256 * 1024 * 1024
+
+
+def chart_key(*parts: Any) -> str:
+    """Digest of a chart's inputs; parts must be JSON-serializable."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class ChartCache:
+    """Rendered charts by key: a byte-bounded LRU in memory over a byte-bounded directory on disk."""
+
+    def __init__(self, directory: Optional[str] = CHART_CACHE_DIR, max_memory_bytes: int = MAX_MEMORY_BYTES,
+                 max_disk_bytes: int = MAX_DISK_BYTES):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self.memory_bytes = 0
+        # Size of the disk tier, measured on first use; guarded by the lock, as writes run in threads
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """The cached PNG, promoted to memory if it was only on disk; None on a miss."""
+        png = self._memory.get(key)
+        if png is not None:
+            self._memory.move_to_end(key)
+            return png
+        if self.directory is None:
+            return None
+        png = await asyncio.to_thread(self._read, key)
+        if png is not None:
+            self._remember(key, png)
+        return png
+
+    async def put(self, key: str, png: bytes) -> None:
+        self._remember(key, png)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write, key, png)
+
+    def _remember(self, key: str, png: bytes) -> None:
+        if len(png) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous)
+        self._memory[key] = png
+        self.memory_bytes += len(png)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                png = f.read()
+            # Reads refresh the mtime, which orders the disk tier's eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return png
+
+    def _write(self, key: str, png: bytes) -> None:
+        """Store a chart on disk atomically; the cache is best-effort, so failures are only logged."""
+        with self._disk_lock:
+            self._write_locked(key, png)
+
+    def _write_locked(self, key: str, png: bytes) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(png)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._disk_bytes += len(png) - replaced
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+        except OSError:
+            logging.warning(f"Could not cache chart {key} on disk", exc_info=True)
+
+    def _disk_entries(self):
+        """(path, size, mtime) of every cached chart on disk."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime_ns
+
+    def _prune_disk(self) -> None:
+        """Delete the least recently used charts until the disk tier is back under its limit."""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        self._disk_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            self._disk_bytes -= size
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self.memory_bytes = 0
+
+
+_chart_cache: Optional[ChartCache] = None
+
+def get_chart_cache() -> ChartCache:
+    """Return the process-wide chart cache."""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache()
+    return _chart_cache
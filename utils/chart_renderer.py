@@ -0,0 +1,138 @@
+"""
+Chart rendering off the event loop.
+
+matplotlib renders take hundreds of milliseconds and pyplot's global state is not thread
+safe, so the cogs hand chart functions (see `utils.charts`) to a `ChartRenderer`, which runs
+them in a pool of worker processes using the Agg backend and lets the command await the PNG.
+The number of renders queued or running is bounded, every job has a timeout, and concurrent
+requests for the same chart share one render. A render that times out restarts the pool, so
+a hung chart cannot keep a worker and a queue slot forever.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+# Worker processes; 0 renders in a single background thread instead
+CHART_PROCESSES = 2
+# Renders queued or running at once before new requests are turned away
+MAX_PENDING_RENDERS = 8
+# Seconds a command waits for its chart
+RENDER_TIMEOUT = 30.0
+
+
+class ChartRenderError(RuntimeError):
+    """Raised when a chart cannot be rendered: the queue is full, the render timed out or its worker died."""
+
+
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+class ChartRenderer:
+    """A bounded queue of chart renders in front of a process pool, created on first use."""
+
+    def __init__(self, processes: int = CHART_PROCESSES, max_pending: int = MAX_PENDING_RENDERS,
+                 timeout: float = RENDER_TIMEOUT):
+        self.processes = processes
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        # Renders queued or running, with the pool each one runs in
+        self._jobs: Dict[asyncio.Future, Executor] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.processes > 0:
+                # Spawned, not forked: the bot process has threads and a running event loop
+                self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'),
+                                                     initializer=_init_worker)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart-render')
+        return self._executor
+
+    async def render(self, func: Callable[..., bytes], *args: Any, key: Optional[str] = None) -> bytes:
+        """
+        Run `func(*args)` in the pool and return its PNG bytes. A render already in flight
+        under the same `key` is awaited instead of started again. Raises ChartRenderError when
+        the queue is full, the render takes longer than the timeout or its worker dies. A
+        timeout restarts the pool, which also fails the other renders running in it.
+        """
+        future = self._in_flight.get(key) if key is not None else None
+        if future is None:
+            if self.pending >= self.max_pending:
+                raise ChartRenderError("Too many charts are being drawn right now; please try again in a moment.")
+            executor = self._pool()
+            future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+            self._jobs[future] = executor
+            future.add_done_callback(self._job_done)
+            if key is not None:
+                self._in_flight[key] = future
+                future.add_done_callback(lambda done: self._forget(key, done))
+        try:
+            # Shielded, so a caller giving up does not cancel a render others are waiting for
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            executor = self._jobs.get(future)
+            if executor is not None:
+                logging.error(f"Chart render took longer than {self.timeout:.0f}s; restarting the pool")
+                self._restart(executor)
+            raise ChartRenderError(f"The chart took longer than {self.timeout:.0f}s to draw.") from None
+        except BrokenProcessPool:
+            raise ChartRenderError("The chart could not be drawn; please try again.") from None
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    def _job_done(self, future: asyncio.Future) -> None:
+        executor = self._jobs.pop(future, None)
+        error = None if future.cancelled() else future.exception()
+        if isinstance(error, BrokenProcessPool):
+            if executor is not None:
+                # A worker died; start a fresh pool for the next render
+                logging.error("Chart worker process died; restarting the pool")
+                self._restart(executor)
+        elif error is not None:
+            logging.error("Chart rendering failed", exc_info=error)
+
+    def _restart(self, executor: Executor) -> None:
+        """
+        Retire a pool: its renders give up their queue slots and its worker processes are
+        killed; the next render starts a fresh pool. A worker thread cannot be killed, so a
+        thread pool's render finishes in the background.
+        """
+        retired = {future for future, job_executor in self._jobs.items() if job_executor is executor}
+        for future in retired:
+            del self._jobs[future]
+        for key, future in list(self._in_flight.items()):
+            if future in retired:
+                del self._in_flight[key]
+        if executor is self._executor:
+            self._executor = None
+        # No public API stops a busy worker; terminating it fails its futures with BrokenProcessPool
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._restart(self._executor)
+
+
+_chart_renderer: Optional[ChartRenderer] = None
+
+def get_chart_renderer() -> ChartRenderer:
+    """Return the process-wide chart renderer."""
+    global _chart_renderer
+    if _chart_renderer is None:
+        _chart_renderer = ChartRenderer()
+    return _chart_renderer
@@ -0,0 +1,233 @@
+"""
+Chart drawing for the cogs, as plain functions from data to PNG bytes.
+
+Everything is drawn on `matplotlib.figure.Figure` objects rather than through pyplot, so no
+global figure registry is involved. The functions are picklable by reference, which lets
+`utils.chart_renderer` run them in worker processes; styles are applied as rcParams
+contexts, so a process should only draw one chart at a time.
+"""
+import threading
+from io import BytesIO
+from typing import Any, Dict, List, Sequence
+import matplotlib.style
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.ticker import PercentFormatter
+from utils.stat_scales import COMPARISON_STATS
+
+COMPARISON_STYLE = 'ggplot'
+# One colour per unit of a multi-unit comparison
+UNIT_COLORS = ['#2ecc71', '#3498db', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c']
+SCALE_LABELS = {'percentile': 'Percentile among all units', 'range': 'Share of the dataset range'}
+
+
+def _png(fig: Figure, **savefig_options: Any) -> bytes:
+    buf = BytesIO()
+    fig.savefig(buf, format='png', facecolor='white', bbox_inches='tight', pad_inches=0.3, **savefig_options)
+    return buf.getvalue()
+
+
+def add_value_labels(bars, ax: Axes) -> None:
+    """Add value labels on top of the bars."""
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2, height, f'{int(height)}',
+                ha='center', va='bottom', fontsize=10, fontweight='bold', color='#444444')
+
+
+def setup_comparison_axes(ax: Axes, unit1: Dict[str, Any], unit2: Dict[str, Any], stats: List[str],
+                          index: np.ndarray, bar_width: float) -> None:
+    """Setup the axes for the comparison plot."""
+    ax.set_xlabel('Unit Statistics', fontsize=12, fontweight='bold', labelpad=15)
+    ax.set_ylabel('Values', fontsize=12, fontweight='bold', labelpad=15)
+    ax.set_title(f"{unit1['Unit']} vs {unit2['Unit']}\n"
+                 f"[{unit1['Faction']} vs {unit2['Faction']}]", fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(index + bar_width / 2)
+    ax.set_xticklabels(stats, fontsize=10, rotation=45, ha='right')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.set_facecolor('white')
+
+    custom_legend_labels = [f"{unit1['Unit']} (Green)", f"{unit2['Unit']} (Blue)"]
+    ax.legend(custom_legend_labels, loc='upper right', fontsize=12, frameon=False)
+
+
+def draw_unit_comparison(unit1: Dict[str, Any], unit2: Dict[str, Any]) -> bytes:
+    """Bar chart of two units' damage and defence stats side by side, drawn from scratch."""
+    with matplotlib.style.context(COMPARISON_STYLE):
+        fig = Figure(figsize=(20, 8), dpi=100)
+        ax = fig.subplots()
+
+        unit1_stats = [unit1.get(stat, 0) for stat in COMPARISON_STATS]
+        unit2_stats = [unit2.get(stat, 0) for stat in COMPARISON_STATS]
+
+        color1, color2 = '#2ecc71', '#3498db'
+        bar_width = 0.35
+        index = np.arange(len(COMPARISON_STATS))
+
+        bars1 = ax.bar(index, unit1_stats, bar_width, color=color1, alpha=0.8)
+        bars2 = ax.bar(index + bar_width, unit2_stats, bar_width, color=color2, alpha=0.8)
+
+        add_value_labels(bars1, ax)
+        add_value_labels(bars2, ax)
+
+        setup_comparison_axes(ax, unit1, unit2, COMPARISON_STATS, index, bar_width)
+        return _png(fig, edgecolor='none')
+
+
+def draw_rating_history(team_name: str, dates: Sequence, ratings: Sequence[float]) -> bytes:
+    """A team's rating progression as PNG bytes, drawn from scratch."""
+    fig = Figure(figsize=(10, 5), dpi=100)
+    ax = fig.subplots()
+    ax.plot(dates, ratings, color='#3498db', linewidth=2, marker='o' if len(dates) <= 40 else None, markersize=4)
+    ax.axhline(1000, color='#95a5a6', linestyle='--', linewidth=1)
+    ax.set_title(f"{team_name} - Elo Rating History", fontsize=14, fontweight='bold')
+    ax.set_ylabel('Elo Rating', fontsize=12, fontweight='bold')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, alpha=0.3)
+    fig.autofmt_xdate()
+    return _png(fig)
+
+
+def _multi_unit_title(units: List[Dict[str, Any]]) -> str:
+    return " vs ".join(unit['Unit'] for unit in units)
+
+
+def render_unit_radar(units: List[Dict[str, Any]], normalized: np.ndarray, scale: str) -> bytes:
+    """Radar chart of up to six units, one spoke per stat, each stat normalized to 0-1."""
+    with matplotlib.style.context(COMPARISON_STYLE):
+        fig = Figure(figsize=(10, 10), dpi=100)
+        ax = fig.add_subplot(projection='polar')
+        angles = np.linspace(0, 2 * np.pi, len(COMPARISON_STATS), endpoint=False)
+        closed_angles = np.append(angles, angles[0])
+        for unit, values, color in zip(units, normalized, UNIT_COLORS):
+            closed = np.append(values, values[0])
+            ax.plot(closed_angles, closed, color=color, linewidth=2, label=f"{unit['Unit']} ({unit['Faction']})")
+            ax.fill(closed_angles, closed, color=color, alpha=0.12)
+        ax.set_xticks(angles)
+        ax.set_xticklabels(COMPARISON_STATS, fontsize=10)
+        ax.set_ylim(0, 1)
+        ax.set_yticks([0.25, 0.5, 0.75, 1.0])
+        ax.set_yticklabels(['25%', '50%', '75%', '100%'], fontsize=8, color='#666666')
+        ax.set_title(f"{_multi_unit_title(units)}\n[{SCALE_LABELS[scale]}]", fontsize=14, fontweight='bold', pad=30)
+        ax.legend(loc='upper right', bbox_to_anchor=(1.25, 1.1), fontsize=10, frameon=False)
+        return _png(fig, edgecolor='none')
+
+
+def render_unit_bars(units: List[Dict[str, Any]], normalized: np.ndarray, raw: np.ndarray, scale: str) -> bytes:
+    """Grouped bars of up to six units on a normalized 0-1 axis, labelled with the raw values."""
+    with matplotlib.style.context(COMPARISON_STYLE):
+        fig = Figure(figsize=(20, 8), dpi=100)
+        ax = fig.subplots()
+        index = np.arange(len(COMPARISON_STATS))
+        bar_width = 0.8 / len(units)
+        for position, (unit, values, raw_values, color) in enumerate(zip(units, normalized, raw, UNIT_COLORS)):
+            bars = ax.bar(index + position * bar_width, values, bar_width, color=color, alpha=0.8,
+                          label=f"{unit['Unit']} ({unit['Faction']})")
+            for bar, value in zip(bars, raw_values):
+                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'{value:g}',
+                        ha='center', va='bottom', fontsize=8, color='#444444')
+        ax.set_ylabel(SCALE_LABELS[scale], fontsize=12, fontweight='bold', labelpad=15)
+        ax.set_ylim(0, 1.1)
+        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+        ax.set_title(_multi_unit_title(units), fontsize=14, fontweight='bold', pad=20)
+        ax.set_xticks(index + bar_width * (len(units) - 1) / 2)
+        ax.set_xticklabels(COMPARISON_STATS, fontsize=10, rotation=45, ha='right')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.set_facecolor('white')
+        ax.legend(loc='upper right', fontsize=11, frameon=False)
+        return _png(fig, edgecolor='none')
+
+
+class ComparisonTemplate:
+    """
+    A warm unit comparison figure. The figure, style, axes, tick labels, bars, value labels
+    and legend are built once; a render only moves the bars, value labels, title, legend
+    text and y-limits before rasterizing.
+    """
+
+    bar_width = 0.35
+
+    def __init__(self):
+        with matplotlib.style.context(COMPARISON_STYLE):
+            self.figure = Figure(figsize=(20, 8), dpi=100)
+            self.ax = ax = self.figure.subplots()
+            index = np.arange(len(COMPARISON_STATS))
+            zeros = np.zeros(len(COMPARISON_STATS))
+            self.bars = [ax.bar(index, zeros, self.bar_width, color='#2ecc71', alpha=0.8),
+                         ax.bar(index + self.bar_width, zeros, self.bar_width, color='#3498db', alpha=0.8)]
+            for bars in self.bars:
+                add_value_labels(bars, ax)
+            self.labels = [ax.texts[:len(COMPARISON_STATS)], ax.texts[len(COMPARISON_STATS):]]
+            placeholder = {'Unit': '', 'Faction': ''}
+            setup_comparison_axes(ax, placeholder, placeholder, COMPARISON_STATS, index, self.bar_width)
+            self.legend_texts = ax.get_legend().get_texts()
+
+    def render(self, unit1: Dict[str, Any], unit2: Dict[str, Any]) -> bytes:
+        with matplotlib.style.context(COMPARISON_STYLE):
+            for bars, labels, unit in zip(self.bars, self.labels, (unit1, unit2)):
+                for bar, label, stat in zip(bars, labels, COMPARISON_STATS):
+                    height = unit.get(stat, 0)
+                    bar.set_height(height)
+                    label.set_y(height)
+                    label.set_text(f'{int(height)}')
+            self.ax.set_title(f"{unit1['Unit']} vs {unit2['Unit']}\n"
+                              f"[{unit1['Faction']} vs {unit2['Faction']}]", fontsize=14, fontweight='bold', pad=20)
+            for text, color, unit in zip(self.legend_texts, ('Green', 'Blue'), (unit1, unit2)):
+                text.set_text(f"{unit['Unit']} ({color})")
+            self.ax.relim()
+            self.ax.autoscale_view()
+            return _png(self.figure, edgecolor='none')
+
+
+class RatingHistoryTemplate:
+    """A warm rating history figure; a render swaps the line's data, markers and title."""
+
+    def __init__(self, dates: Sequence, ratings: Sequence[float]):
+        # Built from the first team's data, so the x axis picks up the date converter
+        self.figure = Figure(figsize=(10, 5), dpi=100)
+        self.ax = ax = self.figure.subplots()
+        self.line, = ax.plot(dates, ratings, color='#3498db', linewidth=2, markersize=4)
+        ax.axhline(1000, color='#95a5a6', linestyle='--', linewidth=1)
+        ax.set_ylabel('Elo Rating', fontsize=12, fontweight='bold')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.grid(True, alpha=0.3)
+        self.figure.autofmt_xdate()
+
+    def render(self, team_name: str, dates: Sequence, ratings: Sequence[float]) -> bytes:
+        self.line.set_data(dates, ratings)
+        self.line.set_marker('o' if len(dates) <= 40 else 'None')
+        self.ax.set_title(f"{team_name} - Elo Rating History", fontsize=14, fontweight='bold')
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return _png(self.figure)
+
+
+# Templates of this process, built on first use; renders are serialized, as they mutate them
+_templates: Dict[str, Any] = {}
+_template_lock = threading.Lock()
+
+
+def render_unit_comparison(unit1: Dict[str, Any], unit2: Dict[str, Any]) -> bytes:
+    """Bar chart of two units' damage and defence stats side by side, as PNG bytes."""
+    with _template_lock:
+        template = _templates.get('comparison')
+        if template is None:
+            template = _templates['comparison'] = ComparisonTemplate()
+        return template.render(unit1, unit2)
+
+
+def render_rating_history(team_name: str, dates: Sequence, ratings: Sequence[float]) -> bytes:
+    """A team's rating progression as PNG bytes."""
+    if len(dates) < 2:
+        # A single point has no range to autoscale to; matplotlib pads it only in a fresh axes
+        return draw_rating_history(team_name, dates, ratings)
+    with _template_lock:
+        template = _templates.get('history')
+        if template is None:
+            template = _templates['history'] = RatingHistoryTemplate(dates, ratings)
+        return template.render(team_name, dates, ratings)
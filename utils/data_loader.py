@@ -1,23 +1,43 @@
 import json
+import logging
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from utils.name_index import NameIndex
+from utils.stat_scales import StatScales
+from utils.faction_scoring import FactionScoringEngine
+from utils.data_watcher import DataWatcher
+from utils.dataset_snapshot import load_snapshot_units, load_snapshot_blob
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+UNITS_PATH = os.path.join(DATA_DIR, 'units_stats.json')
+MODIFIERS_PATH = os.path.join(DATA_DIR, 'faction_modifiers.json')
+PLAYER_STATS_PATH = os.path.join(DATA_DIR, 'player_stats_historical.json')
+ELO_PATH = os.path.join(DATA_DIR, 'elo_rating.json')
+
+def load_json_file(file_path: str) -> Any:
+    """Load any JSON file."""
+    with open(file_path, 'r') as f:
+        return json.load(f)
 
 def load_unit_data() -> List[Dict[str, Any]]:
-    """Load unit data from a JSON file."""
-    json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'units_stats.json')
-    with open(json_path, 'r') as f:
+    """Load unit data from the compiled snapshot, or from the JSON file if it is stale."""
+    units = load_snapshot_units(DATA_DIR)
+    if units is not None:
+        return units
+    with open(UNITS_PATH, 'r') as f:
         return json.load(f)
-    
+
 def load_player_data() -> List[Dict[str, Any]]:
-    json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'player_stats_historical.json')
-    with open(json_path, 'r') as f:
+    players = load_snapshot_blob(DATA_DIR, 'players')
+    if players is not None:
+        return players
+    with open(PLAYER_STATS_PATH, 'r') as f:
         return json.load(f)
 
 def load_elo_data() -> List[Dict[str, Any]]:
-    json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'elo_rating.json')
-    with open(json_path, 'r') as f:
+    with open(ELO_PATH, 'r') as f:
         return json.load(f)
-    
+
 def load_factions_from_data(file_path: str):
     """Extracts unique faction names from units_stats.json."""
     with open(file_path, 'r') as f:
@@ -27,4 +47,103 @@ def load_factions_from_data(file_path: str):
 def load_faction_modifiers(file_path: str) -> Dict[str, Dict[str, float]]:
     """Load faction modifiers data from a JSON file."""
     with open(file_path, 'r') as f:
-        return json.load(f)
\ No newline at end of file
+        return json.load(f)
+
+
+class UnitCatalog:
+    """
+    Parsed unit data, grouped by faction and indexed by name, shared by every cog.
+    Derived tables such as the faction stats are computed once per data version.
+    """
+
+    def __init__(self, units: List[Dict[str, Any]], modifiers: Optional[Dict[str, Dict[str, float]]] = None,
+                 version: int = 1):
+        self.units = units
+        self.modifiers = modifiers or {}
+        self.version = version
+        self.factions: Dict[str, List[Dict[str, Any]]] = {}
+        for unit in units:
+            self.factions.setdefault(unit["Faction"], []).append(unit)
+        # Unit names repeat across factions; the first entry wins, as with a linear scan.
+        self.unit_index = NameIndex((unit["Unit"], unit) for unit in units)
+        self.stat_scales = StatScales(units)
+        self.faction_stats: Dict[str, Dict[str, float]] = \
+            FactionScoringEngine.from_factions(self.factions).score_all(self.modifiers)
+
+    def rebuilt(self, units: Optional[List[Dict[str, Any]]] = None,
+                modifiers: Optional[Dict[str, Dict[str, float]]] = None) -> "UnitCatalog":
+        """
+        Return the next version of this catalog for changed units and/or modifiers.
+        Only the factions whose units or modifiers differ are re-scored; the name index and
+        stat scales are rebuilt only when the units changed. The current catalog is left untouched.
+        """
+        catalog = UnitCatalog.__new__(UnitCatalog)
+        catalog.version = self.version + 1
+        catalog.modifiers = self.modifiers if modifiers is None else modifiers
+
+        if units is None:
+            catalog.units, catalog.factions, catalog.unit_index = self.units, self.factions, self.unit_index
+            catalog.stat_scales = self.stat_scales
+            changed = set()
+        else:
+            catalog.units = units
+            catalog.factions = {}
+            for unit in units:
+                catalog.factions.setdefault(unit["Faction"], []).append(unit)
+            catalog.unit_index = NameIndex((unit["Unit"], unit) for unit in units)
+            catalog.stat_scales = StatScales(units)
+            changed = {faction for faction, faction_units in catalog.factions.items()
+                       if self.factions.get(faction) != faction_units}
+
+        changed |= {faction for faction in catalog.factions
+                    if catalog.modifiers.get(faction) != self.modifiers.get(faction)}
+        rescored = FactionScoringEngine.from_factions(
+            {faction: catalog.factions[faction] for faction in changed}).score_all(catalog.modifiers)
+        catalog.faction_stats = {faction: rescored.get(faction, self.faction_stats.get(faction))
+                                 for faction in catalog.factions}
+        logging.info(f"Unit catalog v{catalog.version}: re-scored {len(changed)} faction(s)")
+        return catalog
+
+    def swap_in(self, other: "UnitCatalog") -> None:
+        """Adopt another catalog's data in place, so every cog holding this object sees it at once."""
+        self.units, self.modifiers, self.factions = other.units, other.modifiers, other.factions
+        self.unit_index, self.faction_stats = other.unit_index, other.faction_stats
+        self.stat_scales = other.stat_scales
+        self.version = other.version
+
+    def get_unit(self, unit_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a unit by case-insensitive name."""
+        return self.unit_index.get(unit_name)
+
+    def find_unit(self, unit_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a unit by name, falling back to the closest unambiguous fuzzy match."""
+        return self.unit_index.resolve(unit_name)
+
+    def suggest_units(self, unit_name: str, limit: int = 3) -> List[str]:
+        """Return the unit names closest to a misspelt name."""
+        return [name for name, _ in self.unit_index.suggest(unit_name, limit=limit)]
+
+    def faction_names(self) -> List[str]:
+        return list(self.factions)
+
+
+_unit_catalog: Optional[UnitCatalog] = None
+
+def load_unit_catalog() -> UnitCatalog:
+    """Parse units_stats.json and faction_modifiers.json into a new catalog."""
+    modifiers = load_snapshot_blob(DATA_DIR, 'modifiers')
+    if modifiers is None:
+        modifiers = load_faction_modifiers(MODIFIERS_PATH)
+    return UnitCatalog(load_unit_data(), modifiers)
+
+def watch_unit_catalog(catalog: UnitCatalog, watcher: DataWatcher) -> None:
+    """Hot-reload the catalog when units_stats.json or faction_modifiers.json changes."""
+    watcher.watch(UNITS_PATH, lambda path: catalog.rebuilt(units=load_json_file(path)), catalog.swap_in)
+    watcher.watch(MODIFIERS_PATH, lambda path: catalog.rebuilt(modifiers=load_json_file(path)), catalog.swap_in)
+
+def get_unit_catalog() -> UnitCatalog:
+    """Return the process-wide unit catalog, parsing the data on first use."""
+    global _unit_catalog
+    if _unit_catalog is None:
+        _unit_catalog = load_unit_catalog()
+    return _unit_catalog
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _Watch:
+    def __init__(self, load: Callable[[str], Any], apply: Callable[[Any], None], mtime: Optional[int]):
+        self.load = load
+        self.apply = apply
+        self.mtime = mtime
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class DataWatcher:
+    """
+    Polls data files for modification-time changes and reloads only the files that changed.
+    For each changed file, `load(path)` runs in a worker thread to parse it and build the
+    derived tables, then `apply(result)` swaps the result in on the event loop.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._watches: Dict[str, List[_Watch]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def watch(self, path: str, load: Callable[[str], Any], apply: Callable[[Any], None]) -> None:
+        """Reload `path` through `load` and `apply` whenever its mtime changes."""
+        self._watches.setdefault(path, []).append(_Watch(load, apply, _mtime(path)))
+
+    def acknowledge(self, path: str) -> None:
+        """Mark the current version of a file as seen, e.g. after the bot wrote it itself."""
+        for watch in self._watches.get(path, ()):
+            watch.mtime = _mtime(path)
+
+    async def check(self) -> List[str]:
+        """Reload every watched file whose mtime changed; returns the reloaded paths."""
+        reloaded = []
+        for path, watches in self._watches.items():
+            mtime = _mtime(path)
+            for watch in watches:
+                if mtime is None or mtime == watch.mtime:
+                    continue
+                try:
+                    result = await asyncio.to_thread(watch.load, path)
+                except Exception as e:
+                    # Most likely caught mid-write; keep the old data and retry on the next poll
+                    logging.warning(f"Failed to reload {path}: {e}")
+                    continue
+                if _mtime(path) != mtime:
+                    # Rewritten while we were parsing it; pick up the newer version on the next poll
+                    continue
+                if watch.mtime == mtime:
+                    # Acknowledged while we were parsing it: the bot wrote this version itself
+                    continue
+                watch.apply(result)
+                watch.mtime = mtime
+                if path not in reloaded:
+                    reloaded.append(path)
+                    logging.info(f"Reloaded {os.path.basename(path)}")
+        return reloaded
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logging.error("Data watcher poll failed", exc_info=True)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
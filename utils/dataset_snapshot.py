@@ -0,0 +1,227 @@
+"""
+Compiled binary snapshot of the data/*.json files, for a fast cold start.
+
+Build it with `python -m utils.dataset_snapshot`. Units are written as a NumPy structured
+array (strings interned into a shared pool, nested dicts flattened into columns) that is
+decoded column by column on load; the smaller player and modifier files are stored as
+pickle blobs. A manifest records the size, mtime and SHA-256 of every source file, and an
+artifact whose source changed since it was built is ignored so callers fall back to JSON.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+FORMAT_VERSION = 1
+SNAPSHOT_DIR_NAME = 'compiled'
+MANIFEST_NAME = 'manifest.json'
+UNITS_SOURCE = 'units_stats.json'
+UNITS_ARRAY_NAME = 'units.npy'
+UNITS_META_NAME = 'units_meta.pickle'
+# Source files stored as pickle blobs, keyed by the blob name. elo_rating.json is left out:
+# the Elo store reads it together with its journal and rewrites it on every compaction.
+BLOB_SOURCES = {
+    'players': 'player_stats_historical.json',
+    'modifiers': 'faction_modifiers.json',
+}
+
+
+class SnapshotError(ValueError):
+    """Raised when the source data cannot be compiled into a snapshot."""
+
+
+def _write_file(path: str, write, mode: str = 'wb') -> None:
+    """Write a snapshot file through a temporary file, so it is never seen half-written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, mode) as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _fingerprint(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+
+def _unit_columns(units: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, str, Optional[str]]], np.dtype]:
+    """
+    Work out the column layout from the first unit and validate every unit against it.
+    Returns (key, kind, nested key) triples, kind being 'str', 'int', 'float' or 'nested',
+    and the structured dtype of the array.
+    """
+    if not units:
+        raise SnapshotError("units_stats.json contains no units")
+    layout = []
+    for key, value in units[0].items():
+        if isinstance(value, str):
+            layout.append((key, 'str', None))
+        elif isinstance(value, dict):
+            if len(value) != 1:
+                raise SnapshotError(f"Nested field '{key}' must have exactly one key")
+            layout.append((key, 'nested', next(iter(value))))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            is_float = any(isinstance(unit.get(key), float) for unit in units)
+            layout.append((key, 'float' if is_float else 'int', None))
+        else:
+            raise SnapshotError(f"Unsupported value for '{key}': {value!r}")
+
+    keys = [key for key, _, _ in layout]
+    for position, unit in enumerate(units):
+        if list(unit) != keys:
+            raise SnapshotError(f"Unit #{position} ({unit.get('Unit')}) does not have the same fields as the first unit")
+        for key, kind, nested_key in layout:
+            value = unit[key]
+            valid = (isinstance(value, str) if kind == 'str' else
+                     isinstance(value, dict) and list(value) == [nested_key] and isinstance(value[nested_key], int)
+                     if kind == 'nested' else
+                     isinstance(value, (int, float)) and not isinstance(value, bool))
+            if not valid:
+                raise SnapshotError(f"Unit #{position} ({unit.get('Unit')}) has an invalid '{key}': {value!r}")
+
+    dtype = np.dtype([(key, {'str': '<u4', 'int': '<i8', 'float': '<f8', 'nested': '<i8'}[kind])
+                      for key, kind, _ in layout])
+    return layout, dtype
+
+
+def compile_snapshot(data_dir: str, snapshot_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Validate the JSON data files and write the binary snapshot; returns the manifest."""
+    snapshot_dir = snapshot_dir or os.path.join(data_dir, SNAPSHOT_DIR_NAME)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    # Drop the old manifest first: until the new one is written, no artifact counts as valid,
+    # so a crash mid-rebuild can never leave a mix of old and new files behind a manifest
+    try:
+        os.remove(os.path.join(snapshot_dir, MANIFEST_NAME))
+    except FileNotFoundError:
+        pass
+    sources = {}
+
+    units_path = os.path.join(data_dir, UNITS_SOURCE)
+    with open(units_path, 'r') as f:
+        units = json.load(f)
+    layout, dtype = _unit_columns(units)
+    pool: Dict[str, int] = {}
+    records = np.empty(len(units), dtype=dtype)
+    for key, kind, nested_key in layout:
+        if kind == 'str':
+            records[key] = [pool.setdefault(unit[key], len(pool)) for unit in units]
+        elif kind == 'nested':
+            records[key] = [unit[key][nested_key] for unit in units]
+        else:
+            records[key] = [unit[key] for unit in units]
+    _write_file(os.path.join(snapshot_dir, UNITS_ARRAY_NAME), lambda f: np.save(f, records))
+    meta = {"layout": layout, "strings": list(pool)}
+    _write_file(os.path.join(snapshot_dir, UNITS_META_NAME),
+                lambda f: pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL))
+    sources[UNITS_SOURCE] = _fingerprint(units_path)
+
+    for blob_name, source in BLOB_SOURCES.items():
+        source_path = os.path.join(data_dir, source)
+        with open(source_path, 'r') as f:
+            data = json.load(f)
+        _write_file(os.path.join(snapshot_dir, f"{blob_name}.pickle"),
+                    lambda f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL))
+        sources[source] = _fingerprint(source_path)
+
+    manifest = {"format_version": FORMAT_VERSION, "sources": sources}
+    # The manifest goes last, so a half-written snapshot is never considered valid
+    _write_file(os.path.join(snapshot_dir, MANIFEST_NAME), lambda f: json.dump(manifest, f, indent=4), 'w')
+    return manifest
+
+
+def _is_fresh(data_dir: str, snapshot_dir: str, source: str) -> bool:
+    """Check one source file against the manifest, hashing it only when size or mtime moved."""
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST_NAME), 'r') as f:
+            manifest = json.load(f)
+        recorded = manifest["sources"][source]
+        if manifest.get("format_version") != FORMAT_VERSION:
+            return False
+        stat = os.stat(os.path.join(data_dir, source))
+    except (OSError, KeyError, ValueError):
+        return False
+    if stat.st_size != recorded["size"]:
+        return False
+    if stat.st_mtime_ns == recorded["mtime_ns"]:
+        return True
+    return _fingerprint(os.path.join(data_dir, source))["sha256"] == recorded["sha256"]
+
+
+def load_snapshot_units(data_dir: str, snapshot_dir: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """Load the units from a fresh snapshot, or return None if there is no usable one."""
+    snapshot_dir = snapshot_dir or os.path.join(data_dir, SNAPSHOT_DIR_NAME)
+    if not _is_fresh(data_dir, snapshot_dir, UNITS_SOURCE):
+        return None
+    try:
+        records = np.load(os.path.join(snapshot_dir, UNITS_ARRAY_NAME))
+        with open(os.path.join(snapshot_dir, UNITS_META_NAME), 'rb') as f:
+            meta = pickle.load(f)
+        layout, strings = meta["layout"], meta["strings"]
+        if list(records.dtype.names) != [key for key, _, _ in layout]:
+            raise SnapshotError("unit columns do not match the snapshot metadata")
+
+        keys, columns = [], []
+        for key, kind, nested_key in layout:
+            column = records[key].tolist()
+            if kind == 'str':
+                column = [strings[code] for code in column]
+            elif kind == 'nested':
+                column = [{nested_key: value} for value in column]
+            keys.append(key)
+            columns.append(column)
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+    except (OSError, KeyError, IndexError, ValueError, pickle.UnpicklingError) as e:
+        logging.warning(f"Ignoring unreadable unit snapshot: {e}")
+        return None
+
+
+def load_snapshot_blob(data_dir: str, blob_name: str, snapshot_dir: Optional[str] = None) -> Optional[Any]:
+    """Load a pickled data file from a fresh snapshot, or return None if there is no usable one."""
+    snapshot_dir = snapshot_dir or os.path.join(data_dir, SNAPSHOT_DIR_NAME)
+    if not _is_fresh(data_dir, snapshot_dir, BLOB_SOURCES[blob_name]):
+        return None
+    try:
+        with open(os.path.join(snapshot_dir, f"{blob_name}.pickle"), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        logging.warning(f"Ignoring unreadable {blob_name} snapshot: {e}")
+        return None
+
+
+def _time_loads(data_dir: str, repeat: int = 20) -> None:
+    """Print JSON versus snapshot load times for each source file."""
+    def best_of(load):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    def load_json(source):
+        with open(os.path.join(data_dir, source), 'r') as f:
+            return json.load(f)
+
+    print(f"{'file':<32}{'json ms':>10}{'snapshot ms':>14}")
+    print(f"{UNITS_SOURCE:<32}{best_of(lambda: load_json(UNITS_SOURCE)):>10.2f}"
+          f"{best_of(lambda: load_snapshot_units(data_dir)):>14.2f}")
+    for blob_name, source in BLOB_SOURCES.items():
+        print(f"{source:<32}{best_of(lambda: load_json(source)):>10.2f}"
+              f"{best_of(lambda: load_snapshot_blob(data_dir, blob_name)):>14.2f}")
+
+
+if __name__ == '__main__':
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    try:
+        manifest = compile_snapshot(data_dir)
+    except (OSError, ValueError) as e:
+        print(f"Could not compile the data snapshot: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Compiled {len(manifest['sources'])} data files into {os.path.join(data_dir, SNAPSHOT_DIR_NAME)}")
+    _time_loads(data_dir)
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from utils.elo_store import DEFAULT_K_FACTOR, DEFAULT_RATING
+from utils.name_index import normalize_name
+
+# Below this many matches per conflict-free batch, a plain Python loop beats NumPy's per-call overhead
+MIN_BATCH_WIDTH = 4
+
+
+def _schedule(winners: np.ndarray, losers: np.ndarray, team_count: int) -> np.ndarray:
+    """
+    Assign every match to a batch such that no team plays twice in one batch and each
+    team's matches keep their order. A match only depends on its two teams' previous
+    ratings, so processing the batches in order gives exactly the sequential result.
+    """
+    last = [0] * team_count
+    batches = np.empty(len(winners), dtype=np.int64)
+    for position, (winner, loser) in enumerate(zip(winners.tolist(), losers.tolist())):
+        batch = max(last[winner], last[loser]) + 1
+        last[winner] = last[loser] = batch
+        batches[position] = batch
+    return batches
+
+
+def replay_ratings(
+    matches: Sequence[Dict[str, Any]],
+    k_factors: Union[float, Sequence[float]] = DEFAULT_K_FACTOR,
+    playoff_multiplier: Optional[float] = None,
+    exclude: Iterable[int] = (),
+    initial_rating: float = DEFAULT_RATING,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Recompute every team's Elo rating from scratch by replaying a chronological match log.
+
+    `k_factors` may hold several values to run what-if scenarios side by side,
+    `playoff_multiplier` overrides the multiplier of every playoff match (any match logged
+    with a multiplier above 1), and `exclude` lists 0-based match positions to skip.
+    Returns the team names and a (scenarios, teams) rating array.
+    """
+    k_values = np.atleast_1d(np.asarray(k_factors, dtype=np.float64))
+    excluded = set(exclude)
+
+    team_codes: Dict[str, int] = {}
+    team_names: List[str] = []
+    def code(name: str) -> int:
+        key = normalize_name(name)
+        if key not in team_codes:
+            team_codes[key] = len(team_names)
+            team_names.append(name)
+        return team_codes[key]
+
+    kept = [match for position, match in enumerate(matches) if position not in excluded]
+    winners = np.fromiter((code(match["Winner"]) for match in kept), dtype=np.intp, count=len(kept))
+    losers = np.fromiter((code(match["Loser"]) for match in kept), dtype=np.intp, count=len(kept))
+    multipliers = np.fromiter((match.get("Multiplier", 1.0) for match in kept), dtype=np.float64, count=len(kept))
+    if playoff_multiplier is not None:
+        multipliers = np.where(multipliers > 1.0, playoff_multiplier, multipliers)
+
+    ratings = np.full((len(k_values), len(team_names)), initial_rating, dtype=np.float64)
+    if not kept:
+        return team_names, ratings
+
+    batches = _schedule(winners, losers, len(team_names))
+    batch_count = int(batches.max())
+    if len(kept) / batch_count < MIN_BATCH_WIDTH:
+        _replay_sequential(ratings, k_values, winners, losers, multipliers)
+        return team_names, ratings
+
+    order = np.argsort(batches, kind="stable")
+    bounds = np.searchsorted(batches[order], np.arange(1, batch_count + 2))
+    adjustments = k_values[:, np.newaxis] * multipliers[np.newaxis, :]
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        batch = order[start:end]
+        batch_winners, batch_losers = winners[batch], losers[batch]
+        winner_ratings = ratings[:, batch_winners]
+        loser_ratings = ratings[:, batch_losers]
+        expected_winner = 1 / (1 + 10 ** ((loser_ratings - winner_ratings) / 400))
+        expected_loser = 1 / (1 + 10 ** ((winner_ratings - loser_ratings) / 400))
+        ratings[:, batch_winners] = winner_ratings + adjustments[:, batch] * (1 - expected_winner)
+        ratings[:, batch_losers] = loser_ratings - adjustments[:, batch] * expected_loser
+    return team_names, ratings
+
+
+def _replay_sequential(ratings: np.ndarray, k_values: np.ndarray, winners: np.ndarray,
+                       losers: np.ndarray, multipliers: np.ndarray) -> None:
+    """Scalar replay for match logs where hardly any matches can be batched."""
+    winner_list, loser_list, multiplier_list = winners.tolist(), losers.tolist(), multipliers.tolist()
+    for scenario, k_factor in enumerate(k_values.tolist()):
+        row = ratings[scenario].tolist()
+        for winner, loser, multiplier in zip(winner_list, loser_list, multiplier_list):
+            winner_rating, loser_rating = row[winner], row[loser]
+            adjustment = k_factor * multiplier
+            row[winner] = winner_rating + adjustment * (1 - 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400)))
+            row[loser] = loser_rating - adjustment * (1 / (1 + 10 ** ((winner_rating - loser_rating) / 400)))
+        ratings[scenario] = row
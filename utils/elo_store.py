@@ -0,0 +1,335 @@
+import json
+import logging
+import os
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.data_loader import ELO_PATH
+from utils.name_index import normalize_name
+from utils.head_to_head import HeadToHeadIndex
+from utils.rating_history import RatingHistory
+from utils.team_registry import TeamRegistry
+
+DEFAULT_RATING = 1000.0
+DEFAULT_K_FACTOR = 32
+PLAYOFF_MULTIPLIER = 1.5
+
+
+def expected_score(team_rating: float, opponent_rating: float) -> float:
+    """Expected score of a team against an opponent under the Elo model."""
+    return 1 / (1 + 10 ** ((opponent_rating - team_rating) / 400))
+
+
+def elo_deltas(winner_rating: float, loser_rating: float, k_factor: float = DEFAULT_K_FACTOR,
+               multiplier: float = 1.0) -> Tuple[float, float]:
+    """Rating changes of the winner and the loser of one match."""
+    adjustment = k_factor * multiplier
+    return (adjustment * (1 - expected_score(winner_rating, loser_rating)),
+            adjustment * (0 - expected_score(loser_rating, winner_rating)))
+
+
+def derive_match_log(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rebuild a chronological match log from the per-team "Matches" lists.
+    Each match is stored once per team there, with no ordering key, and a few results were
+    only recorded on one side; a result counts as many times as the side that recorded it
+    most. Matches are sorted by date, keeping file order within a date. Historical entries
+    carry no match type, so they are taken as regular matches.
+    """
+    wins: Counter = Counter()
+    losses: Counter = Counter()
+    order: Dict[Tuple[str, str, str], None] = {}
+    for team in data["teams"]:
+        for match in team["Matches"]:
+            if match["Result"] == "Win":
+                key = (team["Team Name"], match["Opponent"], match["Date"])
+                wins[key] += 1
+            else:
+                key = (match["Opponent"], team["Team Name"], match["Date"])
+                losses[key] += 1
+            order.setdefault(key, None)
+
+    matches = [
+        {"Winner": winner, "Loser": loser, "Date": date, "Multiplier": 1.0}
+        for winner, loser, date in order
+        for _ in range(max(wins[(winner, loser, date)], losses[(winner, loser, date)]))
+    ]
+    matches.sort(key=lambda match: match["Date"])
+    return matches
+
+
+def build_rating_history(match_log: List[Dict[str, Any]], ratings: Dict[str, float],
+                         k_factor: float = DEFAULT_K_FACTOR) -> RatingHistory:
+    """
+    Rating history of a match log. Matches logged without ratings are estimated with
+    `k_factor`, anchored to `ratings` (the teams' ratings at the end of the log, keyed by
+    normalized name), and the estimates are written into the log so they are kept.
+    """
+    history = RatingHistory(match_log, DEFAULT_RATING,
+                            lambda winner, loser, multiplier: elo_deltas(winner, loser, k_factor, multiplier))
+    history.anchor(ratings)
+    history.fill_ratings(match_log)
+    return history
+
+
+def default_journal_path(snapshot_path: str) -> str:
+    return os.path.join(os.path.dirname(snapshot_path), "elo_journal.jsonl")
+
+
+class EloStore:
+    """
+    Team Elo ratings persisted as a JSON snapshot plus an append-only match journal.
+    Besides the per-team match lists, the snapshot keeps a chronological "Match Log"
+    (derived once from those lists for older data) that the replay engine works from.
+
+    Every recorded match is appended to the journal as one JSON line and fsynced, so a
+    result costs O(1) I/O and a crash can lose at most a torn last line, which is skipped
+    on load. Once `compact_every` matches have been journaled the ratings are compacted
+    into the snapshot (written to a temp file and atomically renamed) and the journal is
+    truncated. The snapshot remembers the last journal entry it contains ("Journal Seq"),
+    so a crash between those two steps never applies a match twice.
+    """
+
+    def __init__(self, snapshot_path: str = ELO_PATH, journal_path: Optional[str] = None,
+                 compact_every: int = 50):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or default_journal_path(snapshot_path)
+        self.compact_every = compact_every
+        # Called with the snapshot path after every compaction, from the thread that started
+        # it (the event loop for EloWriter), e.g. so a file watcher does not reload the
+        # snapshot the bot just wrote itself
+        self.on_snapshot_written: Optional[Callable[[str], None]] = None
+        self.data, self.registry, self.history, self.head_to_head, self.seq, self.pending = self.read_state()
+
+    def read_state(self) -> Tuple[Dict[str, Any], TeamRegistry, RatingHistory, HeadToHeadIndex, int, int]:
+        """
+        Load the snapshot and replay the journal on top.
+        Returns (data, team registry, rating history, head-to-head index, last seq, journaled count).
+        """
+        with open(self.snapshot_path) as f:
+            data = json.load(f)
+        if "Match Log" not in data:
+            data["Match Log"] = derive_match_log(data)
+        registry = TeamRegistry(data["teams"])
+        history = build_rating_history(data["Match Log"], {normalize_name(team["Team Name"]): team["Elo Rating"]
+                                                           for team in data["teams"]})
+        head_to_head = HeadToHeadIndex(data["Match Log"])
+        seq = data.get("Journal Seq", 0)
+        pending = 0
+        for entry in self._read_journal():
+            if entry["Seq"] <= seq:
+                continue
+            self._apply_entry(data, registry, (history, head_to_head), entry)
+            seq = entry["Seq"]
+            pending += 1
+        return data, registry, history, head_to_head, seq, pending
+
+    def swap_in(self, state: Tuple[Dict[str, Any], TeamRegistry, RatingHistory, HeadToHeadIndex, int, int]) -> None:
+        """Adopt state re-read from disk, unless it predates matches recorded in memory since."""
+        if state[-2] < self.seq:
+            logging.info("Ignoring Elo reload that is older than the in-memory ratings")
+            return
+        self.data, self.registry, self.history, self.head_to_head, self.seq, self.pending = state
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A crash mid-append leaves a torn final line; everything before it is intact
+                    logging.warning(f"Skipping unreadable Elo journal line {line_number}")
+        return entries
+
+    @staticmethod
+    def _ensure_team(registry: TeamRegistry, team_name: str) -> Dict[str, Any]:
+        team = registry.get(team_name)
+        if team is None:
+            logging.info(f"Adding new team: {team_name}")
+            team = registry.add(team_name, DEFAULT_RATING)
+        return team
+
+    @classmethod
+    def _apply_entry(cls, data: Dict[str, Any], registry: TeamRegistry, match_indexes: Tuple[Any, ...],
+                     entry: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Apply one journaled match: ratings are taken as recorded, not recomputed.
+        `match_indexes` are the derived per-match indexes (rating history, head-to-head),
+        each updated through its `add_match`.
+        """
+        winning_team = cls._ensure_team(registry, entry["Winner"])
+        losing_team = cls._ensure_team(registry, entry["Loser"])
+        registry.set_rating(winning_team, entry["Winner Rating"])
+        registry.set_rating(losing_team, entry["Loser Rating"])
+        winning_team["Matches"].append({"Opponent": losing_team["Team Name"], "Result": "Win", "Date": entry["Date"]})
+        losing_team["Matches"].append({"Opponent": winning_team["Team Name"], "Result": "Loss", "Date": entry["Date"]})
+        logged = {"Winner": winning_team["Team Name"], "Loser": losing_team["Team Name"], "Date": entry["Date"],
+                  "Multiplier": entry["Multiplier"], "Winner Rating": entry["Winner Rating"],
+                  "Loser Rating": entry["Loser Rating"]}
+        data["Match Log"].append(logged)
+        for index in match_indexes:
+            index.add_match(logged)
+        return winning_team, losing_team
+
+    @property
+    def match_log(self) -> List[Dict[str, Any]]:
+        return self.data["Match Log"]
+
+    @property
+    def teams(self) -> List[Dict[str, Any]]:
+        return self.data["teams"]
+
+    def find_team(self, team_name: str) -> Optional[Dict[str, Any]]:
+        return self.registry.get(team_name)
+
+    def add_team_if_not_exists(self, team_name: str) -> Dict[str, Any]:
+        return self._ensure_team(self.registry, team_name)
+
+    def top_teams(self, count: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """Teams ranked by live Elo rating, without sorting the whole ladder."""
+        return self.registry.top(count, offset)
+
+    def rate_matches(self, results: List[Tuple[str, str, str, float, float]]) -> List[Dict[str, Any]]:
+        """
+        Rate a run of (winner, loser, date, playoff multiplier, K-factor) results in order,
+        each against the ratings left by the ones before it, without changing any state.
+        Returns the journal entries, to be persisted and then passed to `apply_entries`.
+        """
+        ratings: Dict[str, Tuple[str, float]] = {}
+        def current(team_name: str) -> Tuple[str, float]:
+            key = normalize_name(team_name)
+            if key not in ratings:
+                team = self.find_team(team_name)
+                ratings[key] = (team["Team Name"], team["Elo Rating"]) if team else (team_name, DEFAULT_RATING)
+            return ratings[key]
+
+        entries = []
+        for winning_team_name, losing_team_name, match_date, playoff_multiplier, k_factor in results:
+            (winner, winner_rating), (loser, loser_rating) = current(winning_team_name), current(losing_team_name)
+            winner_delta, loser_delta = elo_deltas(winner_rating, loser_rating, k_factor, playoff_multiplier)
+            entries.append({
+                "Seq": self.seq + len(entries) + 1,
+                "Winner": winner,
+                "Loser": loser,
+                "Date": match_date,
+                "Multiplier": playoff_multiplier,
+                "Winner Rating": winner_rating + winner_delta,
+                "Loser Rating": loser_rating + loser_delta,
+            })
+            ratings[normalize_name(winning_team_name)] = (winner, winner_rating + winner_delta)
+            ratings[normalize_name(losing_team_name)] = (loser, loser_rating + loser_delta)
+        return entries
+
+    def apply_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Apply journaled entries in memory, skipping any already picked up by a reload."""
+        for entry in entries:
+            if entry["Seq"] <= self.seq:
+                continue
+            self._apply_entry(self.data, self.registry, (self.history, self.head_to_head), entry)
+            self.seq = entry["Seq"]
+            self.pending += 1
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.pending >= self.compact_every
+
+    def record_match(self, winning_team_name: str, losing_team_name: str, match_date: str,
+                     playoff_multiplier: float = 1.0, k_factor: float = DEFAULT_K_FACTOR) -> Dict[str, Any]:
+        """Rate one match, journal it durably and apply it; returns the journal entry."""
+        entries = self.rate_matches([(winning_team_name, losing_team_name, match_date, playoff_multiplier, k_factor)])
+        # Durable first: the in-memory ratings only change once the journal has the match
+        self.append_journal(entries)
+        self.apply_entries(entries)
+        if self.needs_compaction:
+            self.compact()
+        return entries[0]
+
+    def reset_history(self, match_log: List[Dict[str, Any]], ratings: Dict[str, float],
+                      k_factor: float = DEFAULT_K_FACTOR) -> None:
+        """
+        Replace the match log and ratings in memory, e.g. with a corrected replay.
+        `ratings` is keyed by normalized team name. Teams named in the new log are added and
+        every team's match list is rebuilt from it; teams missing from `ratings` go back to
+        the default rating.
+        Ratings recorded on the old log no longer hold, so every match is re-rated with the
+        replay's `k_factor`. Call `compact` (or `write_snapshot`) to persist it.
+        """
+        match_log = [{key: value for key, value in match.items() if key not in ("Winner Rating", "Loser Rating")}
+                     for match in match_log]
+        for match in match_log:
+            self.add_team_if_not_exists(match["Winner"])
+            self.add_team_if_not_exists(match["Loser"])
+        for team in self.teams:
+            team["Matches"] = []
+            team["Elo Rating"] = ratings.get(normalize_name(team["Team Name"]), DEFAULT_RATING)
+        for match in match_log:
+            winning_team, losing_team = self.find_team(match["Winner"]), self.find_team(match["Loser"])
+            winning_team["Matches"].append({"Opponent": losing_team["Team Name"], "Result": "Win", "Date": match["Date"]})
+            losing_team["Matches"].append({"Opponent": winning_team["Team Name"], "Result": "Loss", "Date": match["Date"]})
+        self.data["Match Log"] = match_log
+        self.registry.rebuild()
+        self.history = build_rating_history(match_log, {normalize_name(team["Team Name"]): team["Elo Rating"]
+                                                        for team in self.teams}, k_factor)
+        self.head_to_head = HeadToHeadIndex(match_log)
+
+    def replace_history(self, match_log: List[Dict[str, Any]], ratings: Dict[str, float],
+                        k_factor: float = DEFAULT_K_FACTOR) -> None:
+        """Replace the match log and ratings and persist them at once."""
+        self.reset_history(match_log, ratings, k_factor)
+        self.compact()
+
+    def append_journal(self, entries: List[Dict[str, Any]]) -> None:
+        with open(self.journal_path, "a+b") as f:
+            # A crash mid-append leaves a torn line without a newline; end it first, so the
+            # fragment stays a line of its own and the new entries are not glued onto it
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+            else:
+                torn = False
+            f.write((("\n" if torn else "") + "".join(json.dumps(entry) + "\n" for entry in entries)).encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def snapshot_text(self) -> str:
+        """Serialize the current state for `write_snapshot`, marking the journal entries it covers."""
+        self.data["Journal Seq"] = self.seq
+        return json.dumps(self.data, indent=4)
+
+    def write_snapshot(self, text: str) -> None:
+        """
+        Atomically replace the snapshot (temp file, fsync, rename) and truncate the journal.
+        Only touches the disk, so it can run in a worker thread while the loop keeps going.
+        """
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        # The snapshot now covers every journaled match, so the journal can start over
+        open(self.journal_path, "w").close()
+        logging.info(f"Compacted Elo journal into {os.path.basename(self.snapshot_path)}")
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot and truncate it."""
+        self.write_snapshot(self.snapshot_text())
+        self.pending = 0
+        self.snapshot_written()
+
+    def snapshot_written(self) -> None:
+        if self.on_snapshot_written is not None:
+            self.on_snapshot_written(self.snapshot_path)
+
+_elo_store: Optional[EloStore] = None
+
+def get_elo_store() -> EloStore:
+    """Return the process-wide Elo store, loading it on first use."""
+    global _elo_store
+    if _elo_store is None:
+        _elo_store = EloStore()
+    return _elo_store
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from utils.elo_store import EloStore, DEFAULT_K_FACTOR
+from utils.match_import import new_matches
+from utils.name_index import normalize_name
+
+# Upper bound on how many queued results are folded into one journal write
+MAX_BATCH_SIZE = 100
+
+
+class _Job:
+    def __init__(self, kind: str, args: Tuple[Any, ...]):
+        self.kind = kind
+        self.args = args
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class EloWriter:
+    """
+    Single writer for an EloStore: every change goes through one asyncio queue and is
+    applied by one task, so concurrent commands can never interleave their updates.
+
+    Results queued while a write is in flight are coalesced: the next batch is rated in
+    queue order, appended to the journal with a single fsync and only then applied in
+    memory. Journal appends and snapshot compactions run in a worker thread, so the
+    event loop stays responsive while the disk catches up.
+    """
+
+    def __init__(self, store: EloStore, max_batch_size: int = MAX_BATCH_SIZE):
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _submit(self, kind: str, *args: Any) -> asyncio.Future:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        job = _Job(kind, args)
+        self._queue.put_nowait(job)
+        return job.future
+
+    async def record_match(self, winning_team_name: str, losing_team_name: str, match_date: str,
+                           playoff_multiplier: float = 1.0, k_factor: float = DEFAULT_K_FACTOR) -> Dict[str, Any]:
+        """Queue a result and wait until it is durable; returns its journal entry."""
+        return await self._submit("match", winning_team_name, losing_team_name, match_date,
+                                  playoff_multiplier, k_factor)
+
+    async def import_matches(self, matches: List[Dict[str, Any]], k_factor: float = DEFAULT_K_FACTOR
+                             ) -> Tuple[Dict[str, float], Dict[str, Tuple[str, float]], List[Dict[str, Any]], int]:
+        """
+        Queue a date-ordered batch of (Winner, Loser, Date, Multiplier) matches. Matches the
+        log already has are skipped; the rest are rated in order against the current ratings,
+        journaled in one write and folded into the snapshot in one compaction. That holds for
+        matches dated before the last logged one too: they are logged in the order they were
+        rated, as replaying the log from scratch would not reproduce the existing ratings.
+        Returns every team's rating before and (name, rating) after the import, keyed by
+        normalized team name, the imported matches and how many duplicates were skipped.
+        """
+        return await self._submit("import", matches, k_factor)
+
+    async def replace_history(self, match_log: List[Dict[str, Any]], ratings: Dict[str, float],
+                              k_factor: float = DEFAULT_K_FACTOR, expected_length: Optional[int] = None) -> bool:
+        """
+        Queue a match log and ratings replacement behind any pending results and wait for it.
+        `k_factor` is the one the ratings were replayed with; the log is re-rated with it.
+        With `expected_length`, the replacement is only applied if the store's match log
+        still has that many matches once the job runs, so results recorded after the
+        replacement was computed are never overwritten. Returns whether it was applied.
+        """
+        return await self._submit("history", match_log, ratings, k_factor, expected_length)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Consecutive results share one journal write; any other job ends the run
+            matches: List[_Job] = []
+            for job in batch:
+                if job.kind == "match":
+                    matches.append(job)
+                    continue
+                await self._write_matches(matches)
+                matches = []
+                if job.kind == "history":
+                    await self._write_history(job)
+                elif job.kind == "import":
+                    await self._write_import(job)
+                elif not job.future.done():
+                    job.future.set_result(None)
+            await self._write_matches(matches)
+
+    async def _write_matches(self, jobs: List[_Job]) -> None:
+        jobs = [job for job in jobs if not job.future.cancelled()]
+        if not jobs:
+            return
+        try:
+            entries = self.store.rate_matches([job.args for job in jobs])
+            # Durable first: the in-memory ratings only change once the journal has the batch
+            await asyncio.to_thread(self.store.append_journal, entries)
+        except Exception as e:
+            logging.error("Failed to write Elo results", exc_info=True)
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            return
+        self.store.apply_entries(entries)
+        for job, entry in zip(jobs, entries):
+            if not job.future.done():
+                job.future.set_result(entry)
+
+        if self.store.needs_compaction:
+            try:
+                await self._compact()
+            except OSError:
+                # The results are safe in the journal; compaction is retried after the next batch
+                logging.error("Failed to compact the Elo journal", exc_info=True)
+
+    async def _write_history(self, job: _Job) -> None:
+        match_log, ratings, k_factor, expected_length = job.args
+        if expected_length is not None and len(self.store.match_log) != expected_length:
+            if not job.future.done():
+                job.future.set_result(False)
+            return
+        try:
+            self.store.reset_history(match_log, ratings, k_factor)
+            await self._compact()
+        except Exception as e:
+            logging.error("Failed to replace the Elo history", exc_info=True)
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+        if not job.future.done():
+            job.future.set_result(True)
+
+    async def _write_import(self, job: _Job) -> None:
+        matches, k_factor = job.args
+        try:
+            before = {normalize_name(team["Team Name"]): team["Elo Rating"] for team in self.store.teams}
+            matches, skipped = new_matches(self.store.match_log, matches)
+            if matches:
+                entries = self.store.rate_matches([(match["Winner"], match["Loser"], match["Date"],
+                                                    match["Multiplier"], k_factor) for match in matches])
+                await asyncio.to_thread(self.store.append_journal, entries)
+                self.store.apply_entries(entries)
+                try:
+                    await self._compact()
+                except OSError:
+                    # The batch is safe in the journal; compaction is retried after the next write
+                    logging.error("Failed to compact the Elo journal", exc_info=True)
+        except Exception as e:
+            logging.error("Failed to import Elo results", exc_info=True)
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+        after = {normalize_name(team["Team Name"]): (team["Team Name"], team["Elo Rating"]) for team in self.store.teams}
+        if not job.future.done():
+            job.future.set_result((before, after, matches, skipped))
+
+    async def _compact(self) -> None:
+        # Serialized on the loop, so the snapshot is a consistent copy; only the I/O is threaded
+        text, covered = self.store.snapshot_text(), self.store.pending
+        await asyncio.to_thread(self.store.write_snapshot, text)
+        self.store.pending -= covered
+        # Back on the loop, so listeners such as the data watcher are never called from the thread
+        self.store.snapshot_written()
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far has been written."""
+        await self._submit("flush")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,126 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+import numpy as np
+
+STAT_KEYS = ("survivability", "melee_strength", "ranged_strength", "cavalry_prowess", "pilla_prowess")
+CAVALRY_CLASSES = ("Shock Cavalry", "Melee Cavalry")
+PILLA_MAX_RANGE = 80
+
+# Unit columns the scores are built from, loaded as float arrays
+SCORE_COLUMNS = ("Armor", "Melee Attack", "Base Missile Damage", "Range",
+                 "Charge Bonus", "AP Damage", "Ammo", "Missile Damage")
+
+
+class FactionScoringEngine:
+    """
+    Columnar faction scoring.
+    Unit stats are held in NumPy arrays alongside an integer faction code column, so the
+    five faction scores are computed for every faction at once with grouped reductions.
+
+    The scores match the historical per-faction loop:
+    - survivability: mean Armor
+    - melee_strength: mean Melee Attack
+    - ranged_strength: Base Missile Damage summed over units with Range > 80,
+      divided by the number of units with any missile damage
+    - cavalry_prowess: mean Charge Bonus + Melee Attack + Armor of shock/melee cavalry
+    - pilla_prowess: mean Missile Damage + AP Damage + Ammo of units with 0 < Range <= 80
+    Each score is then multiplied by the faction's modifier.
+    """
+
+    def __init__(self, units: Iterable[Mapping[str, Any]], faction_names: Optional[Sequence[str]] = None):
+        units = list(units)
+        if faction_names is None:
+            faction_names = list(dict.fromkeys(unit["Faction"] for unit in units))
+        faction_codes = {name: code for code, name in enumerate(faction_names)}
+        codes = np.fromiter((faction_codes[unit["Faction"]] for unit in units), dtype=np.intp, count=len(units))
+        self._load(faction_names, codes, units)
+
+    @classmethod
+    def from_factions(cls, factions: Mapping[str, Sequence[Mapping[str, Any]]]) -> "FactionScoringEngine":
+        """Build an engine from units already grouped by faction; factions without units score zero."""
+        engine = cls.__new__(cls)
+        units = [unit for faction_units in factions.values() for unit in faction_units]
+        codes = np.repeat(np.arange(len(factions), dtype=np.intp),
+                          [len(faction_units) for faction_units in factions.values()])
+        engine._load(list(factions), codes, units)
+        return engine
+
+    @classmethod
+    def from_columns(cls, faction_names: Sequence[str], codes: np.ndarray,
+                     columns: Mapping[str, np.ndarray], is_cavalry: np.ndarray) -> "FactionScoringEngine":
+        """Build an engine straight from prepared arrays, e.g. for large synthetic datasets."""
+        engine = cls.__new__(cls)
+        engine.faction_names = list(faction_names)
+        engine.faction_codes = {name: code for code, name in enumerate(engine.faction_names)}
+        engine.codes = np.asarray(codes, dtype=np.intp)
+        engine.columns = {column: np.asarray(columns.get(column, np.zeros(len(engine.codes))), dtype=np.float64)
+                          for column in SCORE_COLUMNS}
+        engine.is_cavalry = np.asarray(is_cavalry, dtype=bool)
+        engine.raw_scores = engine._raw_scores()
+        return engine
+
+    def _load(self, faction_names: Sequence[str], codes: np.ndarray, units: Sequence[Mapping[str, Any]]) -> None:
+        self.faction_names: List[str] = list(faction_names)
+        self.faction_codes: Dict[str, int] = {name: code for code, name in enumerate(self.faction_names)}
+        self.codes = codes
+        self.columns: Dict[str, np.ndarray] = {
+            column: np.fromiter((unit.get(column, 0) or 0 for unit in units), dtype=np.float64, count=len(units))
+            for column in SCORE_COLUMNS
+        }
+        self.is_cavalry = np.fromiter((unit.get("Class") in CAVALRY_CLASSES for unit in units),
+                                      dtype=bool, count=len(units))
+        self.raw_scores = self._raw_scores()
+
+    def _grouped_sum(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.codes, weights=values, minlength=len(self.faction_names))
+
+    def _grouped_count(self, mask: np.ndarray) -> np.ndarray:
+        return np.bincount(self.codes, weights=mask.astype(np.float64), minlength=len(self.faction_names))
+
+    def _raw_scores(self) -> np.ndarray:
+        """Unmodified score matrix of shape (factions, stats)."""
+        col = self.columns
+        ranged_units = col["Range"] > PILLA_MAX_RANGE
+        pilla_units = (col["Range"] > 0) & (col["Range"] <= PILLA_MAX_RANGE)
+
+        sums = np.stack([
+            self._grouped_sum(col["Armor"]),
+            self._grouped_sum(col["Melee Attack"]),
+            self._grouped_sum(np.where(ranged_units, col["Base Missile Damage"], 0.0)),
+            self._grouped_sum(np.where(self.is_cavalry, col["Charge Bonus"] + col["Melee Attack"] + col["Armor"], 0.0)),
+            self._grouped_sum(np.where(pilla_units, col["Missile Damage"] + col["AP Damage"] + col["Ammo"], 0.0)),
+        ], axis=1)
+        total_units = self._grouped_count(np.ones(len(self.codes), dtype=bool))
+        counts = np.stack([
+            total_units,
+            total_units,
+            self._grouped_count(col["Base Missile Damage"] > 0),
+            self._grouped_count(self.is_cavalry),
+            self._grouped_count(pilla_units),
+        ], axis=1)
+        # bincount of no units is int64, so the output dtype is given explicitly
+        return np.divide(sums, counts, out=np.zeros(sums.shape), where=counts > 0)
+
+    def modifier_matrix(self, modifiers: Mapping[str, Mapping[str, float]]) -> np.ndarray:
+        """Arrange faction modifiers into a (factions, stats) array; missing entries are 1.0."""
+        matrix = np.ones((len(self.faction_names), len(STAT_KEYS)))
+        for code, faction in enumerate(self.faction_names):
+            faction_modifier = modifiers.get(faction)
+            if faction_modifier:
+                matrix[code] = [faction_modifier.get(stat, 1.0) for stat in STAT_KEYS]
+        return matrix
+
+    def score_matrix(self, modifiers: Mapping[str, Mapping[str, float]]) -> np.ndarray:
+        """Modified, unrounded scores of shape (factions, stats)."""
+        return self.raw_scores * self.modifier_matrix(modifiers)
+
+    def sweep(self, modifier_sets: Sequence[Mapping[str, Mapping[str, float]]]) -> np.ndarray:
+        """Score several what-if modifier sets at once; returns unrounded shape (sets, factions, stats)."""
+        stacked = np.stack([self.modifier_matrix(modifiers) for modifiers in modifier_sets])
+        return self.raw_scores[np.newaxis] * stacked
+
+    def score_all(self, modifiers: Mapping[str, Mapping[str, float]]) -> Dict[str, Dict[str, float]]:
+        """Scores for every faction as {faction: {stat: value}}, rounded to 2 decimals."""
+        matrix = self.score_matrix(modifiers).tolist()
+        # Python's round() is correctly rounded, unlike np.round, so results match the old loop exactly
+        return {faction: {stat: round(value, 2) for stat, value in zip(STAT_KEYS, row)}
+                for faction, row in zip(self.faction_names, matrix)}
@@ -10,8 +10,12 @@ if api_key is None:
     raise ValueError("API Key for Google Gemini is not found!")
 genai.configure(api_key=api_key)
 
-def generate_analysis(faction_name: str, stats: Dict[str, float], all_factions_stats: Dict[str, Dict[str, float]]) -> str:
-    """Generate a faction analysis based on given stats."""
+# Seconds before the HTTP request to Gemini is abandoned
+GEMINI_REQUEST_TIMEOUT = 60
+
+
+def build_prompt(faction_name: str, stats: Dict[str, float], all_factions_stats: Dict[str, Dict[str, float]]) -> str:
+    """The analysis prompt for a faction, given every faction's scores."""
     survivability_desc = interpret_score(stats['survivability'], "Survivability")
     melee_strength_desc = interpret_score(stats['melee_strength'], "Melee")
     ranged_strength_desc = interpret_score(stats['ranged_strength'], "Ranged")
@@ -36,11 +40,21 @@ def generate_analysis(faction_name: str, stats: Dict[str, float], all_factions_s
     "Based on these scores, provide a detailed analysis of strengths and weaknesses without contradictory claims."
     "Be short and concise"
 )
+    return prompt
+
+
+def request_analysis(prompt: str, timeout: float = GEMINI_REQUEST_TIMEOUT) -> str:
+    """Send a prompt to Gemini and return the text; blocks for the whole round trip and raises on failure."""
+    model = genai.GenerativeModel("gemini-1.5-flash")
+    response = model.generate_content(prompt, request_options={"timeout": timeout})
+    content = response.text.strip()
+    return content if content else "No analysis generated."
+
+
+def generate_analysis(faction_name: str, stats: Dict[str, float], all_factions_stats: Dict[str, Dict[str, float]]) -> str:
+    """Generate a faction analysis based on given stats."""
     try:
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        return content if content else "No analysis generated."
+        return request_analysis(build_prompt(faction_name, stats, all_factions_stats))
     except Exception as e:
         return f"Error generating analysis: {e}"
 
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Iterable, List, Optional
+from utils.name_index import normalize_name
+
+
+class MatchRecord:
+    """Wins, losses and last-played date of a team, overall or against one opponent."""
+
+    __slots__ = ("name", "wins", "losses", "last_played")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wins = 0
+        self.losses = 0
+        self.last_played: Optional[str] = None
+
+    @property
+    def played(self) -> int:
+        return self.wins + self.losses
+
+    def add(self, won: bool, date: str) -> None:
+        if won:
+            self.wins += 1
+        else:
+            self.losses += 1
+        if self.last_played is None or date > self.last_played:
+            self.last_played = date
+
+
+class HeadToHeadIndex:
+    """
+    Every team's overall record and its record against each opponent, built once from the
+    match log and updated per recorded match, so both lookups are dict hits however long
+    the history grows. Teams are keyed by normalized name.
+    """
+
+    def __init__(self, match_log: Iterable[Dict[str, Any]]):
+        self._teams: Dict[str, MatchRecord] = {}
+        self._pairs: Dict[str, Dict[str, MatchRecord]] = {}
+        for match in match_log:
+            self.add_match(match)
+
+    def add_match(self, match: Dict[str, Any]) -> None:
+        for team_name, opponent_name, won in ((match["Winner"], match["Loser"], True),
+                                              (match["Loser"], match["Winner"], False)):
+            key, opponent_key = normalize_name(team_name), normalize_name(opponent_name)
+            if key not in self._teams:
+                self._teams[key] = MatchRecord(team_name)
+                self._pairs[key] = {}
+            self._teams[key].add(won, match["Date"])
+            opponents = self._pairs[key]
+            if opponent_key not in opponents:
+                opponents[opponent_key] = MatchRecord(opponent_name)
+            opponents[opponent_key].add(won, match["Date"])
+
+    def team_record(self, team_name: str) -> Optional[MatchRecord]:
+        return self._teams.get(normalize_name(team_name))
+
+    def head_to_head(self, team_name: str, opponent_name: str) -> Optional[MatchRecord]:
+        """The first team's record against the second, or None if they never met."""
+        return self._pairs.get(normalize_name(team_name), {}).get(normalize_name(opponent_name))
+
+    def opponents(self, team_name: str) -> List[MatchRecord]:
+        """A team's record against each opponent, most played first."""
+        records = list(self._pairs.get(normalize_name(team_name), {}).values())
+        records.sort(key=lambda record: record.played, reverse=True)
+        return records
@@ -0,0 +1,108 @@
+import math
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import discord
+
+# Entries per leaderboard page
+PAGE_SIZE = 10
+# Leaderboards whose pages are kept, most recently used last
+PAGE_CACHE_BOARDS = 32
+# Seconds of inactivity after which the paging buttons stop responding
+PAGE_VIEW_TIMEOUT = 300
+
+
+def page_count(entries: int, page_size: int = PAGE_SIZE) -> int:
+    """Number of pages for `entries` entries; an empty board still has one (empty) page."""
+    return max(1, math.ceil(entries / page_size))
+
+
+class LeaderboardPages:
+    """
+    Rendered leaderboard pages, each built once per data version.
+    A board is identified by a key such as ("historical", "Win %") and tagged with the version
+    of the data it was built from; a page request for a newer version drops the board's old
+    pages, so paging back and forth is a dict hit until the data changes.
+    """
+
+    def __init__(self, max_boards: int = PAGE_CACHE_BOARDS):
+        self.max_boards = max_boards
+        self._boards: "OrderedDict[Hashable, Tuple[Hashable, Dict[int, discord.Embed]]]" = OrderedDict()
+
+    def page(self, board: Hashable, version: Hashable, page: int,
+             build: Callable[[int], discord.Embed]) -> discord.Embed:
+        """Page `page` (0-based) of a board, built by `build(page)` only on a cache miss."""
+        cached = self._boards.get(board)
+        if cached is None or cached[0] != version:
+            cached = (version, {})
+            self._boards[board] = cached
+        self._boards.move_to_end(board)
+        while len(self._boards) > self.max_boards:
+            self._boards.popitem(last=False)
+
+        pages = cached[1]
+        embed = pages.get(page)
+        if embed is None:
+            embed = pages[page] = build(page)
+        return embed
+
+
+class LeaderboardView(discord.ui.View):
+    """
+    Previous/next buttons that swap a leaderboard message between its pages.
+    `count_pages()` is asked again on every click, so a board that shrank after a data
+    reload is never paged past its end.
+    """
+
+    def __init__(self, count_pages: Callable[[], int], render: Callable[[int], discord.Embed],
+                 author_id: Optional[int] = None, timeout: float = PAGE_VIEW_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.count_pages = count_pages
+        self.render = render
+        self.author_id = author_id
+        self.current = 0
+        self.message: Optional[discord.Message] = None
+        self._update_buttons()
+
+    @property
+    def pages(self) -> int:
+        return self.count_pages()
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.current == 0
+        self.next_page.disabled = self.current >= self.pages - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Only whoever asked for the leaderboard can page through it
+        return self.author_id is None or interaction.user.id == self.author_id
+
+    async def on_timeout(self) -> None:
+        # Grey the buttons out, so late clicks do not end in "interaction failed"
+        self.previous_page.disabled = self.next_page.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    async def show(self, interaction: discord.Interaction, page: int) -> None:
+        self.current = min(max(page, 0), self.pages - 1)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.render(self.current), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self.show(interaction, self.current - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self.show(interaction, self.current + 1)
+
+
+async def send_leaderboard(ctx: Any, count_pages: Callable[[], int], render: Callable[[int], discord.Embed]) -> None:
+    """Send a leaderboard's first page, with paging buttons when it has more than one."""
+    embed = render(0)
+    if count_pages() <= 1:
+        await ctx.send(embed=embed)
+        return
+    view = LeaderboardView(count_pages, render, getattr(ctx.author, "id", None))
+    view.message = await ctx.send(embed=embed, view=view)
@@ -0,0 +1,134 @@
+import csv
+import datetime
+import io
+import json
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+from utils.elo_store import DEFAULT_RATING, PLAYOFF_MULTIPLIER
+from utils.name_index import normalize_name
+
+MATCH_TYPES = {"regular": 1.0, "playoff": PLAYOFF_MULTIPLIER}
+
+
+class MatchImportError(ValueError):
+    """Raised when an import file has invalid rows; `errors` lists every problem found."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def parse_teams(match_details: str) -> Tuple[str, str]:
+    """Parse two team names from command input, separated by 'vs', 'versus', 'and' or a comma."""
+    match_details_lower = match_details.lower()
+    if " vs " in match_details_lower:
+        team_a, team_b = match_details.split(" vs ", 1)
+    elif " versus " in match_details_lower:
+        team_a, team_b = match_details.split(" versus ", 1)
+    elif " and " in match_details_lower:
+        team_a, team_b = match_details.rsplit(" and ", 1)
+    else:
+        parts = [p.strip() for p in match_details.split(",")]
+        if len(parts) == 2:
+            team_a, team_b = parts
+        else:
+            raise ValueError(
+                "Unable to parse team names. Use 'vs', 'versus', 'and', or ',' as separators."
+            )
+    return team_a.strip(), team_b.strip()
+
+
+def _read_rows(text: str, filename: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """Read (row number, fields) pairs from a CSV or JSON file, with lower-cased field names."""
+    if filename.lower().endswith(".json"):
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise MatchImportError([f"Invalid JSON: {e}"])
+        if isinstance(rows, dict):
+            rows = rows.get("matches")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise MatchImportError(["JSON imports must be a list of match objects"])
+        return [(number, {str(key).strip().lower(): value for key, value in row.items()})
+                for number, row in enumerate(rows, 1)]
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise MatchImportError(["The CSV file is empty"])
+    # Row 1 is the header, so data rows are numbered as they appear in a spreadsheet
+    return [(number, {(key or "").strip().lower(): value for key, value in row.items()})
+            for number, row in enumerate(reader, 2)]
+
+
+def parse_match_import(text: str, filename: str) -> List[Dict[str, Any]]:
+    """
+    Parse and validate a CSV or JSON match import.
+    Every match needs a winner, a loser and an ISO date; an optional type is regular or
+    playoff. Returns the matches as (Winner, Loser, Date, Multiplier) dicts in date order,
+    keeping file order within a date, or raises MatchImportError listing every bad row.
+    """
+    matches, errors = [], []
+    for number, row in _read_rows(text, filename):
+        winner = str(row.get("winner") or "").strip()
+        loser = str(row.get("loser") or "").strip()
+        date = str(row.get("date") or "").strip()
+        match_type = str(row.get("type") or "regular").strip().lower()
+
+        problems = []
+        if not winner or not loser:
+            problems.append("winner and loser are required")
+        elif winner.lower() == loser.lower():
+            problems.append("a team cannot play itself")
+        try:
+            date = datetime.date.fromisoformat(date).isoformat()
+        except ValueError:
+            problems.append(f"invalid date '{date}' (use YYYY-MM-DD)")
+        if match_type not in MATCH_TYPES:
+            problems.append(f"unknown match type '{match_type}' (use regular or playoff)")
+
+        if problems:
+            errors.append(f"Row {number}: " + "; ".join(problems))
+        else:
+            matches.append({"Winner": winner, "Loser": loser, "Date": date, "Multiplier": MATCH_TYPES[match_type]})
+
+    if errors:
+        raise MatchImportError(errors)
+    if not matches:
+        raise MatchImportError(["The file contains no matches"])
+    matches.sort(key=lambda match: match["Date"])
+    return matches
+
+
+def _match_key(match: Dict[str, Any]) -> Tuple[str, str, str]:
+    return match["Date"], normalize_name(match["Winner"]), normalize_name(match["Loser"])
+
+
+def new_matches(match_log: List[Dict[str, Any]], matches: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop the imported matches the log already has (same date, winner and loser), so a
+    re-run import is not counted twice. A result the log holds n times skips its first n
+    occurrences only, which keeps genuine same-day rematches. Returns the new matches and
+    how many were skipped.
+    """
+    logged = Counter(_match_key(match) for match in match_log)
+    kept = []
+    for match in matches:
+        key = _match_key(match)
+        if logged[key]:
+            logged[key] -= 1
+        else:
+            kept.append(match)
+    return kept, len(matches) - len(kept)
+
+
+def rating_deltas(before: Dict[str, float], after: Dict[str, Tuple[str, float]]) -> List[Tuple[str, float, float]]:
+    """
+    Net rating change per team over an import, as (team, new rating, delta) sorted by delta.
+    `before` maps normalized team names to their ratings before the import, teams missing
+    from it started at the default rating; `after` maps them to (team name, rating) after it.
+    Teams whose rating did not move are left out.
+    """
+    deltas = [(name, rating, rating - before.get(key, DEFAULT_RATING)) for key, (name, rating) in after.items()
+              if key not in before or rating != before[key]]
+    deltas.sort(key=lambda item: item[2], reverse=True)
+    return deltas
@@ -0,0 +1,153 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a name and collapse runs of whitespace."""
+    return " ".join(name.lower().split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance between two strings.
+    With `max_distance`, gives up early and returns max_distance + 1 once it is exceeded.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        left = i
+        for j, char_b in enumerate(b, 1):
+            substitution = previous[j - 1] + (char_a != char_b)
+            deletion = previous[j] + 1
+            left = left + 1
+            if deletion < left:
+                left = deletion
+            if substitution < left:
+                left = substitution
+            current.append(left)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class _TrieNode:
+    __slots__ = ("children", "positions")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Every name below this node, in insertion order
+        self.positions: List[int] = []
+
+
+class NameIndex:
+    """
+    Case-insensitive name lookup with prefix search and a fuzzy fallback.
+    Exact lookups hit a dict of normalized names and prefix lookups walk a character
+    trie, both in O(len(name)); misses are answered from a trigram inverted index whose
+    candidates are re-ranked by edit distance.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        self._values: Dict[str, Any] = {}
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._trie = _TrieNode()
+        for name, value in entries:
+            key = normalize_name(name)
+            # Keep the first entry for a repeated name, as a linear scan would
+            if key in self._values:
+                continue
+            self._values[key] = value
+            position = len(self._keys)
+            self._names.append(name)
+            self._keys.append(key)
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+            node = self._trie
+            for char in key:
+                node = node.children.setdefault(char, _TrieNode())
+                node.positions.append(position)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._values
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return the value stored under an exact (case-insensitive) name."""
+        return self._values.get(normalize_name(name))
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Names starting with `prefix` (case-insensitive), in insertion order."""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        node = self._trie
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self._names[position] for position in node.positions[:limit]]
+
+    def suggest(self, name: str, limit: int = 5, min_score: float = 0.4) -> List[Tuple[str, float]]:
+        """Return up to `limit` (name, similarity) pairs, best first."""
+        key = normalize_name(name)
+        if not key:
+            return []
+        query_grams = _trigrams(key)
+        shared: Counter = Counter()
+        for gram in query_grams:
+            shared.update(self._postings.get(gram, ()))
+
+        # Dice coefficient on trigrams narrows the field before the edit distance pass
+        candidates = sorted(
+            shared,
+            key=lambda pos: 2 * shared[pos] / (len(query_grams) + self._gram_counts[pos]),
+            reverse=True,
+        )[:max(limit * 2, 10)]
+
+        scored = []
+        for position in candidates:
+            candidate = self._keys[position]
+            longest = max(len(key), len(candidate))
+            distance = edit_distance(key, candidate, int((1 - min_score) * longest))
+            similarity = 1 - distance / longest
+            if similarity >= min_score:
+                scored.append((self._names[position], round(similarity, 3)))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def resolve(self, name: str, cutoff: float = 0.75, prefix: bool = False) -> Optional[Any]:
+        """
+        Return the exact match, else (with `prefix`) the only name starting with `name`,
+        else the closest fuzzy match scoring at least `cutoff`.
+        """
+        value = self.get(name)
+        if value is not None:
+            return value
+        if prefix:
+            completions = self.with_prefix(name, limit=2)
+            if len(completions) == 1:
+                return self.get(completions[0])
+        suggestions = self.suggest(name, limit=2)
+        if not suggestions or suggestions[0][1] < cutoff:
+            return None
+        # Refuse to guess between two equally close names
+        if len(suggestions) > 1 and suggestions[1][1] == suggestions[0][1]:
+            return None
+        return self.get(suggestions[0][0])
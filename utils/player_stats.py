@@ -0,0 +1,216 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+from utils.data_loader import PLAYER_STATS_PATH, load_json_file, load_player_data
+from utils.data_watcher import DataWatcher
+from utils.name_index import NameIndex
+
+# Players need this many games to appear on the rating leaderboard, and on every other one
+RATING_MIN_GAMES = 10
+METRIC_MIN_GAMES = 20
+# Fuzzy matches below this similarity are too far off to offer as "Did you mean"
+SUGGESTION_MIN_SCORE = 0.5
+
+
+def parse_stat(value: Any) -> float:
+    """Convert a stat as stored in the JSON ("16.7%", "", 6, 1.01, ...) to a float; blanks count as 0."""
+    if value is None or value == '':
+        return 0.0
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except ValueError:
+        return 0.0
+
+
+class RatingWeights:
+    """Weights of the player rating formula; the defaults are the ladder's own."""
+
+    def __init__(self, base_rating: float = 1000.0, win_percentage: float = 5, kd_ratio: float = 100,
+                 chevrons_per_game: float = 25, playoff_rate: float = 3,
+                 achievements: Optional[Dict[str, float]] = None,
+                 min_games: int = 20, low_games_multiplier: float = 0.5):
+        self.base_rating = base_rating
+        self.win_percentage = win_percentage
+        self.kd_ratio = kd_ratio
+        self.chevrons_per_game = chevrons_per_game
+        self.playoff_rate = playoff_rate
+        self.achievements = achievements if achievements is not None else {
+            'Championships': 30,
+            'Runner-ups': 20,
+            'Third Places': 10,
+            'Top 3 Best KD Ratios': 5,
+            'Top 3 Most Chevrons/Game': 5
+        }
+        # Players with fewer games have their rating scaled by low_games_multiplier
+        self.min_games = min_games
+        self.low_games_multiplier = low_games_multiplier
+
+    def replaced(self, **changes: Any) -> 'RatingWeights':
+        """A copy with some weights changed; achievement points are merged, not replaced."""
+        weights = dict(vars(self), achievements=dict(self.achievements))
+        weights['achievements'].update(changes.pop('achievements', {}))
+        weights.update(changes)
+        return RatingWeights(**weights)
+
+
+DEFAULT_RATING_WEIGHTS = RatingWeights()
+
+
+def calculate_player_rating(player_data: dict, weights: RatingWeights = DEFAULT_RATING_WEIGHTS) -> float:
+    """Calculates the player's rating based on various metrics."""
+    win_percentage = parse_stat(player_data.get('Win %', ''))
+    playoff_rate = parse_stat(player_data.get('Playoff Rate', ''))
+    games_played = int(player_data.get('Games Played', 0) or 0)
+
+    # Calculate the rating
+    performance_multiplier = weights.low_games_multiplier if games_played < weights.min_games else 1.0
+    rating = weights.base_rating + (win_percentage * weights.win_percentage) + (float(player_data.get('K/D ratio', 0) or 0) * weights.kd_ratio)
+    rating += float(player_data.get('Chevrons/game', 0) or 0) * weights.chevrons_per_game
+
+    # Add extra points for achievements
+    for key, points in weights.achievements.items():
+        rating += int(player_data.get(key, 0) or 0) * points
+
+    rating += playoff_rate * weights.playoff_rate
+    rating *= performance_multiplier
+    return round(rating, 2)
+
+
+def rate_players(columns: Dict[str, np.ndarray], weights: RatingWeights = DEFAULT_RATING_WEIGHTS,
+                 rounded: bool = True) -> np.ndarray:
+    """
+    `calculate_player_rating` for a whole roster in one NumPy pass over typed stat columns.
+    Operations run in the same order as the scalar formula, so the results are identical.
+    With `rounded`, values are rounded to 2 decimals exactly like Python's round().
+    """
+    size = len(next(iter(columns.values()))) if columns else 0
+    def column(key: str) -> np.ndarray:
+        values = columns.get(key)
+        return values if values is not None else np.zeros(size)
+
+    games_played = np.trunc(column('Games Played'))
+    performance_multiplier = np.where(games_played < weights.min_games, weights.low_games_multiplier, 1.0)
+    rating = weights.base_rating + (column('Win %') * weights.win_percentage) + (column('K/D ratio') * weights.kd_ratio)
+    rating += column('Chevrons/game') * weights.chevrons_per_game
+    for key, points in weights.achievements.items():
+        rating += np.trunc(column(key)) * points
+    rating += column('Playoff Rate') * weights.playoff_rate
+    rating *= performance_multiplier
+    if not rounded:
+        return rating
+    # np.round scales by 100 first, which can land on the wrong side of a tie; only values
+    # within a hair of one are re-rounded in Python, which rounds the exact binary value
+    result = np.round(rating, 2)
+    scaled = rating * 100
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    result[near_tie] = [round(value, 2) for value in rating[near_tie].tolist()]
+    return result
+
+
+class PlayerStats:
+    """
+    Historical player stats parsed once into typed columns, shared by the historical commands.
+    Every stat becomes a float64 column with percentages and blanks normalized at load time,
+    indexed by row; the original records are kept for display. A derived "Rating" column
+    holds each player's rating, and every column's leaderboard is materialized as a sorted
+    array of rows, so serving a leaderboard is a slice.
+    """
+
+    def __init__(self, players: List[Dict[str, Any]], version: int = 1):
+        self.players = players
+        self.version = version
+        self.names = [player['Player'] for player in players]
+        keys = list(dict.fromkeys(key for player in players for key in player if key != 'Player'))
+        self.columns: Dict[str, np.ndarray] = {
+            key: np.array([parse_stat(player.get(key)) for player in players], dtype=np.float64)
+            for key in keys
+        }
+        self.name_index = NameIndex((name, row) for row, name in enumerate(self.names))
+        self.columns['Rating'] = rate_players(self.columns)
+        self.rankings = {key: self._rank(key) for key in self.columns}
+        self.metric_index = NameIndex((key, key) for key in self.columns)
+
+    def _rank(self, key: str) -> np.ndarray:
+        """Rows of the eligible players, best first; ties keep file order."""
+        min_games = RATING_MIN_GAMES if key == 'Rating' else METRIC_MIN_GAMES
+        rows = np.flatnonzero(self.column('Games Played') >= min_games)
+        return rows[np.argsort(-self.columns[key][rows], kind='stable')]
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def column(self, key: str) -> np.ndarray:
+        """A stat for every player, as floats; all zeros for a stat nobody has."""
+        column = self.columns.get(key)
+        return column if column is not None else np.zeros(len(self.players))
+
+    def metrics(self) -> List[str]:
+        return list(self.columns)
+
+    def resolve_metric(self, name: str) -> Optional[str]:
+        """The column a user means by `name`, tolerating case and small typos."""
+        return self.metric_index.resolve(name)
+
+    def leaderboard(self, key: str, limit: Optional[int] = None, offset: int = 0) -> np.ndarray:
+        """Rows ranked by a column, best first; empty for a column nobody has."""
+        ranking = self.rankings.get(key)
+        if ranking is None:
+            return np.empty(0, dtype=np.intp)
+        return ranking[offset:None if limit is None else offset + limit]
+
+    def row(self, player_name: str) -> Optional[int]:
+        return self.name_index.get(player_name)
+
+    def get(self, player_name: str) -> Optional[Dict[str, Any]]:
+        """The player's record as stored in the JSON, looked up case-insensitively."""
+        row = self.row(player_name)
+        return None if row is None else self.players[row]
+
+    def find_row(self, player_name: str) -> Optional[int]:
+        """The row a user means by `player_name`: an exact name, a unique prefix or a close misspelling."""
+        return self.name_index.resolve(player_name, prefix=True)
+
+    def find(self, player_name: str) -> Optional[Dict[str, Any]]:
+        row = self.find_row(player_name)
+        return None if row is None else self.players[row]
+
+    def suggest_players(self, player_name: str, limit: int = 3) -> List[str]:
+        """Names to offer when `player_name` matches nobody: completions first, then near misses."""
+        suggestions = self.name_index.with_prefix(player_name, limit)
+        for name, _ in self.name_index.suggest(player_name, limit=limit, min_score=SUGGESTION_MIN_SCORE):
+            if name not in suggestions:
+                suggestions.append(name)
+        return suggestions[:limit]
+
+    def typed_record(self, row: int) -> Dict[str, Any]:
+        """A player's stats with every value already converted to a float."""
+        record: Dict[str, Any] = {key: float(column[row]) for key, column in self.columns.items()}
+        record['Player'] = self.names[row]
+        return record
+
+    def rerated(self, weights: RatingWeights, rounded: bool = True) -> np.ndarray:
+        """Every player's rating under alternative weights, e.g. for tuning the formula."""
+        return rate_players(self.columns, weights, rounded)
+
+    def rebuilt(self, players: List[Dict[str, Any]]) -> 'PlayerStats':
+        return PlayerStats(players, self.version + 1)
+
+    def swap_in(self, other: 'PlayerStats') -> None:
+        """Adopt freshly parsed stats in place, so every holder of this object sees them."""
+        self.players, self.version, self.names = other.players, other.version, other.names
+        self.columns, self.name_index = other.columns, other.name_index
+        self.rankings, self.metric_index = other.rankings, other.metric_index
+
+
+def watch_player_stats(stats: PlayerStats, watcher: DataWatcher) -> None:
+    """Re-parse the stats only when player_stats_historical.json changes."""
+    watcher.watch(PLAYER_STATS_PATH, lambda path: stats.rebuilt(load_json_file(path)), stats.swap_in)
+
+
+_player_stats: Optional[PlayerStats] = None
+
+def get_player_stats() -> PlayerStats:
+    """Return the process-wide player stats, parsing the data on first use."""
+    global _player_stats
+    if _player_stats is None:
+        _player_stats = PlayerStats(load_player_data())
+    return _player_stats
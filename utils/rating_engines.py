@@ -0,0 +1,187 @@
+"""
+Pluggable rating systems computed from the Elo store's match log.
+
+Every engine turns a chronological match log into a `RatingTable`. The classic Elo engine
+replays matches one after another; the Glicko-2 engine groups matches into rating periods
+(one per match date) and updates every team that played in a period in one vectorized step,
+so a tournament day with dozens of results is rated as a whole rather than in entry order.
+"""
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from utils.elo_replay import replay_ratings
+from utils.elo_store import DEFAULT_K_FACTOR, DEFAULT_RATING
+from utils.name_index import normalize_name
+
+GLICKO_SCALE = 173.7178
+GLICKO_RATING = 1500.0
+GLICKO_DEVIATION = 350.0
+GLICKO_VOLATILITY = 0.06
+GLICKO_TAU = 0.5
+CONVERGENCE_TOLERANCE = 1e-6
+
+
+class RatingTable:
+    """Ratings (and, where the system has them, rating deviations) of every team in a match log."""
+
+    def __init__(self, names: List[str], ratings: np.ndarray, deviations: Optional[np.ndarray] = None):
+        self.names = names
+        self.ratings = ratings
+        self.deviations = deviations
+        self._positions = {normalize_name(name): position for position, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, team_name: str) -> Optional[Tuple[float, Optional[float]]]:
+        """(rating, deviation) of a team, or None if it never played."""
+        position = self._positions.get(normalize_name(team_name))
+        if position is None:
+            return None
+        deviation = None if self.deviations is None else float(self.deviations[position])
+        return float(self.ratings[position]), deviation
+
+    def top(self, count: int) -> List[Tuple[str, float, Optional[float]]]:
+        """The `count` highest rated teams as (name, rating, deviation), ties in first-played order."""
+        order = np.argsort(-self.ratings, kind="stable")[:count]
+        return [(self.names[position], float(self.ratings[position]),
+                 None if self.deviations is None else float(self.deviations[position]))
+                for position in order.tolist()]
+
+
+class RatingEngine(ABC):
+    """Interface of a rating system: `rate` a chronological match log from scratch."""
+
+    name = ""
+    label = ""
+
+    @abstractmethod
+    def rate(self, match_log: Sequence[Dict[str, Any]]) -> RatingTable:
+        """Rate every team in the match log."""
+
+
+class EloEngine(RatingEngine):
+    """Classic Elo with a fixed K-factor, replayed match by match."""
+
+    name = "elo"
+    label = "Elo"
+
+    def __init__(self, k_factor: float = DEFAULT_K_FACTOR, initial_rating: float = DEFAULT_RATING):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+
+    def rate(self, match_log: Sequence[Dict[str, Any]]) -> RatingTable:
+        names, ratings = replay_ratings(match_log, self.k_factor, initial_rating=self.initial_rating)
+        return RatingTable(names, ratings[0])
+
+
+class Glicko2Engine(RatingEngine):
+    """
+    Glicko-2 (Glickman, 2012) with one rating period per match date. New teams start with a
+    large rating deviation, so their first results move them quickly; the deviation shrinks
+    as they play and grows again while they are inactive.
+    """
+
+    name = "glicko2"
+    label = "Glicko-2"
+
+    def __init__(self, tau: float = GLICKO_TAU, initial_rating: float = GLICKO_RATING,
+                 initial_deviation: float = GLICKO_DEVIATION, initial_volatility: float = GLICKO_VOLATILITY):
+        self.tau = tau
+        self.initial_rating = initial_rating
+        self.initial_deviation = initial_deviation
+        self.initial_volatility = initial_volatility
+
+    def rate(self, match_log: Sequence[Dict[str, Any]]) -> RatingTable:
+        team_codes: Dict[str, int] = {}
+        names: List[str] = []
+        def code(name: str) -> int:
+            key = normalize_name(name)
+            if key not in team_codes:
+                team_codes[key] = len(names)
+                names.append(name)
+            return team_codes[key]
+
+        pairs = [(code(match["Winner"]), code(match["Loser"])) for match in match_log]
+        winners = np.array([winner for winner, _ in pairs], dtype=np.intp)
+        losers = np.array([loser for _, loser in pairs], dtype=np.intp)
+        team_count = len(names)
+        mu = np.zeros(team_count)
+        phi = np.full(team_count, self.initial_deviation / GLICKO_SCALE)
+        sigma = np.full(team_count, self.initial_volatility)
+
+        # Consecutive matches on one date form a rating period
+        dates = [match["Date"] for match in match_log]
+        bounds = [0] + [position for position in range(1, len(dates)) if dates[position] != dates[position - 1]]
+        bounds.append(len(dates))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            self._rate_period(mu, phi, sigma, winners[start:end], losers[start:end])
+
+        return RatingTable(names, mu * GLICKO_SCALE + self.initial_rating, phi * GLICKO_SCALE)
+
+    def _rate_period(self, mu: np.ndarray, phi: np.ndarray, sigma: np.ndarray,
+                     winners: np.ndarray, losers: np.ndarray) -> None:
+        """Update every team for one rating period in place."""
+        team_count = len(mu)
+        # One row per team per game: (team, opponent, score)
+        teams = np.concatenate([winners, losers])
+        opponents = np.concatenate([losers, winners])
+        scores = np.concatenate([np.ones(len(winners)), np.zeros(len(losers))])
+
+        g = 1 / np.sqrt(1 + 3 * phi[opponents] ** 2 / math.pi ** 2)
+        expected = 1 / (1 + np.exp(-g * (mu[teams] - mu[opponents])))
+        information = np.bincount(teams, g ** 2 * expected * (1 - expected), minlength=team_count)
+        improvement = np.bincount(teams, g * (scores - expected), minlength=team_count)
+
+        played = information > 0
+        # Teams that sat the period out only become less certain
+        new_phi = np.sqrt(phi ** 2 + sigma ** 2)
+
+        p_phi, p_sigma = phi[played], sigma[played]
+        variance = 1 / information[played]
+        delta = variance * improvement[played]
+        p_sigma = self._volatility(p_phi, p_sigma, variance, delta)
+        pre_phi = np.sqrt(p_phi ** 2 + p_sigma ** 2)
+        p_phi = 1 / np.sqrt(1 / pre_phi ** 2 + 1 / variance)
+
+        mu[played] += p_phi ** 2 * improvement[played]
+        new_phi[played] = p_phi
+        phi[:] = new_phi
+        sigma[played] = p_sigma
+
+    def _volatility(self, phi: np.ndarray, sigma: np.ndarray, variance: np.ndarray, delta: np.ndarray) -> np.ndarray:
+        """New volatilities by the Illinois root search of step 5, for all teams at once."""
+        a = np.log(sigma ** 2)
+        tau_squared = self.tau ** 2
+        def f(x):
+            exp_x = np.exp(x)
+            return (exp_x * (delta ** 2 - phi ** 2 - variance - exp_x) / (2 * (phi ** 2 + variance + exp_x) ** 2)
+                    - (x - a) / tau_squared)
+
+        big_delta = delta ** 2 > phi ** 2 + variance
+        upper = np.where(big_delta, np.log(np.maximum(delta ** 2 - phi ** 2 - variance, 1e-300)), a - self.tau)
+        k = np.ones_like(a)
+        pending = ~big_delta & (f(upper) < 0)
+        while pending.any():
+            k[pending] += 1
+            upper = np.where(pending, a - k * self.tau, upper)
+            pending &= f(upper) < 0
+
+        lower, f_lower, f_upper = a, f(a), f(upper)
+        for _ in range(100):
+            active = np.abs(upper - lower) > CONVERGENCE_TOLERANCE
+            if not active.any():
+                break
+            candidate = lower + (lower - upper) * f_lower / (f_upper - f_lower)
+            candidate = np.where(active, candidate, upper)
+            f_candidate = f(candidate)
+            crossed = f_candidate * f_upper <= 0
+            lower = np.where(active & crossed, upper, lower)
+            f_lower = np.where(active & crossed, f_upper, np.where(active, f_lower / 2, f_lower))
+            upper = np.where(active, candidate, upper)
+            f_upper = np.where(active, f_candidate, f_upper)
+        return np.exp(lower / 2)
+
+
+RATING_ENGINES: Dict[str, RatingEngine] = {engine.name: engine for engine in (EloEngine(), Glicko2Engine())}
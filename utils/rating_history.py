@@ -0,0 +1,108 @@
+import datetime
+import itertools
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from utils.name_index import normalize_name
+
+# Shared across instances, so a rebuilt history never reuses an older history's versions
+_generations = itertools.count(1)
+
+
+class RatingHistory:
+    """
+    Per-team Elo rating time series: for every team, the date (as a proleptic ordinal) and
+    the rating after each of its matches, kept in two typed arrays so a long history stays
+    compact. Teams are keyed by normalized name.
+
+    Matches recorded since ratings were journaled carry the ratings they produced; older
+    matches do not, so their ratings are estimated by replaying them: `estimate(winner rating,
+    loser rating, multiplier)` returns the two rating changes. A replay from the initial
+    rating drifts from the ratings the teams really had, so a team's estimated points are
+    shifted to meet its first recorded match, or by `anchor` to its current rating.
+    """
+
+    def __init__(self, match_log: Iterable[Dict[str, Any]], initial_rating: float,
+                 estimate: Callable[[float, float, float], Tuple[float, float]]):
+        self.initial_rating = initial_rating
+        self.estimate = estimate
+        self.generation = next(_generations)
+        self._dates: Dict[str, array] = {}
+        self._ratings: Dict[str, array] = {}
+        # Teams whose every point so far is estimated, and not yet anchored
+        self._estimated: set = set()
+        for match in match_log:
+            self.add_match(match)
+
+    def current(self, team_name: str) -> float:
+        ratings = self._ratings.get(normalize_name(team_name))
+        return ratings[-1] if ratings else self.initial_rating
+
+    def add_match(self, match: Dict[str, Any]) -> None:
+        """Append the ratings a match left its two teams with."""
+        winner_rating = match.get("Winner Rating")
+        loser_rating = match.get("Loser Rating")
+        previous_winner, previous_loser = self.current(match["Winner"]), self.current(match["Loser"])
+        winner_delta, loser_delta = self.estimate(previous_winner, previous_loser, match.get("Multiplier", 1.0))
+        estimated = winner_rating is None or loser_rating is None
+        if estimated:
+            winner_rating, loser_rating = previous_winner + winner_delta, previous_loser + loser_delta
+        day = datetime.date.fromisoformat(match["Date"]).toordinal()
+        for team_name, rating, delta in ((match["Winner"], winner_rating, winner_delta),
+                                         (match["Loser"], loser_rating, loser_delta)):
+            key = normalize_name(team_name)
+            if key not in self._dates:
+                self._dates[key], self._ratings[key] = array("l"), array("d")
+                if estimated:
+                    self._estimated.add(key)
+            elif not estimated and key in self._estimated:
+                # The rating before this match is about the recorded one minus the estimated change
+                self._shift(key, rating - delta - self._ratings[key][-1])
+            self._dates[key].append(day)
+            self._ratings[key].append(rating)
+
+    def _shift(self, key: str, offset: float) -> None:
+        ratings = self._ratings[key]
+        for position in range(len(ratings)):
+            ratings[position] += offset
+        self._estimated.discard(key)
+
+    def anchor(self, ratings: Dict[str, float]) -> None:
+        """
+        Shift the series of teams with only estimated points so they end at their current
+        rating; `ratings` maps normalized team names to it.
+        """
+        for key in list(self._estimated):
+            if key in ratings:
+                self._shift(key, ratings[key] - self._ratings[key][-1])
+        self._estimated.clear()
+
+    def fill_ratings(self, match_log: Iterable[Dict[str, Any]]) -> None:
+        """
+        Write the history's ratings into the matches of the log it was built from that carry
+        none, so the estimates are kept the next time the log is saved.
+        """
+        positions: Dict[str, int] = {}
+        for match in match_log:
+            winner, loser = normalize_name(match["Winner"]), normalize_name(match["Loser"])
+            winner_position, loser_position = positions.get(winner, 0), positions.get(loser, 0)
+            if match.get("Winner Rating") is None or match.get("Loser Rating") is None:
+                match["Winner Rating"] = self._ratings[winner][winner_position]
+                match["Loser Rating"] = self._ratings[loser][loser_position]
+            positions[winner], positions[loser] = winner_position + 1, loser_position + 1
+
+    def __contains__(self, team_name: str) -> bool:
+        return normalize_name(team_name) in self._dates
+
+    def series(self, team_name: str) -> Tuple[List[datetime.date], List[float]]:
+        """Dates and ratings after each of a team's matches, oldest first."""
+        key = normalize_name(team_name)
+        if key not in self._dates:
+            return [], []
+        return [datetime.date.fromordinal(day) for day in self._dates[key]], self._ratings[key].tolist()
+
+    def version(self, team_name: str) -> Optional[Tuple[int, int]]:
+        """Changes only when the team plays a match or the history is rebuilt; None for unknown teams."""
+        key = normalize_name(team_name)
+        if key not in self._dates:
+            return None
+        return self.generation, len(self._dates[key])
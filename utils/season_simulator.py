@@ -0,0 +1,115 @@
+"""
+Monte Carlo forecasts from the current Elo ratings.
+
+Every match is decided by one uniform draw against the Elo expected score of its first
+team, for all simulated seasons at once. Ratings stay fixed for the whole simulation,
+so results only depend on who plays whom. Large runs are split into chunks that are
+simulated with independent random streams, optionally across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+DEFAULT_SIMULATIONS = 100_000
+# Seasons simulated per NumPy pass, bounding the (seasons x matches) arrays held at once
+CHUNK_SIZE = 25_000
+
+
+def win_probabilities(ratings: np.ndarray, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Elo expected score of `first` against `second`, per match."""
+    return 1 / (1 + 10 ** ((ratings[second] - ratings[first]) / 400))
+
+
+def _season_chunk(ratings: np.ndarray, home: np.ndarray, away: np.ndarray,
+                  simulations: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Count how often each team finishes in each league position over `simulations` seasons."""
+    rng = np.random.default_rng(seed)
+    team_count = len(ratings)
+    home_wins = rng.random((simulations, len(home))) < win_probabilities(ratings, home, away)
+
+    # Wins per team via one matrix product per side instead of a loop over fixtures
+    home_matrix = np.zeros((len(home), team_count))
+    home_matrix[np.arange(len(home)), home] = 1
+    away_matrix = np.zeros((len(away), team_count))
+    away_matrix[np.arange(len(away)), away] = 1
+    wins = home_wins @ home_matrix + (~home_wins) @ away_matrix
+
+    # Teams level on wins are separated at random
+    order = np.argsort(-(wins + rng.random(wins.shape) * 0.5), axis=1)
+    positions = np.broadcast_to(np.arange(team_count), order.shape)
+    return np.bincount((order * team_count + positions).ravel(), minlength=team_count * team_count
+                       ).reshape(team_count, team_count)
+
+
+def _bracket_chunk(ratings: np.ndarray, seeds: np.ndarray, simulations: int,
+                   seed: np.random.SeedSequence) -> np.ndarray:
+    """Count in which round each team is knocked out (the last column counts titles)."""
+    rng = np.random.default_rng(seed)
+    team_count = len(seeds)
+    round_count = int(np.log2(team_count))
+    counts = np.zeros((team_count, round_count + 1), dtype=np.int64)
+    alive = np.broadcast_to(seeds, (simulations, team_count))
+    for round_number in range(round_count):
+        first, second = alive[:, 0::2], alive[:, 1::2]
+        first_wins = rng.random(first.shape) < win_probabilities(ratings, first, second)
+        losers = np.where(first_wins, second, first)
+        alive = np.where(first_wins, first, second)
+        counts[:, round_number] = np.bincount(losers.ravel(), minlength=team_count)
+    counts[:, round_count] = np.bincount(alive.ravel(), minlength=team_count)
+    return counts
+
+
+def _run_chunks(chunk, args: Tuple, simulations: int, seed: Optional[int], workers: int) -> np.ndarray:
+    sizes = [CHUNK_SIZE] * (simulations // CHUNK_SIZE)
+    if simulations % CHUNK_SIZE:
+        sizes.append(simulations % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(chunk, *zip(*[(*args, size, child) for size, child in zip(sizes, seeds)])))
+    else:
+        results = [chunk(*args, size, child) for size, child in zip(sizes, seeds)]
+    return sum(results) / simulations
+
+
+def simulate_season(ratings: Sequence[float], fixtures: Sequence[Tuple[int, int]],
+                    simulations: int = DEFAULT_SIMULATIONS, seed: Optional[int] = None,
+                    workers: int = 1) -> np.ndarray:
+    """
+    Simulate a league season where a win is worth one point.
+    `fixtures` lists (team, team) index pairs into `ratings`. Returns a (teams, positions)
+    array with the probability of each team finishing in each position, first place first.
+    """
+    if not fixtures:
+        raise ValueError("A season needs at least one fixture")
+    home, away = (np.asarray(side, dtype=np.intp) for side in zip(*fixtures))
+    if np.any(home == away):
+        raise ValueError("A team cannot play itself")
+    return _run_chunks(_season_chunk, (np.asarray(ratings, dtype=np.float64), home, away),
+                       simulations, seed, workers)
+
+
+def simulate_bracket(ratings: Sequence[float], simulations: int = DEFAULT_SIMULATIONS,
+                     seed: Optional[int] = None, workers: int = 1) -> np.ndarray:
+    """
+    Simulate a single-elimination bracket in which team 0 meets team 1, team 2 meets team 3,
+    and so on. The team count must be a power of two. Returns a (teams, rounds + 1) array
+    with the probability of each team going out in each round; the last column is the
+    probability of winning the bracket.
+    """
+    team_count = len(ratings)
+    if team_count < 2 or team_count & (team_count - 1):
+        raise ValueError("A bracket needs 2, 4, 8, 16, ... teams")
+    return _run_chunks(_bracket_chunk, (np.asarray(ratings, dtype=np.float64), np.arange(team_count)),
+                       simulations, seed, workers)
+
+
+def bracket_round_names(team_count: int) -> List[str]:
+    """Column labels for `simulate_bracket`: the round a team went out in, then the title."""
+    names = {2: "Final", 4: "Semi-final", 8: "Quarter-final"}
+    rounds = []
+    remaining = team_count
+    while remaining > 1:
+        rounds.append(names.get(remaining, f"Round of {remaining}"))
+        remaining //= 2
+    return rounds + ["Winner"]
@@ -0,0 +1,53 @@
+from typing import Any, Dict, Sequence
+import numpy as np
+
+# Stats drawn on the unit comparison charts
+COMPARISON_STATS = [
+    'Base Damage', 'AP Damage', 'Weapon Damage',
+    'Bonus vs Large', 'Bonus vs Infantry',
+    'Charge Bonus', 'Melee Defense', 'Melee Attack',
+    'Armor', 'HP', 'Morale', 'Range',
+    'Base Missile Damage', 'AP Missile Damage',
+    'Total Missile Damage', 'Missile Block Chance', 'Ammo'
+]
+SCALES = ('percentile', 'range')
+
+
+def stat_matrix(units: Sequence[Dict[str, Any]], stats: Sequence[str] = COMPARISON_STATS) -> np.ndarray:
+    """(units, stats) array of raw stat values; missing or non-numeric stats count as 0."""
+    def number(value: Any) -> float:
+        return float(value) if isinstance(value, (int, float)) else 0.0
+    return np.array([[number(unit.get(stat, 0)) for stat in stats] for unit in units],
+                    dtype=np.float64).reshape(len(units), len(stats))
+
+
+class StatScales:
+    """
+    Dataset-wide distribution of every comparison stat, computed once per unit data version.
+    Holds the per-stat minimum, maximum and the 0th-100th percentiles, so putting a handful
+    of units on a common 0-1 scale is one vectorized transform rather than a scan of all units.
+    """
+
+    def __init__(self, units: Sequence[Dict[str, Any]], stats: Sequence[str] = COMPARISON_STATS):
+        self.stats = list(stats)
+        values = stat_matrix(units, self.stats)
+        if len(values) == 0:
+            values = np.zeros((1, len(self.stats)))
+        self.minimum = values.min(axis=0)
+        self.maximum = values.max(axis=0)
+        # (101, stats): row p is every stat's p-th percentile
+        self.percentiles = np.percentile(values, np.arange(101), axis=0)
+
+    def normalize(self, values: np.ndarray, scale: str = 'percentile') -> np.ndarray:
+        """
+        Map a (units, stats) array onto 0-1. 'percentile' gives the share of the dataset's
+        percentile points a value beats, so a stat most units lack (Range, Ammo) reads as 0
+        for units without it; 'range' is min-max scaling. Stats without spread map to 0.
+        """
+        if scale == 'percentile':
+            return (values[:, None, :] > self.percentiles[None, :, :]).sum(axis=1) / (len(self.percentiles) - 1)
+        if scale == 'range':
+            span = self.maximum - self.minimum
+            scaled = (values - self.minimum) / np.where(span > 0, span, 1.0)
+            return np.clip(np.where(span > 0, scaled, 0.0), 0.0, 1.0)
+        raise ValueError(f"Unknown scale '{scale}'. Choose one of: {', '.join(SCALES)}")
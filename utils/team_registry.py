@@ -0,0 +1,82 @@
+import itertools
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+from utils.name_index import normalize_name
+
+# Shared by every registry, so a rebuilt or swapped-in registry never repeats a version
+_versions = itertools.count(1)
+
+
+class TeamRegistry:
+    """
+    Elo teams indexed by normalized name, plus a rating-ordered ranking.
+    Lookups are dict hits; a rating change moves one entry in the sorted ranking (bisect to
+    find it, then a list insert/remove), so top-k queries never sort the whole ladder.
+    Teams with equal ratings keep the order they were registered in. `version` changes
+    whenever the ranking does, so views of it can be cached.
+    """
+
+    def __init__(self, teams: List[Dict[str, Any]]):
+        self.teams = teams
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        self._ranking: List[Tuple[float, int]] = []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-index every team, e.g. after ratings were changed in bulk."""
+        self._by_name.clear()
+        self._order.clear()
+        for team in self.teams:
+            key = normalize_name(team["Team Name"])
+            self._by_name.setdefault(key, team)
+            self._order.setdefault(key, len(self._order))
+        self._ranking = sorted((-team["Elo Rating"], self._order[normalize_name(team["Team Name"])])
+                               for team in self._by_name.values())
+        self._ranked_teams = {self._order[key]: team for key, team in self._by_name.items()}
+        self.version = next(_versions)
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __contains__(self, team_name: str) -> bool:
+        return normalize_name(team_name) in self._by_name
+
+    def get(self, team_name: str) -> Optional[Dict[str, Any]]:
+        return self._by_name.get(normalize_name(team_name))
+
+    def add(self, team_name: str, rating: float) -> Dict[str, Any]:
+        """Register a new team, or return the existing one with that name."""
+        key = normalize_name(team_name)
+        if key in self._by_name:
+            return self._by_name[key]
+        team = {"Team Name": team_name, "Elo Rating": rating, "Matches": []}
+        self.teams.append(team)
+        order = len(self._order)
+        self._by_name[key] = team
+        self._order[key] = order
+        self._ranked_teams[order] = team
+        insort(self._ranking, (-rating, order))
+        self.version = next(_versions)
+        return team
+
+    def set_rating(self, team: Dict[str, Any], rating: float) -> None:
+        """Change a registered team's rating and move it to its new rank."""
+        order = self._order[normalize_name(team["Team Name"])]
+        position = bisect_left(self._ranking, (-team["Elo Rating"], order))
+        del self._ranking[position]
+        team["Elo Rating"] = rating
+        insort(self._ranking, (-rating, order))
+        self.version = next(_versions)
+
+    def top(self, count: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """Teams ranked `offset + 1` to `offset + count` by rating."""
+        return [self._ranked_teams[order] for _, order in self._ranking[offset:offset + count]]
+
+    def rank(self, team_name: str) -> Optional[int]:
+        """1-based ladder position of a team."""
+        key = normalize_name(team_name)
+        team = self._by_name.get(key)
+        if team is None:
+            return None
+        return bisect_left(self._ranking, (-team["Elo Rating"], self._order[key])) + 1